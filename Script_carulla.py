@@ -24,187 +24,27 @@ __changues__:
     - [2024-08-25][Duvan]: Se optimiza el manejo de carga lenta de la página inicial.
     - [2024-08-25][Duvan]: Se mejora el manejo de errores para elementos no clickeables.
     - [2024-08-25][Duvan]: Se elimina el scroll innecesario y se mejora la lógica de carga inicial con reintentos.
+    - [2026-10-18][Duvan]: Se agrega modo de extracción JS con un solo execute_script por página.
+    - [2026-10-18][Duvan]: Se agrega cosecha incremental de "Mostrar más" con deduplicación por hash.
+    - [2026-10-18][Duvan]: Se agrega motor VTEX (API de catálogo) como alternativa al navegador.
+    - [2026-10-18][Duvan]: Se usa el pool de drivers (chromedriver en caché y Chrome reutilizable).
+    - [2026-10-18][Duvan]: Se reemplazan las pausas fijas por esperas de cambio de grilla y pausa de cortesía configurable.
+    - [2026-10-18][Duvan]: Se bloquean imágenes, fuentes, multimedia y rastreadores vía CDP y se reporta el tráfico.
+    - [2026-10-18][Duvan]: La URL y la carpeta de salida se pueden cambiar por variables de entorno (benchmark sin conexión).
+    - [2026-10-18][Duvan]: Se guardan los productos por iteración en un CSV parcial con punto de control y se reanuda con --resume.
+    - [2026-10-18][Duvan]: Precio entero, precio por unidad en float y unidad canónica (g, ml, und) con normalizacion.py.
+    - [2026-10-18][Duvan]: Métricas por fase (comandos WebDriver, funciones y esperas) en <tienda>_metricas_<fecha>.json y .prom.
+    - [2026-10-18][Duvan]: Las respuestas del motor se sirven de la caché de páginas; --refresh la ignora.
+    - [2026-10-18][Duvan]: Se agrega modo de extracción lxml (page_source analizado localmente).
+    - [2026-10-18][Duvan]: URL, selectores y paginación pasan a almacenes.py y el recorrido a motor_navegador.py.
+    - [2026-10-18][Duvan]: La caché de páginas solo se usa con --cache; por defecto se descarga todo.
 """
 #%% MODULOS
-from time import sleep, time
-from random import uniform
-from pandas import DataFrame
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementClickInterceptedException, StaleElementReferenceException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-
-#%% FUNCIONES
-def obtener_texto(driver, xpath, tiempo_espera=10, valor_predeterminado="No disponible"):
-    try:
-        elemento = WebDriverWait(driver, tiempo_espera).until(
-            EC.presence_of_element_located((By.XPATH, xpath))
-        )
-        return elemento.text
-    except (TimeoutException, StaleElementReferenceException):
-        print(f"Elemento no encontrado o obsoleto para xpath: {xpath}")
-        return valor_predeterminado
-    except Exception as e:
-        print(f"Error al obtener texto para xpath {xpath}: {str(e)}")
-        return valor_predeterminado
-
-def cerrar_banner(driver):
-    try:
-        banner_close = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, '//span[@class="exito-geolocation-3-x-cursorPointer"]'))
-        )
-        banner_close.click()
-        print("Banner cerrado exitosamente.")
-        sleep(2)
-    except TimeoutException:
-        print("No se encontró el banner o no se pudo cerrar.")
-
-def extraer_informacion_producto(driver, producto):
-    try:
-        nombre = obtener_texto(producto, './/span[contains(@class, "vtex-store-components-3-x-productBrand ")]')
-        precio = obtener_texto(producto, './/span[contains(@class, "exito-vtex-components-4-x-currencyContainer")]')
-        precio_unidad = "No disponible"
-        return {
-            'producto': nombre,
-            'precio': precio,
-            'precio_unidad': precio_unidad
-        }
-    except Exception as e:
-        print(f"Error al extraer información del producto: {str(e)}")
-        return None
-
-def esperar_carga_inicial(driver, timeout=60, max_intentos=3):
-    """
-    Espera a que la página cargue completamente o hasta que se alcance el timeout.
-    Reintenta la carga si falla.
-    
-    :param driver: El driver de Selenium
-    :param timeout: Tiempo máximo de espera en segundos para cada intento
-    :param max_intentos: Número máximo de intentos de carga
-    :return: True si la página cargó, False si se alcanzó el máximo de intentos
-    """
-    for intento in range(max_intentos):
-        print(f"Intento de carga {intento + 1}/{max_intentos}")
-        start_time = time()
-        while time() - start_time < timeout:
-            if driver.execute_script("return document.readyState") == "complete":
-                print("Página cargada completamente.")
-                return True
-            sleep(0.5)
-        print(f"La página no terminó de cargar en el intento {intento + 1}. Reintentando...")
-        driver.refresh()
-    print("La página no se pudo cargar después de todos los intentos.")
-    return False
-
-def click_con_javascript(driver, elemento):
-    """
-    Intenta hacer clic en un elemento usando JavaScript.
-    
-    :param driver: El driver de Selenium
-    :param elemento: El elemento web a clickear
-    """
-    driver.execute_script("arguments[0].click();", elemento)
-
-def esperar_y_clickear(driver, xpath, tiempo_espera=10, intentos=3):
-    """
-    Espera a que un elemento sea clickeable y luego intenta clickearlo.
-    
-    :param driver: El driver de Selenium
-    :param xpath: El xpath del elemento a clickear
-    :param tiempo_espera: Tiempo máximo de espera para cada intento
-    :param intentos: Número máximo de intentos
-    :return: True si se logró clickear, False si no
-    """
-    for _ in range(intentos):
-        try:
-            elemento = WebDriverWait(driver, tiempo_espera).until(
-                EC.element_to_be_clickable((By.XPATH, xpath))
-            )
-            elemento.click()
-            return True
-        except ElementClickInterceptedException:
-            print("Elemento interceptado, intentando con JavaScript...")
-            try:
-                click_con_javascript(driver, elemento)
-                return True
-            except:
-                print("Fallo al clickear con JavaScript, reintentando...")
-        except Exception as e:
-            print(f"Error al clickear: {str(e)}")
-        sleep(1)
-    return False
-
-#%% URL y configuración
-url = 'https://www.carulla.com/frutas-y-verduras'
-hoy = datetime.now().strftime('%d%m%Y%H%M')
-path_save = '/home/dunievesr/Dropbox/UNAL/Web_scraping/'
-
-#%% OPCIONES DE DRIVER
-opts = Options()
-opts.add_argument("User-Agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36")
-#opts.add_argument('--headless')
-driver = webdriver.Chrome(
-    service=Service(ChromeDriverManager().install()),
-    options=opts
-)
-
-#%% SCRAPING
-driver.get(url)
-print("Esperando a que la página cargue completamente...")
-if not esperar_carga_inicial(driver):
-    print("No se pudo cargar la página después de varios intentos. Finalizando el script.")
-    driver.quit()
-    exit()
-
-productos_list = []
-iteraciones = 0
-
-while True:
-    cerrar_banner(driver)
-    try:
-        mostrar_mas_xpath = '//button[@type="button"]//div[contains(text(), "Mostrar más")]'
-        if esperar_y_clickear(driver, mostrar_mas_xpath):
-            print("Se hizo clic en 'Mostrar más' exitosamente.")
-        else:
-            print("No se pudo hacer clic en 'Mostrar más'. Finalizando.")
-            break
-        
-        sleep(uniform(5, 8))
-        
-        new_products = driver.find_elements(By.XPATH, '//div[contains(@class, "vtex-flex-layout-0-x-flexRow vtex-flex-layout-0-x-flexRow--product-info-container")]')
-        productos_antes = len(productos_list)
-        
-        for producto in new_products:
-            info_producto = extraer_informacion_producto(driver, producto)
-            if info_producto and info_producto not in productos_list:
-                productos_list.append(info_producto)
-        
-        productos_nuevos = len(productos_list) - productos_antes
-        iteraciones += 1
-        print(f"Iteración {iteraciones}: {productos_nuevos} nuevos productos. Total: {len(productos_list)}")
-        
-        if productos_nuevos == 0:
-            print("No se encontraron nuevos productos. Finalizando.")
-            break
-    except Exception as e:
-        print(f"Error en iteración {iteraciones + 1}: {str(e)}. Finalizando.")
-        break
-
-print(f"Total de productos encontrados: {len(productos_list)}")
-driver.quit()
-
-#%% POSPROCESAMIENTO
-df_productos = DataFrame(productos_list)
-df_productos['precio'] = df_productos['precio'].str.replace(r'\$|\.', '', regex=True).str.replace(r'\,','',regex=True)
-df_productos['precio_x_unidad'] = df_productos['precio_unidad']
-df_productos.drop(columns=['precio_unidad'],inplace=True)
-
-#%% GUARDADO DE DATOS
-df_productos.to_csv(path_save+'carulla_'+hoy+'.csv', index=False)
-print('Terminó la ejecución para el carulla')
\ No newline at end of file
+from sys import argv
+from motor_navegador import ejecutar
+
+#%% EJECUCIÓN
+# La configuración del almacén está en almacenes.py; un ajuste solo para este script va como argumento,
+# p. ej. ejecutar('carulla', ..., motor='vtex') o modo_extraccion='lxml'
+filas_guardadas, archivo_salida = ejecutar('carulla', reanudar='--resume' in argv, refrescar='--refresh' in argv,
+                                          usar_cache='--cache' in argv)
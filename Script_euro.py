@@ -20,131 +20,27 @@ __changues__:
     - [2024-08-07][Duvan]: Se añaden lineas de codigo para evitar banners y promociones. 
     - [2024-08-15][Duvan]: Se aumentan los tiempos y se procesa en tiempo real para excluir rutas obsoletas.
     - [2024-08-22][Duvan]: Se ajusta el procesamiento para guardado de los datos limpios. 
+    - [2026-10-18][Duvan]: Se agrega modo de extracción JS con un solo execute_script por página.
+    - [2026-10-18][Duvan]: Se agrega cosecha incremental de "Mostrar más" con deduplicación por hash.
+    - [2026-10-18][Duvan]: Se agrega motor VTEX (API de catálogo) como alternativa al navegador.
+    - [2026-10-18][Duvan]: Se usa el pool de drivers (chromedriver en caché y Chrome reutilizable).
+    - [2026-10-18][Duvan]: Se reemplazan las pausas fijas por esperas de cambio de grilla y pausa de cortesía configurable.
+    - [2026-10-18][Duvan]: Se bloquean imágenes, fuentes, multimedia y rastreadores vía CDP y se reporta el tráfico.
+    - [2026-10-18][Duvan]: La URL y la carpeta de salida se pueden cambiar por variables de entorno (benchmark sin conexión).
+    - [2026-10-18][Duvan]: Se guardan los productos por iteración en un CSV parcial con punto de control y se reanuda con --resume.
+    - [2026-10-18][Duvan]: Precio entero, precio por unidad en float y unidad canónica (g, ml, und) con normalizacion.py.
+    - [2026-10-18][Duvan]: Métricas por fase (comandos WebDriver, funciones y esperas) en <tienda>_metricas_<fecha>.json y .prom.
+    - [2026-10-18][Duvan]: Las respuestas del motor se sirven de la caché de páginas; --refresh la ignora.
+    - [2026-10-18][Duvan]: Se agrega modo de extracción lxml (page_source analizado localmente).
+    - [2026-10-18][Duvan]: URL, selectores y paginación pasan a almacenes.py y el recorrido a motor_navegador.py.
+    - [2026-10-18][Duvan]: La caché de páginas solo se usa con --cache; por defecto se descarga todo.
 """
 #%% MODULOS
-from time import sleep
-from random import uniform
-from pandas import DataFrame
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementClickInterceptedException, StaleElementReferenceException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-
-#%% FUNCIONES
-def obtener_texto(driver, xpath, tiempo_espera=10, valor_predeterminado="No disponible"):
-    try:
-        elemento = WebDriverWait(driver, tiempo_espera).until(
-            EC.presence_of_element_located((By.XPATH, xpath))
-        )
-        return elemento.text
-    except (TimeoutException, StaleElementReferenceException):
-        print(f"Elemento no encontrado o obsoleto para xpath: {xpath}")
-        return valor_predeterminado
-    except Exception as e:
-        print(f"Error al obtener texto para xpath {xpath}: {str(e)}")
-        return valor_predeterminado
-
-def cerrar_banner(driver):
-    try:
-        banner_close = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, '//button[@class="vtex-modal-layout-0-x-closeButton vtex-modal-layout-0-x-closeButton--delivery-geolocation-modal ma0 bg-transparent pointer bw0 pa3"]'))
-        )
-        banner_close.click()
-        print("Banner cerrado exitosamente.")
-        sleep(2)
-    except TimeoutException:
-        print("No se encontró el banner o no se pudo cerrar.")
-
-def extraer_informacion_producto(driver, producto):
-    try:
-        nombre = obtener_texto(producto, './/span[contains(@class, "vtex-product-summary-2-x-productBrand")]')
-        precio = obtener_texto(producto, './/span[contains(@class, "vtex-product-price-1-x-currencyContainer")]')
-        precio_unidad = "No disponible"
-        return {
-            'producto': nombre,
-            'precio': precio,
-            'precio_unidad': precio_unidad
-        }
-    except Exception as e:
-        print(f"Error al extraer información del producto: {str(e)}")
-        return None
-
-def scroll_hasta_mostrar_mas(driver):
-    try:
-        mostrar_mas = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, '//button[@type="button"]//div[contains(text(), "Mostrar más")]'))
-        )
-        actions = ActionChains(driver)
-        actions.move_to_element(mostrar_mas).perform()
-        return mostrar_mas
-    except:
-        return None
-
-#%% URL y configuración
-url = 'https://www.eurosupermercados.com.co/mercado/fruver'
-hoy = datetime.now().strftime('%d%m%Y%H%M')
-path_save = '/home/dunievesr/Dropbox/UNAL/Web_scraping/'
-
-#%% OPCIONES DE DRIVER
-opts = Options()
-opts.add_argument("User-Agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36")
-opts.add_argument('--headless')
-driver = webdriver.Chrome(
-    service=Service(ChromeDriverManager().install()),
-    options=opts
-)
-
-#%% SCRAPING
-driver.get(url)
-sleep(uniform(6, 12))
-productos_list = []
-iteraciones = 0
-#%%
-while True:
-    cerrar_banner(driver)
-    try:
-
-        mostrar_mas = scroll_hasta_mostrar_mas(driver)
-        if not mostrar_mas:
-            print("No se encontró el botón 'Mostrar más'. Finalizando.")
-            break
-        
-        mostrar_mas.click()
-        sleep(uniform(5, 8))
-        
-        new_products = driver.find_elements(By.XPATH, '//article[contains(@class, "vtex-product-summary-2-x-element")]')
-        productos_antes = len(productos_list)
-        
-        for producto in new_products:
-            info_producto = extraer_informacion_producto(driver, producto)
-            if info_producto and info_producto not in productos_list:
-                productos_list.append(info_producto)
-        
-        productos_nuevos = len(productos_list) - productos_antes
-        iteraciones += 1
-        print(f"Iteración {iteraciones}: {productos_nuevos} nuevos productos. Total: {len(productos_list)}")
-        
-        if productos_nuevos == 0:
-            print("No se encontraron nuevos productos. Finalizando.")
-            break
-    except Exception as e:
-        print(f"Error en iteración {iteraciones + 1}: {str(e)}. Finalizando.")
-        break
-
-print(f"Total de productos encontrados: {len(productos_list)}")
-driver.quit()
-#%% POSPROCESAMIENTO
-df_productos = DataFrame(productos_list)
-df_productos['precio'] = df_productos['precio'].str.replace(r'\$|\.', '', regex=True)
-df_productos['precio_x_unidad'] = df_productos['precio_unidad']
-df_productos.drop(columns=['precio_unidad'],inplace=True)
-
-#%% GUARDADO DE DATOS
-df_productos.to_csv(path_save+'euro_'+hoy+'.csv', index=False)
-print('Terminó la ejecución para el euro')
\ No newline at end of file
+from sys import argv
+from motor_navegador import ejecutar
+
+#%% EJECUCIÓN
+# La configuración del almacén está en almacenes.py; un ajuste solo para este script va como argumento,
+# p. ej. ejecutar('euro', ..., motor='vtex') o modo_extraccion='lxml'
+filas_guardadas, archivo_salida = ejecutar('euro', reanudar='--resume' in argv, refrescar='--refresh' in argv,
+                                          usar_cache='--cache' in argv)
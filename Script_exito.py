@@ -21,130 +21,27 @@ __changues__:
     - [2024-08-07][Duvan]: Se añaden lineas de codigo para evitar banners y promociones. 
     - [2024-08-15][Duvan]: Se aumentan los tiempos y se procesa en tiempo real para excluir rutas obsoletas.
     - [2024-08-22][Duvan]: Se ajusta el procesamiento para guardado de los datos limpios. 
+    - [2026-10-18][Duvan]: Se agrega modo de extracción JS con un solo execute_script por página.
+    - [2026-10-18][Duvan]: Se agrega motor VTEX (API de catálogo) como alternativa al navegador.
+    - [2026-10-18][Duvan]: Se usa el pool de drivers (chromedriver en caché y Chrome reutilizable).
+    - [2026-10-18][Duvan]: Se reemplazan las pausas fijas por esperas de cambio de grilla y pausa de cortesía configurable.
+    - [2026-10-18][Duvan]: Se bloquean imágenes, fuentes, multimedia y rastreadores vía CDP y se reporta el tráfico.
+    - [2026-10-18][Duvan]: Se agrega paginación paralela por URL directa con reintento por página.
+    - [2026-10-18][Duvan]: La URL y la carpeta de salida se pueden cambiar por variables de entorno (benchmark sin conexión).
+    - [2026-10-18][Duvan]: Se guardan los productos por página en un CSV parcial con punto de control y se reanuda con --resume.
+    - [2026-10-18][Duvan]: Precio entero, precio por unidad en float y unidad canónica (g, ml, und) con normalizacion.py.
+    - [2026-10-18][Duvan]: Métricas por fase (comandos WebDriver, funciones y esperas) en <tienda>_metricas_<fecha>.json y .prom.
+    - [2026-10-18][Duvan]: Las páginas por URL y las respuestas de los motores se sirven de la caché de páginas; --refresh la ignora.
+    - [2026-10-18][Duvan]: Se agrega modo de extracción lxml; con clic a la siguiente, la página se analiza mientras carga la otra.
+    - [2026-10-18][Duvan]: URL, selectores y paginación pasan a almacenes.py y el recorrido a motor_navegador.py.
+    - [2026-10-18][Duvan]: La caché de páginas solo se usa con --cache; por defecto se descarga todo.
 """
 #%% MODULOS
-from time import sleep
-from random import uniform
-from pandas import DataFrame
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementClickInterceptedException, StaleElementReferenceException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-#%% FUNCIONES
-def obtener_texto(driver, xpath, tiempo_espera=10, valor_predeterminado="No disponible"):
-    try:
-        elemento = WebDriverWait(driver, tiempo_espera).until(
-            EC.presence_of_element_located((By.XPATH, xpath))
-        )
-        return elemento.text
-    except (TimeoutException, StaleElementReferenceException):
-        print(f"Elemento no encontrado o obsoleto para xpath: {xpath}")
-        return valor_predeterminado
-    except Exception as e:
-        print(f"Error al obtener texto para xpath {xpath}: {str(e)}")
-        return valor_predeterminado
-
-def cerrar_banner(driver):
-    try:
-        banner_close = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.ID, "wps-overlay-close-button"))
-        )
-        banner_close.click()
-        print("Banner cerrado exitosamente.")
-        sleep(2)  # Esperar un poco después de cerrar el banner
-    except TimeoutException:
-        print("No se encontró el banner o no se pudo cerrar.")
-
-def extraer_informacion_producto(driver, producto):
-    try:
-        nombre = obtener_texto(producto, './/p[@class="styles_name__qQJiK"]')
-        precio = obtener_texto(producto, './/p[contains(@class, "ProductPrice_container__price")]')
-        precio_unidad = obtener_texto(producto, './/span[contains(@class, "product-unit_price-unit__text")]')
-        return {
-            'producto': nombre,
-            'precio': precio,
-            'precio_unidad': precio_unidad
-        }
-    except Exception as e:
-        print(f"Error al extraer información del producto: {str(e)}")
-        return None
-
-#%% URL
-url_exito = 'https://www.exito.com/mercado/frutas-y-verduras' #enlace del sitio a explorar
-#%% Fecha
-hoy = datetime.now().strftime('%d%m%Y%H%M')
-path_save = '/home/dunievesr/Dropbox/UNAL/Web_scraping/' #Actualizar
-
-#%% OPCIONES DE DRIVER
-opts = Options()
-opts.add_argument("User-Agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36")
-opts.add_argument('--headless')
-driver = webdriver.Chrome(
-    service=Service(ChromeDriverManager().install()),
-    options=opts
-)
-
-#%% SCRAPING INICIAL CON NEXT BUTTON 
-driver.get(url_exito)
-sleep(uniform(6, 12))
-productos_list = []
-pagina = 1
-url_anterior = ""
-
-while True:
-    print(f"Procesando página {pagina} --> ",end='')
-    try:
-        WebDriverWait(driver, 30).until(EC.presence_of_all_elements_located((By.XPATH, '//div[@class="productCard_productInfo__yn2lK"]')))
-    except TimeoutException:
-        print("No se pudieron cargar los productos. Finalizando.")
-        break
-    
-    new_products = driver.find_elements(By.XPATH, '//div[@class="productCard_productInfo__yn2lK"]')
-    
-    for producto in new_products:
-        info_producto = extraer_informacion_producto(driver, producto)
-        if info_producto:
-            productos_list.append(info_producto)
-    
-    print(f"Procesada. Se encontraron {len(new_products)} productos.")
-    
-    try:
-        next_button = WebDriverWait(driver, 30).until(
-            EC.element_to_be_clickable((By.XPATH, '//button[@class="Pagination_nextPreviousLink__f7_2J" and @aria-label="Próxima Pagina" and not(@disabled)]'))
-        )
-        
-        try:
-            next_button.click()
-        except ElementClickInterceptedException:
-            print("Click interceptado. Intentando cerrar el banner...")
-            cerrar_banner(driver)
-            # Intentar hacer clic nuevamente después de cerrar el banner
-            next_button.click()
-        
-        sleep(uniform(8, 12))
-        WebDriverWait(driver, 30).until(lambda d: d.current_url != url_anterior)
-        url_anterior = driver.current_url
-        pagina += 1
-    except (TimeoutException, NoSuchElementException):
-        print("No se pudo encontrar o hacer clic en el botón 'Próxima Página'. Finalizando.")
-        break
-
-print(f"Se han procesado un total de {pagina} páginas y se encontraron {len(productos_list)} productos.")
-driver.quit()
-# %% POSPORCESAMIENTO
-df_productos = DataFrame(productos_list)
-df_productos['precio'] = df_productos['precio'].str.replace(r'\$|\.', '', regex=True)
-df_productos['precio_x_unidad'] = df_productos['precio_unidad'].str.split(' a ').str[-1].str.replace(r'\$|\.', '', regex=True)
-df_productos['unidad'] = df_productos['precio_unidad'].str.split(' a ').str[0]
-df_productos.drop(columns=['precio_unidad'],inplace=True)
-# %% GUARDADO DE DATOS
-df_productos.to_csv(path_save+'exito_'+hoy+'.csv')
-print('Termine la ejecuion para el exito')
-
-# %%
+from sys import argv
+from motor_navegador import ejecutar
+
+#%% EJECUCIÓN
+# La configuración del almacén está en almacenes.py; un ajuste solo para este script va como argumento,
+# p. ej. ejecutar('exito', ..., motor='vtex') o modo_extraccion='lxml'
+filas_guardadas, archivo_salida = ejecutar('exito', reanudar='--resume' in argv, refrescar='--refresh' in argv,
+                                          usar_cache='--cache' in argv)
@@ -0,0 +1,162 @@
+"""
+Codigo con la especificación declarativa de cada almacén que ejecuta motor_navegador.py.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. URL, selectores, banner, acciones previas, estrategia
+      de paginación y columnas de cada almacén, antes repartidos en los cinco Script_<tienda>.py.
+    - [2026-10-18][Duvan]: Se reemplaza tiempo_espera_campo por los plazos de corrida, página, campos y banner.
+
+Un almacén nuevo se agrega con una entrada en ALMACENES; lo que no se indique toma el valor de
+PREDETERMINADO. La paginación admite tres estrategias:
+    - 'siguiente': clic en el botón de página siguiente (con modo 'paralela' abre las páginas 3..N por URL).
+    - 'mostrar_mas': clic en "Mostrar más" y cosecha de las tarjetas nuevas.
+    - 'desplegable': selección del número de página en un <select> (con modo 'paralela', por URL ?page=N).
+
+Uso:
+    python almacenes.py          # resumen de la especificación de cada almacén
+"""
+#%% MODULOS
+from copy import deepcopy
+
+#%% CONFIGURACIÓN
+PREDETERMINADO = {
+    'motor': 'selenium', # 'selenium': navegador, 'vtex' o 'shopify': API del almacén sin navegador (ver 'motor_api')
+    'motor_api': None, # Motor sin navegador que admite el almacén
+    'modo_extraccion': 'js', # 'js': un execute_script por página, 'lxml': page_source analizado localmente, 'elementos': obtener_texto por tarjeta
+    'perfil_bloqueo': 'completo', # 'ninguno', 'ligero' (imágenes, fuentes, multimedia) o 'completo' (+ rastreadores)
+    'pausa_cortesia': (0, 0), # (mín, máx) segundos de cortesía tras cada carga; (0, 0) la desactiva
+    'headless': True,
+    'carga_inicial': 'grilla', # 'grilla': espera las tarjetas, 'documento': readyState con recargas
+    'banner': None, # Xpath del botón que cierra el banner o la ventana de ubicación
+    'acciones_previas': {}, # {nombre: [xpath, ...]} clics en orden antes de paginar (también al reanudar)
+    # Segundos de cada plazo (esperas.Plazo). 'campos' es el total para buscar campos de una página cuya
+    # grilla no llegó a estar lista (lista, se buscan sin espera); 'banner' solo se espera tras la carga
+    'plazos': {'corrida': 3600, 'pagina': 90, 'campos': 3, 'banner': 5},
+    'columna_nombre': 'producto', # Columna del nombre en el CSV; normalizacion.py la usa para la cantidad
+    'index': True, # Escribe el índice en el CSV de salida
+}
+
+PAGINACION_PREDETERMINADA = {
+    'siguiente': {'modo': 'siguiente', 'clic': 'directo', 'tiempo_espera': 30, 'presupuesto_fijo': 10, 'max_navegadores': 3, 'reintentos': 2},
+    'mostrar_mas': {'xpath': '//button[@type="button"]//div[contains(text(), "Mostrar más")]', 'cosecha': 'incremental', 'presupuesto_fijo': 6.5},
+    'desplegable': {'modo': 'paralela', 'scroll_lento': True, 'presupuesto_fijo': 4, 'max_navegadores': 3, 'reintentos': 2, 'max_paginas': None},
+}
+
+ALMACENES = {
+    'exito': {
+        'url': 'https://www.exito.com/mercado/frutas-y-verduras',
+        'motor_api': 'vtex',
+        'xpath_productos': '//div[@class="productCard_productInfo__yn2lK"]',
+        'campos': {
+            'producto': './/p[@class="styles_name__qQJiK"]',
+            'precio': './/p[contains(@class, "ProductPrice_container__price")]',
+            'precio_unidad': './/span[contains(@class, "product-unit_price-unit__text")]',
+        },
+        'banner': '//*[@id="wps-overlay-close-button"]',
+        'plazos': {'banner': 0}, # El banner solo se cierra si intercepta el clic
+        'paginacion': {
+            'estrategia': 'siguiente',
+            'modo': 'paralela', # 'paralela': páginas 3..N por URL en varios Chrome, 'siguiente': clic página a página
+            'xpath': '//button[@class="Pagination_nextPreviousLink__f7_2J" and @aria-label="Próxima Pagina" and not(@disabled)]',
+            'xpath_botones': '//*[contains(@class, "Pagination_")]//button | //button[contains(@class, "Pagination_")]',
+        },
+    },
+    'carulla': {
+        'url': 'https://www.carulla.com/frutas-y-verduras',
+        'motor_api': 'vtex',
+        'headless': False,
+        'carga_inicial': 'documento',
+        'xpath_productos': '//div[contains(@class, "vtex-flex-layout-0-x-flexRow vtex-flex-layout-0-x-flexRow--product-info-container")]',
+        'campos': {
+            'producto': './/span[contains(@class, "vtex-store-components-3-x-productBrand ")]',
+            'precio': './/span[contains(@class, "exito-vtex-components-4-x-currencyContainer")]',
+            'precio_unidad': None,
+        },
+        'banner': '//span[@class="exito-geolocation-3-x-cursorPointer"]',
+        'paginacion': {'estrategia': 'mostrar_mas'},
+        'index': False,
+    },
+    'jumbo': {
+        'url': 'https://www.tiendasjumbo.co/supermercado/frutas-y-verduras',
+        'motor_api': 'vtex',
+        'xpath_productos': '//article[contains(@class, "vtex-product-summary-2-x-element")]',
+        'campos': {
+            'nombre': './/span[@class="vtex-product-summary-2-x-productBrand vtex-product-summary-2-x-brandName t-body"]',
+            'precio': './/div[contains(@class, "tiendasjumboqaio-jumbo-minicart-2-x-price")]',
+            'precio_unidad': './/div[contains(@class, "w-100 tiendasjumboqaio-calculate-pum-2-x-PUMInfo tiendasjumboqaio-calculate-pum-2-x-PUMInfo--shelf")]',
+        },
+        'plazos': {'pagina': 180}, # Incluye el scroll lento de cada página
+        'columna_nombre': 'nombre',
+        'paginacion': {
+            'estrategia': 'desplegable',
+            'modo': 'paralela', # 'paralela': páginas por URL en varios Chrome, 'desplegable': selección serial en el desplegable
+            'xpath': '//select[contains(@class, "o-0")]',
+        },
+    },
+    'euro': {
+        'url': 'https://www.eurosupermercados.com.co/mercado/fruver',
+        'motor_api': 'vtex',
+        'xpath_productos': '//article[contains(@class, "vtex-product-summary-2-x-element")]',
+        'campos': {
+            'producto': './/span[contains(@class, "vtex-product-summary-2-x-productBrand")]',
+            'precio': './/span[contains(@class, "vtex-product-price-1-x-currencyContainer")]',
+            'precio_unidad': None,
+        },
+        'banner': '//button[@class="vtex-modal-layout-0-x-closeButton vtex-modal-layout-0-x-closeButton--delivery-geolocation-modal ma0 bg-transparent pointer bw0 pa3"]',
+        'paginacion': {'estrategia': 'mostrar_mas'},
+        'index': False,
+    },
+    'merka': {
+        'url': 'https://merkaorganicoonline.com/collections/frutas-y-verduras-1',
+        'motor_api': 'shopify',
+        'headless': False,
+        'xpath_productos': '//div[@class="product-content"]',
+        'campos': {
+            'producto': './/h3/a',
+            'precio': './/span[contains(@class, "new-price")]',
+            'precio_unidad': None,
+        },
+        'acciones_previas': {'seleccionar_ciudad': ['//*[@id="medellin"]', '//*[@id="select-city-button"]']},
+        'paginacion': {
+            'estrategia': 'siguiente',
+            'xpath': '//li[@class="next"]/a[@class="Next"]',
+            'clic': 'js',
+            'tiempo_espera': 10,
+        },
+    },
+}
+
+#%% FUNCIONES
+def especificacion(tienda, **ajustes):
+    """
+    Especificación completa del almacén: PREDETERMINADO, la entrada de ALMACENES y los ajustes.
+
+    :param tienda: Almacén registrado en ALMACENES
+    :param ajustes: Claves que se reemplazan solo en esta corrida (p. ej. motor='vtex');
+        'paginacion' y 'plazos' se combinan con los del almacén en lugar de reemplazarlos
+    :return: Diccionario nuevo; modificarlo no cambia ALMACENES
+    """
+    if tienda not in ALMACENES:
+        raise KeyError(f"Almacén desconocido: {tienda} (registrados: {', '.join(ALMACENES)})")
+    spec = {**deepcopy(PREDETERMINADO), **deepcopy(ALMACENES[tienda])}
+    paginacion = {**spec['paginacion'], **ajustes.pop('paginacion', {})}
+    plazos = {**PREDETERMINADO['plazos'], **spec['plazos'], **ajustes.pop('plazos', {})}
+    spec.update(ajustes)
+    spec['plazos'] = plazos
+    spec['paginacion'] = {**PAGINACION_PREDETERMINADA[paginacion['estrategia']], **paginacion}
+    if spec['motor'] not in ('selenium', spec['motor_api']):
+        raise ValueError(f"{tienda} no admite el motor '{spec['motor']}' (admite 'selenium' o '{spec['motor_api']}')")
+    return spec
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    for tienda in ALMACENES:
+        spec = especificacion(tienda)
+        paginacion = spec['paginacion']
+        print(f"{tienda:<10}{paginacion['estrategia']:<13}{paginacion.get('modo', ''):<12}{spec['motor_api'] or '':<9}{', '.join(spec['campos'])}")
@@ -0,0 +1,135 @@
+"""
+Codigo para medir la velocidad de los cinco scripts contra páginas locales, sin consultar los almacenes.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Cada script corre en un proceso propio contra el
+      servidor de fixtures y se reportan duración, comandos WebDriver, filas por segundo y coincidencia
+      con los CSV de examples/.
+    - [2026-10-18][Duvan]: Los comandos WebDriver y la duración por fase salen de metricas.py.
+    - [2026-10-18][Duvan]: Cada medición usa una caché de páginas vacía propia, así siempre se mide en frío.
+
+Uso:
+    python benchmark.py                                   # los cinco almacenes con fixtures generados
+    python benchmark.py exito jumbo --resultados bench.json
+    python benchmark.py --fixtures fixtures/html --comparar bench.json
+"""
+#%% MODULOS
+import os
+import re
+import sys
+import json
+import glob
+import argparse
+import tempfile
+from multiprocessing import get_context
+from pandas import read_csv
+
+from metricas import METRICAS
+from orquestador import TIENDAS, ejecutar_script
+from servidor_local import ServidorFixtures
+from fixtures_html import generar_fixtures, leer_catalogo, url_listado
+
+#%% FUNCIONES
+def medir_tienda(tienda, url, directorio_salida):
+    """
+    Ejecuta Script_<tienda>.py apuntando a `url`; se llama dentro de un proceso nuevo.
+
+    :return: Resumen de ejecutar_script más los comandos WebDriver enviados y la duración por fase
+    """
+    os.environ[f'FRUVER_URL_{tienda.upper()}'] = url
+    os.environ['FRUVER_SALIDA'] = directorio_salida + os.sep
+    os.environ['FRUVER_CACHE'] = os.path.join(directorio_salida, 'cache')
+    resumen = ejecutar_script(tienda)
+    # El script deja sus métricas en METRICAS del proceso (también en <tienda>_metricas_*.json)
+    resumen['comandos'] = METRICAS.total_comandos()
+    resumen['comandos_por_tipo'] = METRICAS.comandos_por_tipo()
+    resumen['fases'] = METRICAS.como_dict()['fases']
+    return resumen
+
+def clave_producto(nombre, precio):
+    """Nombre en minúsculas y solo los dígitos del precio, para comparar salidas de distinto formato."""
+    return (str(nombre).strip().lower(), re.sub(r'\D', '', str(precio)))
+
+def claves_csv(ruta):
+    filas = read_csv(ruta, dtype=str, keep_default_na=False).to_dict('records')
+    return {clave_producto(fila.get('producto', fila.get('nombre', '')), fila.get('precio', '')) for fila in filas}
+
+def coincidencia(tienda, directorio_salida):
+    """Fracción de los productos esperados (catálogo de examples/) que aparecen en el CSV generado."""
+    salidas = glob.glob(os.path.join(directorio_salida, f'{tienda}_*.csv'))
+    if not salidas:
+        return 0.0
+    esperadas = {clave_producto(fila.get('producto', fila.get('nombre', '')), fila['precio']) for fila in leer_catalogo(tienda)}
+    return len(esperadas & claves_csv(salidas[0])) / len(esperadas)
+
+def ejecutar_benchmark(tiendas=TIENDAS, directorio_fixtures=None, retardo=200):
+    """
+    Sirve los fixtures y mide cada almacén en serie, cada uno en un proceso nuevo.
+
+    :param tiendas: Almacenes a medir
+    :param directorio_fixtures: Páginas grabadas; None genera unas nuevas desde examples/
+    :param retardo: Milisegundos de cada lote de "Mostrar más" en los fixtures generados
+    :return: Lista de resultados por almacén
+    """
+    directorio_trabajo = tempfile.mkdtemp(prefix='fruver_benchmark_')
+    if directorio_fixtures is None:
+        directorio_fixtures = os.path.join(directorio_trabajo, 'fixtures')
+        generar_fixtures(directorio_fixtures, tiendas, retardo)
+    resultados = []
+    with ServidorFixtures(directorio_fixtures) as servidor:
+        for tienda in tiendas:
+            directorio_salida = os.path.join(directorio_trabajo, tienda)
+            os.makedirs(directorio_salida, exist_ok=True)
+            print(f"Midiendo {tienda}...")
+            # Un proceso por almacén: sin Chrome calientes ni contadores heredados de la medición anterior
+            with get_context('spawn').Pool(1) as proceso:
+                resultado = proceso.apply(medir_tienda, (tienda, url_listado(servidor.url, tienda), directorio_salida))
+            resultado['coincidencia'] = round(coincidencia(tienda, directorio_salida), 3)
+            resultado['filas_por_segundo'] = round(resultado['filas'] / resultado['duracion'], 1) if resultado['duracion'] else 0.0
+            resultados.append(resultado)
+    return resultados
+
+def variacion(actual, previo):
+    return f"{(actual - previo) / previo:+.0%}" if previo else ''
+
+def imprimir_resultados(resultados, previos=None):
+    """Tabla por almacén; con `previos` agrega la variación de duración y comandos frente a esa corrida."""
+    previos = {resultado['tienda']: resultado for resultado in (previos or [])}
+    print(f"\n{'tienda':<10}{'filas':>7}{'coincide':>10}{'duracion (s)':>14}{'comandos':>10}{'filas/s':>9}  {'vs. previo' if previos else ''}")
+    for resultado in resultados:
+        previo = previos.get(resultado['tienda'])
+        cambio = f"{variacion(resultado['duracion'], previo['duracion'])} s, {variacion(resultado['comandos'], previo['comandos'])} cmd" if previo else ''
+        error = (resultado['error'] or '').strip().splitlines()
+        notas = '  '.join(nota for nota in (cambio, error[-1] if error else '') if nota)
+        print(f"{resultado['tienda']:<10}{resultado['filas']:>7}{resultado['coincidencia']:>10.0%}{resultado['duracion']:>14}"
+              f"{resultado['comandos']:>10}{resultado['filas_por_segundo']:>9}  {notas}")
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mide los scripts de los almacenes contra páginas locales.')
+    parser.add_argument('tiendas', nargs='*', default=TIENDAS, help=f"Almacenes a medir ({', '.join(TIENDAS)})")
+    parser.add_argument('--fixtures', default=None, help='Directorio con páginas grabadas (por defecto se generan desde examples/)')
+    parser.add_argument('--retardo', type=int, default=200, help='Milisegundos de cada lote de "Mostrar más" en los fixtures generados')
+    parser.add_argument('--resultados', default=None, help='Archivo JSON donde guardar los resultados')
+    parser.add_argument('--comparar', default=None, help='Resultados JSON de una corrida anterior para comparar')
+    args = parser.parse_args()
+    desconocidas = set(args.tiendas) - set(TIENDAS)
+    if desconocidas:
+        parser.error(f"Almacenes desconocidos: {', '.join(sorted(desconocidas))}")
+
+    resultados = ejecutar_benchmark(args.tiendas, args.fixtures, args.retardo)
+    previos = None
+    if args.comparar:
+        with open(args.comparar) as archivo:
+            previos = json.load(archivo)
+    imprimir_resultados(resultados, previos)
+    if args.resultados:
+        with open(args.resultados, 'w') as archivo:
+            json.dump(resultados, archivo, indent=2)
+    sys.exit(1 if any(resultado['error'] for resultado in resultados) else 0)
@@ -0,0 +1,134 @@
+"""
+Codigo para bloquear imágenes, fuentes, multimedia y rastreadores en Chrome vía DevTools Protocol.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Perfiles de bloqueo con Network.setBlockedURLs,
+      listas de permitidos por almacén y conteo de peticiones y bytes con el log de rendimiento.
+    - [2026-10-18][Duvan]: Los patrones por extensión también cubren URLs con query (foto.jpg?v=3) y se bloquean
+      las imágenes de VTEX, que no tienen extensión (/arquivos/ids/<id>-500-auto?v=...).
+"""
+#%% MODULOS
+import json
+from threading import Lock
+
+#%% CONFIGURACIÓN
+def por_extension(*extensiones):
+    """
+    Patrones de Network.setBlockedURLs para las extensiones, con y sin query.
+
+    Un patrón solo coincide con la URL completa: '*.png' no bloquea foto.png?v=3.
+
+    >>> por_extension('png')
+    ['*.png', '*.png?*']
+    """
+    return [patron for extension in extensiones for patron in (f'*.{extension}', f'*.{extension}?*')]
+
+IMAGENES = por_extension('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico') + [
+    '*/arquivos/ids/*', # Imágenes de producto de VTEX (Éxito, Carulla, Jumbo): sin extensión en la URL
+]
+FUENTES = por_extension('woff', 'woff2', 'ttf', 'otf', 'eot')
+MULTIMEDIA = por_extension('mp4', 'webm', 'mp3', 'm3u8', 'ogg')
+RASTREADORES = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*clarity.ms*', '*analytics.tiktok.com*',
+    '*bat.bing.com*', '*newrelic.com*', '*nr-data.net*', '*optimizely.com*',
+]
+PERFILES = {
+    'ninguno': [],
+    'ligero': IMAGENES + FUENTES + MULTIMEDIA,
+    'completo': IMAGENES + FUENTES + MULTIMEDIA + RASTREADORES,
+}
+# Patrones del perfil que cada almacén necesita para funcionar; se quitan de la lista de bloqueo.
+# Se agregan aquí cuando un selector deja de aparecer con el bloqueo activo.
+PERMITIDOS_POR_TIENDA = {
+    'exito': [],
+    'carulla': [],
+    'euro': [],
+    'jumbo': [],
+    'merka': [],
+}
+
+#%% FUNCIONES
+def configurar_opciones(opts):
+    """Activa el log de rendimiento de Chrome, necesario para contar peticiones y bytes transferidos."""
+    opts.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return opts
+
+def patrones_bloqueo(perfil='completo', tienda=None):
+    """Patrones del perfil menos los permitidos del almacén."""
+    permitidos = set(PERMITIDOS_POR_TIENDA.get(tienda, []))
+    return [patron for patron in PERFILES[perfil] if patron not in permitidos]
+
+def aplicar_bloqueo(driver, tienda=None, perfil='completo', reiniciar_trafico=True):
+    """
+    Aplica el perfil de bloqueo al driver con CDP. Debe llamarse tras obtener el driver del pool.
+
+    :param driver: El driver de Selenium (Chrome)
+    :param tienda: Almacén, para descontar su lista de permitidos
+    :param perfil: 'ninguno', 'ligero' o 'completo'
+    :param reiniciar_trafico: Pone en cero TRAFICO; False para drivers adicionales de la misma corrida
+    :return: Lista de patrones bloqueados
+    """
+    patrones = patrones_bloqueo(perfil, tienda)
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patrones})
+    if reiniciar_trafico:
+        TRAFICO.reiniciar()
+    TRAFICO.descartar_pendiente(driver)
+    print(f"Bloqueo de recursos '{perfil}': {len(patrones)} patrones.")
+    return patrones
+
+#%% CLASES
+class TraficoRed:
+    """Acumula peticiones, bytes recibidos y peticiones bloqueadas a partir del log de rendimiento."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.reiniciar()
+
+    def leer_log(self, driver):
+        try:
+            return driver.get_log('performance')
+        except Exception:
+            # El driver no se creó con configurar_opciones
+            return []
+
+    def reiniciar(self):
+        self.peticiones = 0
+        self.bytes = 0
+        self.bloqueadas = 0
+
+    def descartar_pendiente(self, driver):
+        """Vacía el log acumulado antes de la corrida (p. ej. de un préstamo anterior del pool)."""
+        self.leer_log(driver)
+
+    def actualizar(self, driver):
+        """Lee los eventos nuevos del log; llamarlo tras cada página evita que el log crezca sin límite."""
+        peticiones, bytes_recibidos, bloqueadas = 0, 0, 0
+        for entrada in self.leer_log(driver):
+            mensaje = json.loads(entrada['message'])['message']
+            metodo, parametros = mensaje.get('method'), mensaje.get('params', {})
+            if metodo == 'Network.requestWillBeSent':
+                peticiones += 1
+            elif metodo == 'Network.loadingFinished':
+                bytes_recibidos += parametros.get('encodedDataLength', 0)
+            elif metodo == 'Network.loadingFailed' and parametros.get('blockedReason'):
+                bloqueadas += 1
+        # Varios hilos (paginación en paralelo) pueden sumar a la vez
+        with self.lock:
+            self.peticiones += peticiones
+            self.bytes += bytes_recibidos
+            self.bloqueadas += bloqueadas
+
+    def imprimir_resumen(self, driver=None):
+        if driver is not None:
+            self.actualizar(driver)
+        print(f"Tráfico: {self.peticiones} peticiones, {self.bloqueadas} bloqueadas, {self.bytes / 1024 / 1024:.2f} MB transferidos.")
+
+TRAFICO = TraficoRed()
@@ -0,0 +1,198 @@
+"""
+Codigo para guardar en disco las páginas y respuestas JSON de los listados y reutilizarlas entre corridas.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Cada entrada se identifica por almacén, URL y número
+      de página, vence según el TTL del almacén y, si la caché pasa de TAMANO_MAXIMO, se descartan las
+      usadas hace más tiempo (LRU). Con --refresh en el script se ignoran las entradas y se reescriben.
+    - [2026-10-18][Duvan]: La caché solo se usa si el script corre con --cache (o --refresh); sin ellos, y en
+      las corridas del orquestador y del programador, se descarga todo.
+    - [2026-10-18][Duvan]: Un almacén que no está en TTL usa TTL_PREDETERMINADO en lugar de no tener entradas vigentes.
+
+Uso:
+    python cache_paginas.py                  # entradas y tamaño por almacén
+    python cache_paginas.py --vaciar exito   # borra las entradas de un almacén (sin almacenes, todas)
+"""
+#%% MODULOS
+import os
+import re
+import json
+import gzip
+import fcntl
+import argparse
+from time import time
+from hashlib import sha1
+from threading import Lock
+from contextlib import contextmanager
+
+#%% CONFIGURACIÓN
+DIRECTORIO = os.path.join(os.path.expanduser('~'), '.cache', 'fruver', 'paginas') # FRUVER_CACHE lo cambia (p. ej. benchmark.py)
+TTL = {'exito': 6 * 3600, 'carulla': 6 * 3600, 'jumbo': 6 * 3600, 'euro': 12 * 3600, 'merka': 12 * 3600} # Segundos de vigencia por almacén
+TTL_PREDETERMINADO = 6 * 3600 # Para los almacenes de almacenes.py que no están en TTL
+TAMANO_MAXIMO = 512 * 1024 ** 2 # Bytes (comprimidos) que puede ocupar la caché antes de descartar por LRU
+PATRON_SCRIPTS = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.DOTALL | re.IGNORECASE)
+
+#%% CLASES
+class CachePaginas:
+    """
+    Caché del almacén en curso, compartida entre hilos y procesos.
+
+    El índice (<directorio>/indice.json: almacén, URL, página, archivo, cuándo se guardó y cuándo se
+    usó por última vez) solo se lee o escribe con flock, igual que el estado de limitador.py; el
+    contenido va comprimido en <directorio>/<almacen>/<hash>.gz.
+    """
+
+    def __init__(self):
+        self.lock_hilos = Lock()
+        self.iniciar(None)
+
+    def iniciar(self, tienda, refrescar=False):
+        """
+        Empieza la corrida de `tienda` con contadores en cero; sin almacén la caché no se usa.
+
+        :param refrescar: No se sirve nada de la caché, pero lo descargado se vuelve a guardar
+        """
+        self.tienda = tienda
+        self.refrescar = refrescar
+        self.directorio = os.environ.get('FRUVER_CACHE', DIRECTORIO)
+        self.aciertos = 0
+        self.fallos = 0
+        self.guardadas = 0
+
+    @contextmanager
+    def bloqueado(self):
+        """Índice con exclusión entre hilos (Lock) y entre procesos (flock); se guarda al salir."""
+        os.makedirs(self.directorio, exist_ok=True)
+        ruta_indice = os.path.join(self.directorio, 'indice.json')
+        with self.lock_hilos, open(os.path.join(self.directorio, 'indice.lock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                indice = {}
+                if os.path.exists(ruta_indice):
+                    with open(ruta_indice) as archivo:
+                        indice = json.load(archivo)
+                yield indice
+                with open(ruta_indice + '.tmp', 'w') as archivo:
+                    json.dump(indice, archivo)
+                os.replace(ruta_indice + '.tmp', ruta_indice)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def clave(self, url, pagina):
+        return sha1(f'{self.tienda}|{url}|{pagina}'.encode('utf-8')).hexdigest()
+
+    def borrar(self, indice, clave):
+        entrada = indice.pop(clave)
+        ruta = os.path.join(self.directorio, entrada['archivo'])
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+    def vigente(self, url, pagina=None):
+        """True si obtener(url, pagina) serviría desde la caché; no cuenta como acierto ni fallo."""
+        if self.tienda is None or self.refrescar:
+            return False
+        with self.bloqueado() as indice:
+            entrada = indice.get(self.clave(url, pagina))
+            return entrada is not None and time() - entrada['guardado'] <= TTL.get(self.tienda, TTL_PREDETERMINADO)
+
+    def obtener(self, url, pagina=None):
+        """
+        Contenido guardado de (almacén en curso, url, pagina) si no ha vencido.
+
+        :return: Tupla (bytes, cabeceras) o None si no está, venció o se pidió --refresh
+        """
+        if self.tienda is None:
+            return None
+        clave = self.clave(url, pagina)
+        with self.bloqueado() as indice:
+            entrada = indice.get(clave)
+            if entrada is not None and time() - entrada['guardado'] > TTL.get(self.tienda, TTL_PREDETERMINADO):
+                self.borrar(indice, clave)
+                entrada = None
+            if entrada is None or self.refrescar:
+                self.fallos += 1
+                return None
+            with gzip.open(os.path.join(self.directorio, entrada['archivo'])) as archivo:
+                contenido = archivo.read()
+            entrada['usado'] = time()
+            self.aciertos += 1
+            return contenido, entrada['cabeceras']
+
+    def guardar(self, url, contenido, pagina=None, cabeceras=None):
+        """Guarda `contenido` (bytes) y descarta las entradas menos usadas si se pasa de TAMANO_MAXIMO."""
+        if self.tienda is None:
+            return
+        clave = self.clave(url, pagina)
+        archivo = os.path.join(self.tienda, clave + '.gz')
+        ruta = os.path.join(self.directorio, archivo)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with self.bloqueado() as indice:
+            with gzip.open(ruta + '.tmp', 'wb', compresslevel=1) as destino:
+                destino.write(contenido)
+            os.replace(ruta + '.tmp', ruta)
+            ahora = time()
+            indice[clave] = {'tienda': self.tienda, 'url': url, 'pagina': pagina, 'archivo': archivo, 'guardado': ahora, 'usado': ahora,
+                             'bytes': os.path.getsize(ruta), 'cabeceras': cabeceras or {}}
+            total = sum(entrada['bytes'] for entrada in indice.values())
+            for vieja in sorted(indice, key=lambda c: indice[c]['usado']):
+                if total <= TAMANO_MAXIMO:
+                    break
+                total -= indice[vieja]['bytes']
+                self.borrar(indice, vieja)
+            self.guardadas += 1
+
+    def imprimir_resumen(self):
+        if self.tienda is None:
+            print("Caché de páginas sin usar (--cache para servir lo vigente).")
+            return
+        consultas = self.aciertos + self.fallos
+        tasa = f" ({self.aciertos / consultas:.0%} de aciertos)" if consultas else ''
+        print(f"Caché de páginas {self.tienda}: {self.aciertos} aciertos, {self.fallos} fallos{tasa}, {self.guardadas} guardadas"
+              + (' [--refresh]' if self.refrescar else '') + '.')
+
+CACHE = CachePaginas()
+
+#%% FUNCIONES
+def html_pagina(driver):
+    """HTML renderizado de la página actual sin <script>: al mostrarlo de nuevo no se vuelve a ejecutar la app."""
+    return PATRON_SCRIPTS.sub('', driver.page_source)
+
+def mostrar_html(driver, html):
+    """Carga `html` en el driver sin red; los xpath de cada script funcionan igual que en la página real."""
+    driver.get('about:blank')
+    driver.execute_script('document.open(); document.write(arguments[0]); document.close();', html)
+
+def abrir_desde_cache(driver, url, pagina=None):
+    """Muestra la página guardada de (almacén en curso, url, pagina) en el driver; False si no hay."""
+    guardada = CACHE.obtener(url, pagina)
+    if guardada is None:
+        return False
+    mostrar_html(driver, guardada[0].decode('utf-8'))
+    return True
+
+def guardar_html(driver, url, pagina=None):
+    """Guarda la página actual del driver como (almacén en curso, url, pagina)."""
+    CACHE.guardar(url, html_pagina(driver).encode('utf-8'), pagina)
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Estado de la caché de páginas.')
+    parser.add_argument('--vaciar', nargs='*', default=None, help='Borra las entradas de estos almacenes (sin almacenes, todas)')
+    args = parser.parse_args()
+
+    with CACHE.bloqueado() as indice:
+        if args.vaciar is not None:
+            for clave in [clave for clave, entrada in indice.items() if not args.vaciar or entrada['tienda'] in args.vaciar]:
+                CACHE.borrar(indice, clave)
+        ahora = time()
+        print(f"{'tienda':<10}{'entradas':>10}{'vigentes':>10}{'MB':>10}")
+        for tienda in sorted({entrada['tienda'] for entrada in indice.values()}):
+            entradas = [entrada for entrada in indice.values() if entrada['tienda'] == tienda]
+            vigentes = sum(ahora - entrada['guardado'] <= TTL.get(tienda, TTL_PREDETERMINADO) for entrada in entradas)
+            print(f"{tienda:<10}{len(entradas):>10}{vigentes:>10}{sum(entrada['bytes'] for entrada in entradas) / 1024 ** 2:>10.1f}")
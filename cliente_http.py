@@ -0,0 +1,107 @@
+"""
+Codigo para consultar APIs JSON de los almacenes con conexiones HTTP reutilizables.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Pool de conexiones keep-alive con reintentos
+      y grabación opcional de respuestas para reproducirlas con servidor_local.py.
+    - [2026-10-18][Duvan]: Cada petición pasa por el limitador del host (limitador.py).
+    - [2026-10-18][Duvan]: Las respuestas se sirven de la caché de páginas (cache_paginas.py) mientras no venzan.
+"""
+#%% MODULOS
+import os
+import re
+import json
+from urllib.parse import urlencode
+from urllib3 import PoolManager
+from urllib3.util import Retry
+
+from limitador import permiso
+from cache_paginas import CACHE
+
+#%% CONFIGURACIÓN
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+
+#%% FUNCIONES
+def nombre_fixture(ruta, parametros=None):
+    """
+    Nombre de archivo estable para una petición, usado al grabar y al reproducir respuestas.
+
+    :param ruta: Ruta de la URL (sin dominio)
+    :param parametros: Diccionario de parámetros de la query
+    :return: Nombre de archivo .json
+    """
+    consulta = urlencode(sorted((parametros or {}).items()))
+    return re.sub(r'[^A-Za-z0-9]+', '_', f"{ruta}?{consulta}").strip('_') + '.json'
+
+#%% CLASES
+class ClienteHTTP:
+    """Cliente JSON sobre un PoolManager de urllib3 que reutiliza las conexiones entre páginas."""
+
+    def __init__(self, url_base, max_conexiones=4, timeout=30, reintentos=3, directorio_grabacion=None):
+        """
+        :param url_base: Esquema y dominio del almacén, p. ej. 'https://www.exito.com'
+        :param max_conexiones: Conexiones keep-alive que se mantienen abiertas por host
+        :param timeout: Timeout de cada petición en segundos
+        :param reintentos: Reintentos ante errores de red o respuestas 429/5xx
+        :param directorio_grabacion: Si se indica, cada respuesta se guarda ahí para reproducirla sin conexión
+        """
+        self.url_base = url_base.rstrip('/')
+        self.timeout = timeout
+        self.directorio_grabacion = directorio_grabacion
+        self.peticiones = 0
+        self.pool = PoolManager(
+            maxsize=max_conexiones,
+            block=True,
+            headers={'User-Agent': USER_AGENT, 'Accept': 'application/json'},
+            retries=Retry(total=reintentos, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504)),
+        )
+        if directorio_grabacion:
+            os.makedirs(directorio_grabacion, exist_ok=True)
+
+    def obtener(self, ruta, parametros=None):
+        """
+        Hace un GET y devuelve (json, cabeceras); si la respuesta está vigente en la caché no se consulta al almacén.
+
+        :param ruta: Ruta relativa a url_base
+        :param parametros: Diccionario de parámetros de la query
+        :return: Tupla (cuerpo decodificado, cabeceras de la respuesta)
+        """
+        url = self.url_base + ruta
+        if parametros:
+            url += '?' + urlencode(parametros)
+        guardada = CACHE.obtener(url)
+        if guardada is not None:
+            return json.loads(guardada[0].decode('utf-8')), guardada[1]
+        with permiso(url) as resultado:
+            respuesta = self.pool.request('GET', url, timeout=self.timeout)
+            resultado['exito'] = respuesta.status < 400
+        self.peticiones += 1
+        if respuesta.status >= 400:
+            raise RuntimeError(f"Error HTTP {respuesta.status} para {url}")
+        cabeceras = {clave.lower(): valor for clave, valor in respuesta.headers.items() if clave.lower() in ('resources', 'content-type')}
+        CACHE.guardar(url, respuesta.data, cabeceras=cabeceras)
+        if self.directorio_grabacion:
+            self.grabar(ruta, parametros, respuesta)
+        return json.loads(respuesta.data.decode('utf-8')), respuesta.headers
+
+    def obtener_json(self, ruta, parametros=None):
+        """Igual que obtener, pero solo devuelve el cuerpo decodificado."""
+        return self.obtener(ruta, parametros)[0]
+
+    def grabar(self, ruta, parametros, respuesta):
+        """Guarda el cuerpo y las cabeceras relevantes de una respuesta como fixture."""
+        nombre = os.path.join(self.directorio_grabacion, nombre_fixture(ruta, parametros))
+        with open(nombre, 'wb') as archivo:
+            archivo.write(respuesta.data)
+        cabeceras = {clave: valor for clave, valor in respuesta.headers.items() if clave.lower() in ('resources', 'content-type')}
+        with open(nombre + '.cabeceras', 'w') as archivo:
+            json.dump({'estado': respuesta.status, 'cabeceras': cabeceras}, archivo)
+
+    def cerrar(self):
+        self.pool.clear()
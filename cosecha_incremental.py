@@ -0,0 +1,76 @@
+"""
+Codigo para cosechar de forma incremental los productos que agrega el botón "Mostrar más".
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Se procesa solo lo agregado desde el último clic
+      y se deduplica con un índice hash en lugar de buscar en la lista de diccionarios.
+    - [2026-10-18][Duvan]: Se agrega el modo 'lxml' (page_source analizado localmente).
+"""
+#%% MODULOS
+from selenium.webdriver.common.by import By
+
+from extraccion_js import extraer_productos_js
+from extraccion_lxml import extraer_productos_lxml
+
+#%% CLASES
+class CosechaIncremental:
+    """
+    Lleva el desplazamiento de tarjetas ya leídas en el DOM y el índice de productos vistos.
+
+    Carulla y Euro agregan tarjetas al final de la grilla con cada "Mostrar más", por lo que basta
+    con leer las tarjetas cuya posición supera el desplazamiento para tener costo constante por clic.
+    """
+
+    def __init__(self, xpath_tarjetas, campos):
+        self.xpath_tarjetas = xpath_tarjetas
+        self.campos = campos
+        self.desplazamiento = 0
+        self.vistos = set()
+
+    def xpath_nuevas(self):
+        """Xpath que solo selecciona las tarjetas agregadas después del desplazamiento actual."""
+        return f'({self.xpath_tarjetas})[position() > {self.desplazamiento}]'
+
+    def tarjetas_nuevas(self, driver, modo='js', extraer=None):
+        """
+        Obtiene la información de las tarjetas agregadas desde la iteración anterior.
+
+        :param driver: El driver de Selenium
+        :param modo: 'js' para un solo execute_script, 'lxml' para un solo page_source, 'elementos' para extraer tarjeta por tarjeta
+        :param extraer: Función (driver, tarjeta) -> dict del script, usada en modo 'elementos'
+        :return: Lista de diccionarios con la información de cada tarjeta nueva
+        """
+        if modo in ('js', 'lxml'):
+            extraer_productos = extraer_productos_js if modo == 'js' else extraer_productos_lxml
+            productos = extraer_productos(driver, self.xpath_tarjetas, self.campos, desde=self.desplazamiento)
+            self.desplazamiento += len(productos)
+            return productos
+        tarjetas = driver.find_elements(By.XPATH, self.xpath_nuevas())
+        self.desplazamiento += len(tarjetas)
+        return [extraer(driver, tarjeta) for tarjeta in tarjetas]
+
+    def agregar(self, productos, productos_list):
+        """
+        Agrega a productos_list los productos que no se hayan visto antes.
+
+        :param productos: Lista de diccionarios recién extraídos
+        :param productos_list: Lista acumulada del script
+        :return: Número de productos nuevos agregados
+        """
+        nuevos = 0
+        for info_producto in productos:
+            if not info_producto:
+                continue
+            clave = tuple(info_producto.values())
+            if clave in self.vistos:
+                continue
+            self.vistos.add(clave)
+            productos_list.append(info_producto)
+            nuevos += 1
+        return nuevos
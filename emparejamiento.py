@@ -0,0 +1,204 @@
+"""
+Codigo para asignar un identificador común a un mismo producto en los cinco almacenes.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Los nombres se normalizan (minúsculas, sin tildes,
+      sin cantidades, marcas ni palabras de empaque), los nombres iguales se agrupan por hash y solo se
+      comparan los que comparten el primer token; los pares parecidos se unen con conjuntos disjuntos.
+    - [2026-10-18][Duvan]: La comparación entre almacenes solo junta precios por unidad de la misma unidad.
+    - [2026-10-18][Duvan]: Un subbloque de más de MAX_BLOQUE claves ya no se recorta: se parte por número de
+      tokens (dos claves parecidas no pueden diferir mucho en eso) y se avisa de su tamaño.
+
+Uso:
+    python emparejamiento.py examples/ [--salida equivalencias.csv]
+"""
+#%% MODULOS
+import re
+import argparse
+import unicodedata
+from time import perf_counter
+from functools import lru_cache
+from itertools import combinations
+from collections import defaultdict
+from pandas import concat, read_csv
+
+from normalizacion import PATRON_CANTIDAD
+from historico import datos_archivo, archivos_salida, esquema_unificado
+
+#%% CONFIGURACIÓN
+# Marcas propias y de proveedores que aparecen en los nombres
+MARCAS = {'taeq', 'frescampo', 'carulla', 'car', 'exito', 'ekono', 'surtimax', 'jumbo', 'metro', 'cuisine', 'euro', 'euromax', 'merka', 'camsal', 'colavita'}
+# Empaque, presentación y conectores que no distinguen un producto de otro
+PALABRAS_VACIAS = {
+    'x', 'de', 'del', 'la', 'el', 'los', 'las', 'en', 'con', 'por', 'y', 'a',
+    'und', 'unds', 'unidad', 'unidades', 'malla', 'bolsa', 'bandeja', 'paquete', 'pet', 'granel',
+    'sel', 'selecto', 'seleccion', 'kosher', 'importado', 'nacional', 'fresco', 'fresca',
+    'organico', 'organica', 'organicos', 'organicas', 'aprox', 'tipo', 'empacada', 'empacado', 'empacad',
+    'band', 'bja', 'hidrop', 'economica',
+}
+UMBRAL = 0.6 # Jaccard mínimo entre los tokens de dos nombres para considerarlos el mismo producto
+MAX_BLOQUE = 200 # Bloques más grandes se parten por otro token y, si siguen grandes, por número de tokens
+
+#%% CLASES
+class ConjuntosDisjuntos:
+    """Unión-búsqueda con compresión de caminos sobre claves arbitrarias."""
+
+    def __init__(self):
+        self.padre = {}
+
+    def buscar(self, elemento):
+        self.padre.setdefault(elemento, elemento)
+        while self.padre[elemento] != elemento:
+            self.padre[elemento] = self.padre[self.padre[elemento]]
+            elemento = self.padre[elemento]
+        return elemento
+
+    def unir(self, a, b):
+        raiz_a, raiz_b = self.buscar(a), self.buscar(b)
+        if raiz_a != raiz_b:
+            self.padre[max(raiz_a, raiz_b)] = min(raiz_a, raiz_b)
+
+#%% FUNCIONES
+def singular(token):
+    """'limones' -> 'limon', 'tomates' -> 'tomate'; suficiente para los nombres de fruver."""
+    if len(token) > 4 and token.endswith('es') and token[-3] in 'lnrdz':
+        return token[:-2]
+    if len(token) > 3 and token.endswith('s'):
+        return token[:-1]
+    return token
+
+@lru_cache(maxsize=None)
+def normalizar_nombre(nombre):
+    """
+    Tokens que identifican el producto, en el orden del nombre (el primero es el sustantivo).
+
+    'TOMATE CHONTO FRESCAMPO 1000 Gr' y 'Tomate chonto x 500gr' -> ('tomate', 'chonto')
+    """
+    texto = unicodedata.normalize('NFKD', str(nombre).lower())
+    texto = ''.join(caracter for caracter in texto if not unicodedata.combining(caracter))
+    texto = PATRON_CANTIDAD.sub(' ', texto)
+    tokens = (singular(token) for token in re.findall(r'[a-z]+', texto) if token not in PALABRAS_VACIAS and token not in MARCAS)
+    return tuple(dict.fromkeys(token for token in tokens if len(token) > 1))
+
+def similitud(clave_a, clave_b):
+    a, b = set(clave_a), set(clave_b)
+    return len(a & b) / len(a | b)
+
+def pares_candidatos(claves):
+    """
+    Pares de claves distintas que vale la pena comparar.
+
+    Se bloquea por el primer token; un bloque de más de MAX_BLOQUE claves solo compara las que
+    además comparten otro token, así el costo crece con el tamaño de los bloques y no con n·m. Nada
+    se pierde: si solo compartieran el primer token su similitud sería menor que UMBRAL. Un subbloque
+    que sigue pasando de MAX_BLOQUE se compara completo salvo los pares cuyo número de tokens difiere
+    tanto que no pueden llegar a UMBRAL (|a ∩ b| / |a ∪ b| <= min(|a|, |b|) / max(|a|, |b|)).
+    """
+    bloques = defaultdict(list)
+    for clave in claves:
+        bloques[clave[0]].append(clave)
+    for bloque in bloques.values():
+        if len(bloque) <= MAX_BLOQUE:
+            yield from combinations(bloque, 2)
+            continue
+        subbloques = defaultdict(list)
+        for clave in bloque:
+            for token in clave[1:]:
+                subbloques[token].append(clave)
+        vistos = set()
+        for token, subbloque in subbloques.items():
+            if len(subbloque) > MAX_BLOQUE:
+                print(f"Subbloque '{bloque[0][0]} {token}' de {len(subbloque)} claves (más de {MAX_BLOQUE}): se compara por número de tokens.")
+                pares = pares_por_longitud(subbloque)
+            else:
+                pares = combinations(subbloque, 2)
+            for par in pares:
+                if par not in vistos:
+                    vistos.add(par)
+                    yield par
+
+def pares_por_longitud(claves):
+    """Pares de claves cuyo número de tokens es compatible con una similitud de al menos UMBRAL."""
+    por_longitud = defaultdict(list)
+    for clave in claves:
+        por_longitud[len(clave)].append(clave)
+    longitudes = sorted(por_longitud)
+    for i, corta in enumerate(longitudes):
+        yield from combinations(por_longitud[corta], 2)
+        for larga in longitudes[i + 1:]:
+            if corta < UMBRAL * larga:
+                break
+            yield from ((a, b) for a in por_longitud[corta] for b in por_longitud[larga])
+
+def emparejar(df):
+    """
+    Asigna id_producto a cada fila; filas de cualquier almacén con el mismo id son el mismo producto.
+
+    :param df: DataFrame con al menos 'tienda' y 'producto'
+    :return: df con las columnas 'clave' (tokens normalizados) e 'id_producto'
+    """
+    claves = df['producto'].map(normalizar_nombre)
+    # Los nombres que normalizan igual se unen por hash, sin compararlos
+    distintas = [clave for clave in set(claves) if clave]
+    conjuntos = ConjuntosDisjuntos()
+    for clave in distintas:
+        conjuntos.buscar(clave)
+    for clave_a, clave_b in pares_candidatos(distintas):
+        if similitud(clave_a, clave_b) >= UMBRAL:
+            conjuntos.unir(clave_a, clave_b)
+    grupos = defaultdict(list)
+    for clave in distintas:
+        grupos[conjuntos.buscar(clave)].append(clave)
+    # El id es la clave más corta del grupo: estable entre corridas mientras no aparezca una más corta
+    identificadores = {}
+    for miembros in grupos.values():
+        representante = min(miembros, key=lambda clave: (len(clave), clave))
+        for clave in miembros:
+            identificadores[clave] = '-'.join(representante)
+    df = df.assign(clave=claves.map(' '.join), id_producto=claves.map(identificadores.get))
+    return df
+
+def ultimas_salidas(rutas):
+    """Última salida de cada almacén en el esquema de historico.py, con la columna 'tienda'."""
+    ultimas = {}
+    for ruta in archivos_salida(rutas):
+        ultimas[datos_archivo(ruta)[0]] = ruta
+    tablas = []
+    for tienda, ruta in ultimas.items():
+        df = read_csv(ruta, dtype=str, keep_default_na=False)
+        if not df.empty and 'precio' in df:
+            tablas.append(esquema_unificado(df, datos_archivo(ruta)[1]).assign(tienda=tienda))
+    return concat(tablas, ignore_index=True)
+
+def comparar_tiendas(equivalencias):
+    """
+    Precio por unidad mínimo de cada producto presente en dos o más almacenes, un almacén por columna.
+
+    Solo se comparan precios en la misma unidad: cada fila es un (id_producto, unidad), así $/und y $/g
+    del mismo producto quedan en filas distintas.
+    """
+    presentes = equivalencias.dropna(subset=['id_producto', 'unidad', 'precio_x_unidad'])
+    varias = presentes.groupby(['id_producto', 'unidad'])['tienda'].transform('nunique') > 1
+    return presentes[varias].pivot_table(index=['id_producto', 'unidad'], columns='tienda', values='precio_x_unidad', aggfunc='min')
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Identificador común de productos entre almacenes.')
+    parser.add_argument('rutas', nargs='+', help='CSV o carpetas de salidas; se usa la última de cada almacén')
+    parser.add_argument('--salida', default=None, help='CSV donde guardar tienda, producto, clave e id_producto')
+    args = parser.parse_args()
+
+    productos = ultimas_salidas(args.rutas)
+    inicio = perf_counter()
+    equivalencias = emparejar(productos)
+    duracion = perf_counter() - inicio
+    print(f"{len(equivalencias)} filas, {equivalencias['id_producto'].nunique()} productos en {duracion:.3f} s")
+    print(comparar_tiendas(equivalencias).round(2).to_string())
+    if args.salida:
+        equivalencias[['tienda', 'producto', 'clave', 'id_producto']].to_csv(args.salida, index=False)
@@ -0,0 +1,212 @@
+"""
+Codigo para esperar eventos de la página (cambio de grilla, DOM quieto) en lugar de pausas fijas.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Las esperas terminan apenas la grilla de productos
+      cambia y el DOM queda quieto; la pausa de cortesía queda aparte y es configurable.
+    - [2026-10-18][Duvan]: Cada espera también queda en el histograma de esperas de metricas.py.
+    - [2026-10-18][Duvan]: Plazos anidados (corrida, página, campos): cada espera toma lo que queda del plazo
+      en lugar de un timeout fijo y las que se agotan se reportan con su costo.
+"""
+#%% MODULOS
+from time import sleep, perf_counter
+from random import uniform
+from selenium.common.exceptions import TimeoutException, JavascriptException, NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from metricas import METRICAS
+
+#%% SCRIPT
+# Resuelve cuando la firma de la grilla (cantidad de tarjetas y texto de la primera) es distinta de la
+# previa y no hubo mutaciones del DOM durante quietudMs. Sin xpath solo espera la quietud del DOM.
+JS_ESPERAR_GRILLA = """
+var xpath = arguments[0];
+var previa = arguments[1];
+var quietudMs = arguments[2];
+var limiteMs = arguments[3];
+var listo = arguments[arguments.length - 1];
+function firma() {
+    if (xpath === null) { return null; }
+    var tarjetas = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var primera = tarjetas.snapshotLength ? (tarjetas.snapshotItem(0).textContent || '').trim() : '';
+    return [tarjetas.snapshotLength, primera];
+}
+function cambio(actual) {
+    if (xpath === null) { return true; }
+    if (actual[0] === 0) { return false; }
+    return previa === null || actual[0] !== previa[0] || actual[1] !== previa[1];
+}
+var inicio = Date.now();
+var ultimaMutacion = Date.now();
+var observador = new MutationObserver(function() { ultimaMutacion = Date.now(); });
+observador.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+var intervalo = setInterval(function() {
+    var ahora = Date.now();
+    var actual = firma();
+    var quieto = ahora - ultimaMutacion >= quietudMs;
+    if ((cambio(actual) && quieto) || ahora - inicio >= limiteMs) {
+        clearInterval(intervalo);
+        observador.disconnect();
+        listo({firma: actual, completo: cambio(actual) && quieto});
+    }
+}, 100);
+"""
+
+JS_FIRMA_GRILLA = """
+var tarjetas = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var primera = tarjetas.snapshotLength ? (tarjetas.snapshotItem(0).textContent || '').trim() : '';
+return [tarjetas.snapshotLength, primera];
+"""
+
+#%% CLASES
+class Plazo:
+    """
+    Fecha límite de una corrida, una página o los campos de una página; nunca pasa la del plazo padre.
+
+    Las esperas piden lo que queda con acotar() en lugar de usar su propio timeout, así una tarjeta
+    sin precio por unidad gasta del presupuesto de la página y no 20 s por su cuenta.
+    """
+
+    def __init__(self, segundos=None, padre=None, etiqueta='corrida'):
+        """
+        :param segundos: Duración del plazo; None no agrega límite propio (solo el del padre)
+        :param padre: Plazo que contiene a este
+        :param etiqueta: Nombre del plazo en los mensajes
+        """
+        self.etiqueta = etiqueta
+        self.inicio = perf_counter()
+        propio = self.inicio + segundos if segundos is not None else float('inf')
+        self.limite = min(propio, padre.limite) if padre else propio
+        # El plazo que de verdad manda es el que vence primero
+        self.origen = etiqueta if padre is None or propio <= padre.limite else padre.origen
+
+    def hijo(self, segundos, etiqueta):
+        return Plazo(segundos, self, etiqueta)
+
+    def restante(self):
+        return max(0.0, self.limite - perf_counter())
+
+    def vencido(self):
+        return self.restante() <= 0
+
+    def acotar(self, timeout):
+        """El menor entre el timeout de la espera y lo que queda del plazo."""
+        return min(timeout, self.restante())
+
+class RegistroEsperas:
+    """Acumula, por etiqueta, el tiempo realmente esperado frente al presupuesto fijo que reemplaza."""
+
+    def __init__(self):
+        self.esperas = {}
+
+    def reiniciar(self):
+        self.esperas.clear()
+
+    def registrar(self, etiqueta, esperado, presupuesto_fijo, completo=True, plazo=None):
+        """
+        :param completo: False si la espera se agotó sin que ocurriera el evento; su duración es el costo
+        :param plazo: Plazo que acotó la espera, si se agotó por él y no por su propio timeout
+        """
+        datos = self.esperas.setdefault(etiqueta, {'veces': 0, 'esperado': 0.0, 'fijo': 0.0, 'agotadas': 0, 'costo': 0.0, 'por_plazo': {}})
+        datos['veces'] += 1
+        datos['esperado'] += esperado
+        datos['fijo'] += presupuesto_fijo
+        if not completo:
+            datos['agotadas'] += 1
+            datos['costo'] += esperado
+            if plazo is not None:
+                datos['por_plazo'][plazo.origen] = datos['por_plazo'].get(plazo.origen, 0) + 1
+        METRICAS.observar_espera(etiqueta, esperado)
+
+    def imprimir_resumen(self):
+        total_esperado = sum(datos['esperado'] for datos in self.esperas.values())
+        total_fijo = sum(datos['fijo'] for datos in self.esperas.values())
+        print(f"Esperas: {total_esperado:.1f} s reales frente a {total_fijo:.1f} s de pausas fijas.")
+        for etiqueta, datos in self.esperas.items():
+            por_plazo = ', '.join(f"{veces} por el plazo de {origen}" for origen, veces in datos['por_plazo'].items())
+            print(f"  {etiqueta}: {datos['veces']} esperas, {datos['esperado']:.1f} s (antes {datos['fijo']:.1f} s), "
+                  f"{datos['agotadas']} agotadas que costaron {datos['costo']:.1f} s" + (f" ({por_plazo})" if por_plazo else ''))
+
+REGISTRO = RegistroEsperas()
+
+#%% FUNCIONES
+def firma_grilla(driver, xpath_tarjetas):
+    """Cantidad de tarjetas y texto de la primera; sirve para detectar que la grilla cambió."""
+    return driver.execute_script(JS_FIRMA_GRILLA, xpath_tarjetas)
+
+def esperar_cambio_grilla(driver, xpath_tarjetas, firma_previa=None, timeout=30, quietud=0.5, etiqueta='grilla', presupuesto_fijo=0.0, plazo=None):
+    """
+    Espera a que la grilla de productos cambie respecto a firma_previa y el DOM quede quieto.
+
+    :param driver: El driver de Selenium
+    :param xpath_tarjetas: Xpath de las tarjetas; None espera solo la quietud del DOM
+    :param firma_previa: Resultado de firma_grilla antes de la acción (None: basta con que haya tarjetas)
+    :param timeout: Tiempo máximo de espera en segundos
+    :param quietud: Segundos sin mutaciones del DOM para dar la grilla por estable
+    :param etiqueta: Nombre de la espera en el registro
+    :param presupuesto_fijo: Segundos que esperaba la pausa fija reemplazada, para el reporte
+    :param plazo: Plazo de la página o corrida; la espera nunca pasa de lo que le queda
+    :return: Firma nueva de la grilla (o None si no se indicó xpath)
+    """
+    inicio = perf_counter()
+    completo = False
+    firma = firma_previa
+    timeout_original = timeout
+    timeout = plazo.acotar(timeout) if plazo else timeout
+    if timeout <= 0:
+        REGISTRO.registrar(etiqueta, 0.0, presupuesto_fijo, False, plazo)
+        return firma
+    try:
+        driver.set_script_timeout(timeout + 5)
+        resultado = driver.execute_async_script(JS_ESPERAR_GRILLA, xpath_tarjetas, firma_previa, int(quietud * 1000), int(timeout * 1000))
+        firma, completo = resultado['firma'], resultado['completo']
+    except (TimeoutException, JavascriptException) as e:
+        print(f"Espera '{etiqueta}' interrumpida: {str(e)}")
+    REGISTRO.registrar(etiqueta, perf_counter() - inicio, presupuesto_fijo, completo, plazo if timeout < timeout_original else None)
+    return firma
+
+def esperar_quietud_dom(driver, timeout=10, quietud=0.5, etiqueta='dom', presupuesto_fijo=0.0, plazo=None):
+    """Espera a que el DOM pase `quietud` segundos sin mutaciones (p. ej. tras un scroll con carga diferida)."""
+    esperar_cambio_grilla(driver, None, None, timeout, quietud, etiqueta, presupuesto_fijo, plazo)
+
+def esperar_hasta(driver, condicion, timeout=10, etiqueta='elemento', plazo=None, presupuesto_fijo=0.0):
+    """
+    WebDriverWait acotado por el plazo; con cero segundos se evalúa la condición una sola vez, sin sondeo.
+
+    :param driver: Driver o elemento sobre el que se evalúa la condición
+    :param condicion: Condición de expected_conditions o función driver -> valor
+    :param timeout: Máximo propio de la espera
+    :param etiqueta: Nombre de la espera en el registro
+    :param plazo: Plazo de la página o corrida
+    :return: Valor de la condición, o None si se agotó el tiempo
+    """
+    limite = plazo.acotar(timeout) if plazo else timeout
+    inicio = perf_counter()
+    try:
+        if limite > 0:
+            # Con sondeos más cortos que el límite la espera no se pasa del plazo por medio segundo
+            resultado = WebDriverWait(driver, limite, poll_frequency=min(0.5, limite)).until(condicion)
+        else:
+            resultado = condicion(driver) or None
+    except (TimeoutException, NoSuchElementException, StaleElementReferenceException):
+        resultado = None
+    REGISTRO.registrar(etiqueta, perf_counter() - inicio, presupuesto_fijo, resultado is not None, plazo if limite < timeout else None)
+    return resultado
+
+def pausa_cortesia(rango=(0, 0), etiqueta='cortesia'):
+    """
+    Pausa explícita para no sobrecargar al almacén, separada de la espera de carga.
+
+    :param rango: Tupla (mínimo, máximo) en segundos; (0, 0) la desactiva
+    """
+    if not rango or rango[1] <= 0:
+        return
+    espera = uniform(*rango)
+    sleep(espera)
+    REGISTRO.registrar(etiqueta, espera, 0.0)
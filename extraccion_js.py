@@ -0,0 +1,89 @@
+"""
+Codigo para extraer todas las tarjetas de producto de una pagina en una sola llamada a WebDriver.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Se extraen nombre, precio y precio por unidad
+      de todas las tarjetas con un unico driver.execute_script por pagina.
+    - [2026-10-18][Duvan]: Se agrega desplazamiento para leer solo las tarjetas nuevas tras "Mostrar más".
+"""
+#%% MODULOS
+from selenium.webdriver.support.wait import POLL_FREQUENCY
+
+#%% SCRIPT
+# Se evaluan los mismos xpath que usa cada script, pero dentro del navegador, y se devuelven
+# solo valores planos (listas de textos) para no pagar un viaje HTTP por cada campo.
+JS_EXTRAER_TARJETAS = """
+var xpathTarjetas = arguments[0];
+var xpathsCampos = arguments[1];
+var predeterminado = arguments[2];
+var desde = arguments[3] || 0;
+var tarjetas = document.evaluate(xpathTarjetas, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var filas = [];
+var faltantes = 0;
+for (var i = desde; i < tarjetas.snapshotLength; i++) {
+    var tarjeta = tarjetas.snapshotItem(i);
+    var fila = [];
+    for (var j = 0; j < xpathsCampos.length; j++) {
+        if (xpathsCampos[j] === null) {
+            fila.push(predeterminado);
+            continue;
+        }
+        var nodo = document.evaluate(xpathsCampos[j], tarjeta, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (nodo === null) {
+            fila.push(predeterminado);
+            faltantes++;
+        } else {
+            fila.push((nodo.innerText || nodo.textContent || '').trim());
+        }
+    }
+    filas.push(fila);
+}
+return {filas: filas, faltantes: faltantes};
+"""
+
+#%% FUNCIONES
+def estimar_comandos_ahorrados(n_tarjetas, n_campos, faltantes, tiempo_espera=10):
+    """
+    Estima cuantos comandos WebDriver hubiera costado la extraccion con obtener_texto.
+
+    Por cada campo encontrado el modo clasico hace un find_element (WebDriverWait) y un .text,
+    y por cada campo faltante sondea find_element cada POLL_FREQUENCY segundos hasta el timeout.
+    A eso se suma el find_elements inicial y se resta la unica llamada del modo JS.
+
+    :param n_tarjetas: Número de tarjetas extraídas
+    :param n_campos: Número de campos con xpath por tarjeta
+    :param faltantes: Número de campos que no se encontraron
+    :param tiempo_espera: Timeout que usaba obtener_texto en el script
+    :return: Número estimado de comandos ahorrados
+    """
+    encontrados = n_tarjetas * n_campos - faltantes
+    sondeos_por_faltante = int(tiempo_espera / POLL_FREQUENCY)
+    comandos_clasicos = 1 + 2 * encontrados + sondeos_por_faltante * faltantes
+    return comandos_clasicos - 1
+
+def extraer_productos_js(driver, xpath_tarjetas, campos, valor_predeterminado="No disponible", tiempo_espera=10, desde=0):
+    """
+    Extrae todas las tarjetas de producto de la pagina actual con un solo execute_script.
+
+    :param driver: El driver de Selenium
+    :param xpath_tarjetas: Xpath absoluto de las tarjetas de producto
+    :param campos: Diccionario ordenado {columna: xpath relativo a la tarjeta}; None deja el valor predeterminado
+    :param valor_predeterminado: Valor para los campos que no existan en la tarjeta
+    :param tiempo_espera: Timeout de obtener_texto en el script, solo para reportar el ahorro
+    :param desde: Número de tarjetas iniciales que se omiten (ya procesadas en iteraciones previas)
+    :return: Lista de diccionarios {columna: texto}, uno por tarjeta
+    """
+    columnas = list(campos.keys())
+    xpaths = list(campos.values())
+    resultado = driver.execute_script(JS_EXTRAER_TARJETAS, xpath_tarjetas, xpaths, valor_predeterminado, desde)
+    filas = resultado['filas']
+    n_campos = sum(1 for xpath in xpaths if xpath is not None)
+    ahorro = estimar_comandos_ahorrados(len(filas), n_campos, resultado['faltantes'], tiempo_espera)
+    print(f"[JS] {len(filas)} tarjetas en 1 comando WebDriver ({ahorro} comandos ahorrados). ", end='')
+    return [dict(zip(columnas, fila)) for fila in filas]
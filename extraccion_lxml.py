@@ -0,0 +1,70 @@
+"""
+Codigo para extraer las tarjetas de producto analizando page_source localmente con lxml.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Se pide page_source una vez por página y se evalúan
+      los mismos xpath de cada script, precompilados, sobre el árbol de lxml; el análisis puede ir en un
+      hilo aparte mientras el navegador pasa a la página siguiente.
+"""
+#%% MODULOS
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree, html
+
+#%% CONFIGURACIÓN
+# lxml suelta el GIL al analizar, así que el análisis avanza mientras el hilo principal espera a Chrome
+ANALIZADOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='lxml')
+
+#%% FUNCIONES
+@lru_cache(maxsize=None)
+def compilar(xpath_tarjetas, campos):
+    """
+    Precompila el xpath de las tarjetas y el de cada campo (una sola vez por script).
+
+    :param campos: Tupla de pares (columna, xpath relativo a la tarjeta o None)
+    :return: Tupla (XPath de tarjetas, lista de (columna, XPath o None))
+    """
+    return etree.XPath(xpath_tarjetas), [(columna, etree.XPath(xpath) if xpath else None) for columna, xpath in campos]
+
+def texto(nodo):
+    """Texto visible del nodo con los espacios colapsados, como innerText en una sola línea."""
+    return ' '.join(nodo.text_content().split())
+
+def extraer_productos_html(contenido, xpath_tarjetas, campos, valor_predeterminado="No disponible", desde=0):
+    """
+    Extrae las tarjetas de producto de un HTML ya descargado, sin llamadas a WebDriver.
+
+    :param contenido: HTML de la página (driver.page_source)
+    :param xpath_tarjetas: Xpath absoluto de las tarjetas de producto
+    :param campos: Diccionario ordenado {columna: xpath relativo a la tarjeta}; None deja el valor predeterminado
+    :param valor_predeterminado: Valor para los campos que no existan en la tarjeta
+    :param desde: Número de tarjetas iniciales que se omiten (ya procesadas en iteraciones previas)
+    :return: Lista de diccionarios {columna: texto}, uno por tarjeta
+    """
+    xpath_todas, xpaths_campos = compilar(xpath_tarjetas, tuple(campos.items()))
+    productos = []
+    for tarjeta in xpath_todas(html.fromstring(contenido))[desde:]:
+        fila = {}
+        for columna, xpath in xpaths_campos:
+            nodos = xpath(tarjeta) if xpath is not None else []
+            fila[columna] = texto(nodos[0]) if nodos else valor_predeterminado
+        productos.append(fila)
+    return productos
+
+def extraer_productos_lxml(driver, xpath_tarjetas, campos, valor_predeterminado="No disponible", desde=0):
+    """Igual que extraer_productos_js, pero con un solo page_source y el análisis en este proceso."""
+    return extraer_productos_html(driver.page_source, xpath_tarjetas, campos, valor_predeterminado, desde)
+
+def analizar_en_segundo_plano(driver, xpath_tarjetas, campos, valor_predeterminado="No disponible", desde=0):
+    """
+    Copia page_source ahora y lo analiza en ANALIZADOR; el driver queda libre para seguir navegando.
+
+    :return: Future con la lista de productos de extraer_productos_html
+    """
+    return ANALIZADOR.submit(extraer_productos_html, driver.page_source, xpath_tarjetas, campos, valor_predeterminado, desde)
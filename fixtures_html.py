@@ -0,0 +1,197 @@
+"""
+Codigo para generar páginas HTML de prueba de cada almacén a partir de los CSV de examples/.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Se reconstruye el texto crudo de cada tarjeta y se
+      arman el listado, la paginación (?page=N) o el botón "Mostrar más" con los selectores de cada script.
+
+Las páginas se sirven con servidor_local.py y las usa benchmark.py. Merka no tiene CSV en examples/,
+así que se usa el catálogo de Euro con el formato de precios de Merka.
+
+Uso:
+    python fixtures_html.py [directorio_destino]
+"""
+#%% MODULOS
+import os
+import re
+import sys
+import json
+from html import escape
+from pandas import read_csv
+
+from cliente_http import nombre_fixture
+
+#%% CONFIGURACIÓN
+DIRECTORIO_EJEMPLOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'examples')
+RUTA_LISTADO = '/listado'
+CATALOGOS = {
+    'exito': 'exito_310820241903.csv',
+    'carulla': 'carulla_010920240155.csv',
+    'jumbo': 'jumbo_310820242321.csv',
+    'euro': 'euro_010920240051.csv',
+    'merka': 'euro_010920240051.csv',
+}
+TAMANO_PAGINA = {'exito': 16, 'carulla': 16, 'jumbo': 20, 'euro': 16, 'merka': 24}
+
+#%% PLANTILLAS
+PLANTILLA_PAGINA = """<!DOCTYPE html>
+<html lang="es">
+<head><meta charset="utf-8"><title>{titulo}</title></head>
+<body>
+{cuerpo}
+</body>
+</html>
+"""
+
+TARJETAS = {
+    'exito': ('<div class="productCard_productInfo__yn2lK"><p class="styles_name__qQJiK">{producto}</p>'
+              '<p class="ProductPrice_container__price__XmMWA">{precio}</p>'
+              '<span class="product-unit_price-unit__text">{precio_unidad}</span></div>'),
+    'carulla': ('<div class="vtex-flex-layout-0-x-flexRow vtex-flex-layout-0-x-flexRow--product-info-container">'
+                '<span class="vtex-store-components-3-x-productBrand vtex-store-components-3-x-brandName">{producto}</span>'
+                '<span class="exito-vtex-components-4-x-currencyContainer">{precio}</span></div>'),
+    'jumbo': ('<article class="vtex-product-summary-2-x-element pointer">'
+              '<span class="vtex-product-summary-2-x-productBrand vtex-product-summary-2-x-brandName t-body">{producto}</span>'
+              '<div class="tiendasjumboqaio-jumbo-minicart-2-x-price">{precio}</div>'
+              '<div class="w-100 tiendasjumboqaio-calculate-pum-2-x-PUMInfo tiendasjumboqaio-calculate-pum-2-x-PUMInfo--shelf">{precio_unidad}</div>'
+              '</article>'),
+    'euro': ('<article class="vtex-product-summary-2-x-element">'
+             '<span class="vtex-product-summary-2-x-productBrand">{producto}</span>'
+             '<span class="vtex-product-price-1-x-currencyContainer">{precio}</span></article>'),
+    'merka': ('<div class="product-content"><h3><a href="#">{producto}</a></h3>'
+              '<span class="price new-price">{precio}</span></div>'),
+}
+
+BANNERS = {
+    'carulla': '<span class="exito-geolocation-3-x-cursorPointer" onclick="this.style.display=\'none\'">&times;</span>',
+    'euro': ('<button class="vtex-modal-layout-0-x-closeButton vtex-modal-layout-0-x-closeButton--delivery-geolocation-modal '
+             'ma0 bg-transparent pointer bw0 pa3" onclick="this.style.display=\'none\'">&times;</button>'),
+    'merka': ('<div id="modal-ciudad"><input type="radio" name="ciudad" id="medellin"> Medellín '
+              '<button id="select-city-button" onclick="document.getElementById(\'modal-ciudad\').style.display=\'none\'">'
+              'Confirmar</button></div>'),
+}
+
+# Las tarjetas se insertan por lotes con un retardo, como la carga asíncrona de "Mostrar más"
+JS_MOSTRAR_MAS = """<div id="grilla"></div>
+<button type="button" id="mostrar-mas"><div>Mostrar más</div></button>
+<script>
+var TARJETAS = {tarjetas};
+var TAMANO = {tamano};
+var RETARDO = {retardo};
+var mostradas = 0;
+function mostrarMas() {{
+    var grilla = document.getElementById('grilla');
+    grilla.insertAdjacentHTML('beforeend', TARJETAS.slice(mostradas, mostradas + TAMANO).join(''));
+    mostradas += TAMANO;
+    if (mostradas >= TARJETAS.length) {{ document.getElementById('mostrar-mas').remove(); }}
+}}
+document.getElementById('mostrar-mas').onclick = function () {{ setTimeout(mostrarMas, RETARDO); }};
+mostrarMas();
+</script>"""
+
+#%% FUNCIONES
+def formato_precio(valor, decimales=False):
+    """'3112' -> '$ 3.112' (o '$ 3.112,00'); los valores sin dígitos se dejan igual."""
+    digitos = re.sub(r'\D', '', str(valor))
+    if not digitos:
+        return str(valor).strip()
+    miles = f"{int(digitos):,}".replace(',', '.')
+    return f"$ {miles},00" if decimales else f"$ {miles}"
+
+def texto_crudo(tienda, fila):
+    """
+    Reconstruye el texto que muestra la tarjeta a partir de una fila ya posprocesada.
+
+    :param tienda: Almacén
+    :param fila: Fila del CSV de examples/ (producto o nombre, precio y precio por unidad)
+    :return: Diccionario con producto, precio y precio_unidad como los lee el script
+    """
+    producto = fila.get('producto', fila.get('nombre', '')).strip()
+    crudo = {'producto': producto, 'precio': formato_precio(fila['precio'], decimales=tienda == 'merka'), 'precio_unidad': ''}
+    if tienda == 'exito':
+        unidad, valor = fila['unidad'].strip(), fila['precio_x_unidad'].strip()
+        crudo['precio_unidad'] = unidad if unidad == 'No disponible' else f"{unidad} a $ {valor}"
+    elif tienda == 'jumbo':
+        valor = fila['precio_x_unidad'].strip().replace('.', ',')
+        crudo['precio_unidad'] = f"({fila['unidad'].strip()} a $ {valor})"
+    return crudo
+
+def leer_catalogo(tienda):
+    """Filas del CSV de ejemplo del almacén como lista de diccionarios de texto."""
+    catalogo = read_csv(os.path.join(DIRECTORIO_EJEMPLOS, CATALOGOS[tienda]), dtype=str, keep_default_na=False)
+    catalogo = catalogo.drop(columns=[columna for columna in catalogo.columns if columna.startswith('Unnamed')])
+    return catalogo.to_dict('records')
+
+def tarjeta_html(tienda, fila):
+    crudo = {campo: escape(valor) for campo, valor in texto_crudo(tienda, fila).items()}
+    return TARJETAS[tienda].format(**crudo)
+
+def paginacion_html(tienda, numero, total):
+    """Controles de paginación de la página `numero` con los selectores que usa cada script."""
+    enlace = lambda n: RUTA_LISTADO if n == 1 else f"{RUTA_LISTADO}?page={n}"
+    if tienda == 'exito':
+        botones = ''.join(f'<button class="Pagination_pageButton" onclick="location.href=\'{enlace(n)}\'">{n}</button>' for n in range(1, total + 1))
+        deshabilitado = ' disabled' if numero == total else ''
+        siguiente = (f'<button class="Pagination_nextPreviousLink__f7_2J" aria-label="Próxima Pagina"{deshabilitado} '
+                     f'onclick="location.href=\'{enlace(numero + 1)}\'">&rsaquo;</button>')
+        return f'<nav class="Pagination_container">{botones}{siguiente}</nav>'
+    if tienda == 'jumbo':
+        opciones = ''.join(f'<option value="{n}"{" selected" if n == numero else ""}>{n}</option>' for n in range(1, total + 1))
+        return f'<select class="o-0 absolute" onchange="location.href=\'{RUTA_LISTADO}?page=\' + this.value">{opciones}</select>'
+    if numero == total:
+        return '<ul class="pagination"></ul>'
+    return f'<ul class="pagination"><li class="next"><a class="Next" href="{enlace(numero + 1)}">&rsaquo;</a></li></ul>'
+
+def escribir(ruta, contenido):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write(contenido)
+
+def generar_fixtures_tienda(tienda, destino, retardo=200):
+    """
+    Escribe las páginas del almacén en destino/<tienda>/ con la misma ruta que pide servidor_local.py.
+
+    :param tienda: Almacén
+    :param destino: Directorio raíz de los fixtures
+    :param retardo: Milisegundos que tarda en aparecer cada lote de "Mostrar más"
+    :return: Número de páginas escritas
+    """
+    filas = leer_catalogo(tienda)
+    tarjetas = [tarjeta_html(tienda, fila) for fila in filas]
+    tamano = TAMANO_PAGINA[tienda]
+    banner = BANNERS.get(tienda, '')
+    if tienda in ('carulla', 'euro'):
+        # Se escapa '</' para que ninguna tarjeta cierre el <script>
+        lista = json.dumps(tarjetas, ensure_ascii=False).replace('</', '<\\/')
+        cuerpo = banner + JS_MOSTRAR_MAS.format(tarjetas=lista, tamano=tamano, retardo=retardo)
+        escribir(os.path.join(destino, tienda, RUTA_LISTADO.lstrip('/'), 'index.html'), PLANTILLA_PAGINA.format(titulo=tienda, cuerpo=cuerpo))
+        return 1
+    total = max(1, -(-len(tarjetas) // tamano))
+    for numero in range(1, total + 1):
+        grilla = ''.join(tarjetas[(numero - 1) * tamano:numero * tamano])
+        cuerpo = f'{banner}<div class="grilla">{grilla}</div>{paginacion_html(tienda, numero, total)}'
+        pagina = PLANTILLA_PAGINA.format(titulo=f'{tienda} - página {numero}', cuerpo=cuerpo)
+        # La página 1 también queda con ?page=1 (Jumbo abre todas las páginas por URL)
+        escribir(os.path.join(destino, os.path.splitext(nombre_fixture(f'/{tienda}{RUTA_LISTADO}', {'page': str(numero)}))[0] + '.html'), pagina)
+        if numero == 1:
+            escribir(os.path.join(destino, tienda, RUTA_LISTADO.lstrip('/'), 'index.html'), pagina)
+    return total
+
+def generar_fixtures(destino, tiendas=tuple(CATALOGOS), retardo=200):
+    for tienda in tiendas:
+        paginas = generar_fixtures_tienda(tienda, destino, retardo)
+        print(f"Fixtures de {tienda}: {paginas} página(s) en {os.path.join(destino, tienda)}")
+
+def url_listado(url_servidor, tienda):
+    """URL del listado del almacén en el servidor de fixtures."""
+    return f"{url_servidor}/{tienda}{RUTA_LISTADO}"
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    generar_fixtures(sys.argv[1] if len(sys.argv) > 1 else os.path.join('fixtures', 'html'))
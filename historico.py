@@ -0,0 +1,181 @@
+"""
+Codigo para guardar y consultar el histórico de precios en Parquet particionado por almacén y fecha.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Cada CSV de salida se importa una sola vez a
+      <historico>/tienda=<almacen>/fecha=<YYYY-MM-DD>/<archivo>.parquet con un esquema único y las
+      consultas solo leen las particiones y columnas que necesitan.
+    - [2026-10-18][Duvan]: Las salidas se recorren en orden de captura (archivos_salida, también para instantaneas.py).
+
+Uso:
+    python historico.py importar historico/ examples/ ~/Dropbox/.../exito_310820241848.csv
+    python historico.py consultar historico/ --tienda exito jumbo --producto "lim[oó]n" --desde 2024-08-01
+"""
+#%% MODULOS
+import os
+import re
+import sys
+import glob
+import argparse
+from datetime import datetime, date
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.dataset as ds
+import pyarrow.compute as pc
+from pandas import read_csv, Timestamp
+
+from normalizacion import normalizar_precios, normalizar_motor
+
+#%% CONFIGURACIÓN
+# Columnas de cada archivo; tienda y fecha salen de la ruta de la partición
+ESQUEMA = pa.schema([
+    ('fecha_captura', pa.timestamp('s')),
+    ('producto', pa.string()),
+    ('precio', pa.int64()),
+    ('precio_x_unidad', pa.float64()),
+    ('unidad', pa.string()),
+])
+COLUMNAS_PARTICION = pa.schema([('tienda', pa.string()), ('fecha', pa.date32())])
+PARTICIONES = ds.partitioning(COLUMNAS_PARTICION, flavor='hive')
+ESQUEMA_DATASET = pa.unify_schemas([COLUMNAS_PARTICION, ESQUEMA])
+# Nombre de las salidas de los scripts: <almacen>_<ddmmYYYYHHMM>.csv
+PATRON_ARCHIVO = re.compile(r'^(?P<tienda>[a-z]+)_(?P<marca>\d{12})\.csv$')
+
+#%% FUNCIONES
+def datos_archivo(ruta):
+    """('exito', datetime(2024, 8, 31, 18, 48)) a partir de .../exito_310820241848.csv; None si no es una salida."""
+    coincidencia = PATRON_ARCHIVO.match(os.path.basename(ruta))
+    if coincidencia is None:
+        return None
+    return coincidencia['tienda'], datetime.strptime(coincidencia['marca'], '%d%m%Y%H%M')
+
+def esquema_unificado(df, fecha_captura):
+    """
+    Lleva cualquier salida histórica al esquema común.
+
+    Cubre el índice de pandas que escriben Éxito y Jumbo, 'nombre' en Jumbo, la etiqueta cruda
+    'precio_unidad' de Euro y las columnas ya separadas (con espacios) de las versiones anteriores.
+    """
+    df = df.drop(columns=[columna for columna in df.columns if columna == '' or columna.startswith('Unnamed')])
+    df = df.rename(columns={'nombre': 'producto'})
+    if 'precio_unidad' in df:
+        df = normalizar_precios(df)
+    else:
+        df = normalizar_motor(df.apply(lambda serie: serie.str.strip()))
+    df['producto'] = df['producto'].str.strip()
+    df['fecha_captura'] = Timestamp(fecha_captura)
+    return df[ESQUEMA.names]
+
+def ruta_particion(directorio, tienda, fecha_captura):
+    return os.path.join(directorio, f'tienda={tienda}', f'fecha={fecha_captura.date().isoformat()}')
+
+def importar_csv(ruta, directorio):
+    """
+    Agrega un CSV de salida al histórico; si ya se importó no se vuelve a escribir (solo se agrega).
+
+    :param ruta: <almacen>_<ddmmYYYYHHMM>.csv
+    :param directorio: Raíz del histórico
+    :return: Filas importadas (0 si ya estaba o el nombre no corresponde a una salida)
+    """
+    datos = datos_archivo(ruta)
+    if datos is None:
+        print(f"Se omite {ruta}: el nombre no sigue <almacen>_<ddmmYYYYHHMM>.csv")
+        return 0
+    tienda, fecha_captura = datos
+    carpeta = ruta_particion(directorio, tienda, fecha_captura)
+    nombre = os.path.splitext(os.path.basename(ruta))[0] + '.parquet'
+    destino = os.path.join(carpeta, nombre)
+    if os.path.exists(destino):
+        return 0
+    df = read_csv(ruta, dtype=str, keep_default_na=False)
+    if df.empty or 'precio' not in df:
+        print(f"Se omite {ruta}: no tiene productos")
+        return 0
+    df = esquema_unificado(df, fecha_captura)
+    os.makedirs(carpeta, exist_ok=True)
+    # Se escribe aparte (con '.' inicial, que el dataset ignora) y se reemplaza: una caída no deja un Parquet a medias
+    temporal = os.path.join(carpeta, '.' + nombre + '.tmp')
+    pq.write_table(pa.Table.from_pandas(df, schema=ESQUEMA, preserve_index=False), temporal)
+    os.replace(temporal, destino)
+    return len(df)
+
+def archivos_salida(rutas):
+    """CSV de salida en orden de captura a partir de archivos o carpetas (se ignoran los CSV parciales)."""
+    archivos = []
+    for ruta in rutas:
+        archivos += glob.glob(os.path.join(ruta, '*_*.csv')) if os.path.isdir(ruta) else [ruta]
+    return sorted((archivo for archivo in archivos if datos_archivo(archivo)), key=lambda archivo: datos_archivo(archivo)[1])
+
+def importar(rutas, directorio):
+    """Importa archivos CSV o carpetas completas de salidas."""
+    archivos = archivos_salida(rutas)
+    total = 0
+    for archivo in archivos:
+        filas = importar_csv(archivo, directorio)
+        if filas:
+            print(f"{os.path.basename(archivo)}: {filas} filas")
+        total += filas
+    print(f"Importadas {total} filas de {len(archivos)} archivos a {directorio}")
+    return total
+
+def como_fecha(valor):
+    return date.fromisoformat(valor) if isinstance(valor, str) else valor
+
+def consultar(directorio, tiendas=None, producto=None, desde=None, hasta=None, columnas=None):
+    """
+    Lee del histórico solo las particiones y columnas pedidas.
+
+    :param directorio: Raíz del histórico
+    :param tiendas: Almacén o lista de almacenes; None los incluye todos
+    :param producto: Expresión regular sobre el nombre, sin distinguir mayúsculas
+    :param desde: Fecha inicial incluida (date o 'YYYY-MM-DD')
+    :param hasta: Fecha final incluida (date o 'YYYY-MM-DD')
+    :param columnas: Columnas a devolver; None devuelve tienda, fecha y todo el esquema
+    :return: DataFrame
+    """
+    dataset = ds.dataset(directorio, format='parquet', partitioning=PARTICIONES, schema=ESQUEMA_DATASET)
+    # Los filtros sobre tienda y fecha descartan carpetas completas antes de abrir archivos
+    filtro = ds.scalar(True)
+    if tiendas:
+        filtro &= ds.field('tienda').isin([tiendas] if isinstance(tiendas, str) else list(tiendas))
+    if desde:
+        filtro &= ds.field('fecha') >= como_fecha(desde)
+    if hasta:
+        filtro &= ds.field('fecha') <= como_fecha(hasta)
+    if producto:
+        filtro &= pc.match_substring_regex(ds.field('producto'), pattern=producto, ignore_case=True)
+    columnas = columnas or ESQUEMA_DATASET.names
+    return dataset.to_table(columns=columnas, filter=filtro).to_pandas()
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Histórico de precios en Parquet particionado por almacén y fecha.')
+    subparsers = parser.add_subparsers(dest='accion', required=True)
+    parser_importar = subparsers.add_parser('importar', help='Agrega CSV de salida (archivos o carpetas) al histórico')
+    parser_importar.add_argument('historico', help='Raíz del histórico')
+    parser_importar.add_argument('rutas', nargs='+', help='CSV o carpetas con <almacen>_<ddmmYYYYHHMM>.csv')
+    parser_consultar = subparsers.add_parser('consultar', help='Consulta el histórico')
+    parser_consultar.add_argument('historico', help='Raíz del histórico')
+    parser_consultar.add_argument('--tienda', nargs='*', default=None, help='Almacenes a consultar')
+    parser_consultar.add_argument('--producto', default=None, help='Expresión regular sobre el nombre del producto')
+    parser_consultar.add_argument('--desde', default=None, help='Fecha inicial YYYY-MM-DD')
+    parser_consultar.add_argument('--hasta', default=None, help='Fecha final YYYY-MM-DD')
+    parser_consultar.add_argument('--columnas', default=None, help='Columnas separadas por coma')
+    parser_consultar.add_argument('--salida', default=None, help='CSV donde guardar el resultado')
+    args = parser.parse_args()
+
+    if args.accion == 'importar':
+        importar(args.rutas, args.historico)
+        sys.exit(0)
+    resultado = consultar(args.historico, args.tienda, args.producto, args.desde, args.hasta,
+                          args.columnas.split(',') if args.columnas else None)
+    if args.salida:
+        resultado.to_csv(args.salida, index=False)
+    print(resultado.to_string(max_rows=40))
+    print(f"{len(resultado)} filas")
@@ -0,0 +1,343 @@
+"""
+Codigo para calcular índices de precios de la canasta y estadísticas rodantes por producto sobre el histórico.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Índices encadenados Jevons y Laspeyres por almacén y
+      de los cinco almacenes juntos, y mínimo, máximo y mediana rodantes por producto, con agrupaciones
+      vectorizadas sobre las columnas del histórico Parquet. Cada actualización solo lee las capturas
+      nuevas (más la ventana y el periodo anterior de su almacén) y agrega sus periodos.
+
+Cada periodo se enlaza con el anterior del mismo almacén usando solo los productos con precio en los dos:
+    - Jevons: media geométrica de los relativos de precio.
+    - Laspeyres: costo de la canasta en el periodo sobre su costo en el anterior, con las cantidades de
+      la canasta (1 por producto si no se indica); el histórico no tiene cantidades vendidas.
+El índice de 'todas' suma los enlaces de los almacenes por periodo (un almacén sin captura ese día no
+entra) y se rehace con la tabla de índices, sin volver a leer precios.
+
+Uso:
+    python indices_precios.py actualizar historico/ indices/ [--periodo W] [--ventana 30] [--canasta canasta.csv]
+    python indices_precios.py mostrar indices/ [--grupo exito] [--producto "lim[oó]n"]
+    python indices_precios.py comparar historico/   # recálculo completo frente a agregar la última captura
+"""
+#%% MODULOS
+import os
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+from time import perf_counter
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.compute as pc
+from pandas import DataFrame, Timedelta, Timestamp, concat, read_csv, read_parquet
+
+from historico import PARTICIONES, ESQUEMA_DATASET, datos_archivo, como_fecha, consultar
+
+#%% CONFIGURACIÓN
+TODAS = 'todas' # Grupo del índice con los productos de todos los almacenes
+BASE = 100.0 # Nivel de los índices en el primer periodo de cada grupo
+PERIODO = 'D' # 'D' día, 'W' semana, 'M' mes; con 'W' o 'M' se toma la mediana de las capturas del periodo
+VENTANA = 30 # Días de las estadísticas rodantes
+COLUMNAS_INDICES = ['grupo', 'periodo', 'productos', 'emparejados', 'suma_log', 'costo', 'costo_previo', 'jevons', 'laspeyres']
+PARTICIONES_RODANTES = ds.partitioning(pa.schema([('tienda', pa.string()), ('periodo', pa.date32())]), flavor='hive')
+
+#%% FUNCIONES
+def capturas_historico(historico):
+    """{ruta relativa: (tienda, fecha de captura)} de los Parquet del histórico, sin abrirlos."""
+    dataset = ds.dataset(historico, format='parquet', partitioning=PARTICIONES, schema=ESQUEMA_DATASET)
+    capturas = {}
+    for ruta in dataset.files:
+        datos = datos_archivo(os.path.splitext(ruta)[0] + '.csv')
+        if datos:
+            capturas[os.path.relpath(ruta, historico)] = datos
+    return capturas
+
+def observaciones(historico, tiendas=None, desde=None, periodo=PERIODO, canasta=None):
+    """
+    Precio de cada producto por almacén y periodo (mediana de las capturas del periodo).
+
+    :param historico: Raíz del histórico Parquet
+    :param tiendas: Almacenes a leer; None los lee todos
+    :param desde: Fecha inicial incluida; solo se abren las particiones desde ella
+    :param periodo: Frecuencia de pandas del periodo ('D', 'W', 'M')
+    :param canasta: DataFrame con producto, cantidad y opcionalmente tienda; solo entran sus productos
+    :return: DataFrame tienda, producto, periodo, precio, cantidad
+    """
+    df = consultar(historico, tiendas, desde=desde, columnas=['tienda', 'fecha_captura', 'producto', 'precio'])
+    df = df[df['precio'] > 0]
+    if canasta is None:
+        df = df.assign(cantidad=1.0)
+    else:
+        llave = [columna for columna in ('tienda', 'producto') if columna in canasta]
+        df = df.merge(canasta[llave + ['cantidad']], on=llave)
+    df['periodo'] = df['fecha_captura'].dt.to_period(periodo).dt.start_time
+    return (df.groupby(['tienda', 'producto', 'periodo'], sort=False)
+              .agg(precio=('precio', 'median'), cantidad=('cantidad', 'first'))
+              .reset_index())
+
+def enlaces(obs):
+    """
+    Sumas de cada periodo de cada almacén frente a su periodo anterior.
+
+    Un producto entra si tiene precio en el periodo y en el inmediatamente anterior del almacén. Se
+    guardan sumas (no promedios) para poder juntar almacenes: el enlace Jevons es exp(suma_log / emparejados)
+    y el Laspeyres costo / costo_previo.
+
+    :param obs: Resultado de observaciones()
+    :return: DataFrame grupo, periodo, productos, emparejados, suma_log, costo, costo_previo
+    """
+    datos = obs.assign(item=obs.groupby(['tienda', 'producto'], sort=False).ngroup(),
+                       orden=obs.groupby('tienda')['periodo'].rank(method='dense'))
+    datos = datos.sort_values(['item', 'orden'], ignore_index=True)
+    anterior = datos.groupby('item', sort=False)[['orden', 'precio']].shift()
+    emparejado = (datos['orden'] - anterior['orden'] == 1).to_numpy()
+    pares, previo = datos[emparejado], anterior['precio'].to_numpy()[emparejado]
+    relativos = DataFrame({
+        'grupo': pares['tienda'],
+        'periodo': pares['periodo'],
+        'log_relativo': np.log(pares['precio'].to_numpy()) - np.log(previo),
+        'costo': pares['cantidad'].to_numpy() * pares['precio'].to_numpy(),
+        'costo_previo': pares['cantidad'].to_numpy() * previo,
+    })
+    sumas = relativos.groupby(['grupo', 'periodo']).agg(
+        emparejados=('log_relativo', 'size'), suma_log=('log_relativo', 'sum'),
+        costo=('costo', 'sum'), costo_previo=('costo_previo', 'sum'))
+    productos = datos.groupby(['tienda', 'periodo']).size().rename('productos')
+    productos.index.names = ['grupo', 'periodo']
+    resultado = productos.to_frame().join(sumas).fillna(0).reset_index()
+    resultado['emparejados'] = resultado['emparejados'].astype('int64')
+    return resultado
+
+def encadenar(sumas, inicio=None):
+    """
+    Niveles Jevons y Laspeyres encadenando los enlaces de cada grupo en orden de periodo.
+
+    :param sumas: grupo, periodo y las sumas de enlaces()
+    :param inicio: DataFrame indexado por grupo con jevons y laspeyres del periodo anterior al primero
+        de sumas; un grupo que no esté empieza en BASE
+    """
+    sumas = sumas.sort_values(['grupo', 'periodo'], ignore_index=True)
+    hay_pares = sumas['emparejados'] > 0
+    log_enlaces = {
+        'jevons': np.where(hay_pares, sumas['suma_log'] / sumas['emparejados'].where(hay_pares, 1), 0.0),
+        'laspeyres': np.where(hay_pares, np.log(sumas['costo'].where(hay_pares, 1) / sumas['costo_previo'].where(hay_pares, 1)), 0.0),
+    }
+    for indice, log_enlace in log_enlaces.items():
+        acumulado = DataFrame({'grupo': sumas['grupo'], 'log': log_enlace}).groupby('grupo')['log'].cumsum()
+        nivel = BASE if inicio is None else sumas['grupo'].map(inicio[indice]).fillna(BASE)
+        sumas[indice] = nivel * np.exp(acumulado)
+    return sumas[COLUMNAS_INDICES]
+
+def indice_todas(indices):
+    """Grupo TODAS: sumas de los almacenes por periodo, encadenadas desde el primero."""
+    tiendas = indices[indices['grupo'] != TODAS]
+    sumas = tiendas.groupby('periodo')[['productos', 'emparejados', 'suma_log', 'costo', 'costo_previo']].sum().reset_index()
+    return encadenar(sumas.assign(grupo=TODAS))
+
+def estadisticas_rodantes(obs, ventana=VENTANA):
+    """Mínimo, máximo y mediana del precio de cada producto en los últimos `ventana` días, por periodo."""
+    serie = obs.sort_values(['tienda', 'producto', 'periodo']).set_index('periodo')
+    rodante = serie.groupby(['tienda', 'producto'], sort=False)['precio'].rolling(f'{ventana}D').agg(['min', 'max', 'median'])
+    rodante = rodante.rename(columns={'min': 'minimo', 'max': 'maximo', 'median': 'mediana'}).reset_index()
+    return obs[['tienda', 'producto', 'periodo', 'precio']].merge(rodante, on=['tienda', 'producto', 'periodo'])
+
+def huella_canasta(canasta):
+    return None if canasta is None else hashlib.sha1(canasta.to_csv(index=False).encode()).hexdigest()[:16]
+
+#%% CLASES
+class IndicesPrecios:
+    """
+    Índices y estadísticas rodantes de un histórico, guardados en <directorio>:
+
+        indices.parquet                          grupo, periodo, sumas del enlace, jevons y laspeyres
+        rodantes/tienda=<t>/periodo=<fecha>/     producto, precio, minimo, maximo, mediana
+        estado.json                              periodo, ventana, canasta y capturas ya incorporadas
+
+    Si cambia el periodo, la ventana o la canasta se recalcula todo.
+    """
+
+    def __init__(self, directorio, periodo=PERIODO, ventana=VENTANA, canasta=None):
+        self.directorio = directorio
+        self.canasta = canasta
+        self.ruta_indices = os.path.join(directorio, 'indices.parquet')
+        self.ruta_rodantes = os.path.join(directorio, 'rodantes')
+        self.ruta_estado = os.path.join(directorio, 'estado.json')
+        self.configuracion = {'periodo': periodo, 'ventana': ventana, 'canasta': huella_canasta(canasta)}
+        self.capturas = set()
+        self.indices = DataFrame(columns=COLUMNAS_INDICES)
+        if os.path.exists(self.ruta_estado):
+            with open(self.ruta_estado) as archivo:
+                estado = json.load(archivo)
+            if estado['configuracion'] == self.configuracion:
+                self.capturas = set(estado['capturas'])
+                self.indices = read_parquet(self.ruta_indices)
+
+    def cortes(self, nuevas):
+        """
+        Por almacén con capturas nuevas: primer periodo a recalcular y fecha desde la que se lee.
+
+        Se lee desde el periodo anterior del almacén (para enlazar el primero) o desde el inicio de la
+        ventana rodante, el que sea anterior. Sin índices guardados se lee todo el almacén.
+        """
+        periodo, ventana = self.configuracion['periodo'], self.configuracion['ventana']
+        cortes = {}
+        for tienda, fecha_captura in nuevas.values():
+            corte = Timestamp(fecha_captura).to_period(periodo).start_time
+            cortes[tienda] = min(corte, cortes.get(tienda, corte))
+        lecturas = {}
+        for tienda, corte in cortes.items():
+            previos = self.indices.loc[(self.indices['grupo'] == tienda) & (self.indices['periodo'] < corte), 'periodo']
+            lecturas[tienda] = None if previos.empty else min(previos.max(), corte - Timedelta(days=ventana))
+        return cortes, lecturas
+
+    def actualizar(self, historico, completo=False):
+        """
+        Incorpora las capturas del histórico que aún no están en los índices.
+
+        :param historico: Raíz del histórico Parquet (historico.py)
+        :param completo: Recalcula todo aunque haya índices guardados
+        :return: Capturas incorporadas
+        """
+        if completo:
+            self.capturas, self.indices = set(), DataFrame(columns=COLUMNAS_INDICES)
+        if not self.capturas and os.path.exists(self.ruta_rodantes):
+            shutil.rmtree(self.ruta_rodantes)
+        disponibles = capturas_historico(historico)
+        nuevas = {ruta: datos for ruta, datos in disponibles.items() if ruta not in self.capturas}
+        if not nuevas:
+            return 0
+        cortes, lecturas = self.cortes(nuevas)
+        desde = None if None in lecturas.values() else min(lecturas.values()).date()
+        obs = observaciones(historico, sorted(cortes), desde, self.configuracion['periodo'], self.canasta)
+        # Cada almacén solo aporta sus periodos desde su corte; el resto de sus filas ya está guardado
+        obs = obs[obs['periodo'] >= obs['tienda'].map(lecturas).fillna(obs['periodo'].min())]
+        recalculados = enlaces(obs)
+        recalculados = recalculados[recalculados['periodo'] >= recalculados['grupo'].map(cortes)]
+        guardados = self.indices[self.indices['grupo'] != TODAS]
+        corte_grupo = guardados['grupo'].map(cortes)
+        conservados = guardados[corte_grupo.isna() | (guardados['periodo'] < corte_grupo)]
+        inicio = (conservados.sort_values('periodo').groupby('grupo')[['jevons', 'laspeyres']].last()
+                  if not conservados.empty else None)
+        tiendas = concat([frame for frame in (conservados, encadenar(recalculados, inicio)) if not frame.empty], ignore_index=True)
+        self.indices = concat([tiendas, indice_todas(tiendas)], ignore_index=True).sort_values(['grupo', 'periodo'], ignore_index=True)
+
+        rodantes = estadisticas_rodantes(obs, self.configuracion['ventana'])
+        rodantes = rodantes[rodantes['periodo'] >= rodantes['tienda'].map(cortes)]
+        tabla = pa.Table.from_pandas(rodantes, preserve_index=False)
+        tabla = tabla.set_column(tabla.schema.get_field_index('periodo'), 'periodo', pc.cast(tabla['periodo'], pa.date32()))
+        # delete_matching reemplaza solo las particiones (almacén y periodo) que se vuelven a escribir
+        ds.write_dataset(tabla, self.ruta_rodantes, format='parquet', partitioning=PARTICIONES_RODANTES,
+                         existing_data_behavior='delete_matching', basename_template='parte-{i}.parquet')
+        self.capturas |= set(nuevas)
+        self.guardar()
+        return len(nuevas)
+
+    def guardar(self):
+        os.makedirs(self.directorio, exist_ok=True)
+        self.indices.to_parquet(self.ruta_indices + '.tmp', index=False)
+        os.replace(self.ruta_indices + '.tmp', self.ruta_indices)
+        # El estado se escribe al final: una captura que no quedó en él se vuelve a incorporar
+        with open(self.ruta_estado + '.tmp', 'w') as archivo:
+            json.dump({'configuracion': self.configuracion, 'capturas': sorted(self.capturas)}, archivo, indent=1)
+        os.replace(self.ruta_estado + '.tmp', self.ruta_estado)
+
+def consultar_rodantes(directorio, tiendas=None, producto=None, desde=None):
+    """Estadísticas rodantes guardadas; los filtros de almacén y fecha solo abren esas particiones."""
+    dataset = ds.dataset(os.path.join(directorio, 'rodantes'), format='parquet', partitioning=PARTICIONES_RODANTES)
+    filtro = ds.scalar(True)
+    if tiendas:
+        filtro &= ds.field('tienda').isin([tiendas] if isinstance(tiendas, str) else list(tiendas))
+    if desde:
+        filtro &= ds.field('periodo') >= como_fecha(desde)
+    if producto:
+        filtro &= pc.match_substring_regex(ds.field('producto'), pattern=producto, ignore_case=True)
+    df = dataset.to_table(filter=filtro).to_pandas()
+    return df[['tienda', 'producto', 'periodo', 'precio', 'minimo', 'maximo', 'mediana']].sort_values(['tienda', 'producto', 'periodo'], ignore_index=True)
+
+def comparar(historico):
+    """
+    Tiempo de recalcular todo frente a agregar solo la última captura a índices ya calculados.
+
+    Se copian al directorio temporal todas las capturas menos la última, se calculan los índices, se
+    agrega la última y se verifica que el resultado coincida con el recálculo completo.
+    """
+    capturas = sorted(capturas_historico(historico).items(), key=lambda item: item[1][1])
+    if len(capturas) < 2:
+        print("Se necesitan al menos dos capturas en el histórico.")
+        return
+    with tempfile.TemporaryDirectory() as temporal:
+        inicio = perf_counter()
+        completo = IndicesPrecios(os.path.join(temporal, 'completo'))
+        completo.actualizar(historico)
+        duracion_completo = perf_counter() - inicio
+
+        parcial = os.path.join(temporal, 'historico')
+        for ruta, _ in capturas:
+            os.makedirs(os.path.join(parcial, os.path.dirname(ruta)), exist_ok=True)
+            shutil.copy(os.path.join(historico, ruta), os.path.join(parcial, ruta))
+        # Con '.' inicial el dataset no ve la última captura hasta devolverle su nombre
+        ultima = os.path.join(parcial, capturas[-1][0])
+        oculta = os.path.join(os.path.dirname(ultima), '.' + os.path.basename(ultima))
+        os.rename(ultima, oculta)
+        incremental = IndicesPrecios(os.path.join(temporal, 'incremental'))
+        incremental.actualizar(parcial)
+        os.rename(oculta, ultima)
+        inicio = perf_counter()
+        incremental.actualizar(parcial)
+        duracion_incremental = perf_counter() - inicio
+
+    columnas = ['jevons', 'laspeyres']
+    diferencia = np.abs(completo.indices[columnas].to_numpy(float) - incremental.indices[columnas].to_numpy(float)).max()
+    print(f"{len(capturas)} capturas, {len(completo.indices)} filas de índices.")
+    print(f"{'completo':<14}{duracion_completo:>8.2f} s")
+    print(f"{'incremental':<14}{duracion_incremental:>8.2f} s  (última captura: {capturas[-1][1][0]} {capturas[-1][1][1]:%Y-%m-%d %H:%M})")
+    print(f"Diferencia máxima entre ambos: {diferencia:.2e}")
+
+def imprimir_indices(indices, grupo=None):
+    if grupo:
+        indices = indices[indices['grupo'] == grupo]
+    print(f"{'grupo':<10}{'periodo':<12}{'productos':>10}{'emparejados':>12}{'jevons':>10}{'laspeyres':>11}")
+    for fila in indices.itertuples():
+        print(f"{fila.grupo:<10}{fila.periodo:%Y-%m-%d}  {fila.productos:>10.0f}{fila.emparejados:>12.0f}{fila.jevons:>10.2f}{fila.laspeyres:>11.2f}")
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Índices de precios de la canasta y estadísticas rodantes por producto.')
+    subparsers = parser.add_subparsers(dest='accion', required=True)
+    parser_actualizar = subparsers.add_parser('actualizar', help='Incorpora las capturas nuevas del histórico')
+    parser_actualizar.add_argument('historico', help='Raíz del histórico Parquet')
+    parser_actualizar.add_argument('directorio', help='Carpeta de los índices')
+    parser_actualizar.add_argument('--periodo', default=PERIODO, help="Periodo del índice: 'D', 'W' o 'M'")
+    parser_actualizar.add_argument('--ventana', type=int, default=VENTANA, help='Días de las estadísticas rodantes')
+    parser_actualizar.add_argument('--canasta', default=None, help='CSV con producto, cantidad y opcionalmente tienda')
+    parser_actualizar.add_argument('--completo', action='store_true', help='Recalcula todo')
+    parser_mostrar = subparsers.add_parser('mostrar', help='Imprime los índices o las estadísticas rodantes')
+    parser_mostrar.add_argument('directorio', help='Carpeta de los índices')
+    parser_mostrar.add_argument('--grupo', default=None, help=f"Almacén o '{TODAS}'")
+    parser_mostrar.add_argument('--producto', default=None, help='Expresión regular; muestra sus estadísticas rodantes')
+    parser_comparar = subparsers.add_parser('comparar', help='Recálculo completo frente a actualización incremental')
+    parser_comparar.add_argument('historico', help='Raíz del histórico Parquet')
+    args = parser.parse_args()
+
+    if args.accion == 'actualizar':
+        canasta = read_csv(args.canasta) if args.canasta else None
+        indices = IndicesPrecios(args.directorio, args.periodo, args.ventana, canasta)
+        inicio = perf_counter()
+        incorporadas = indices.actualizar(args.historico, args.completo)
+        print(f"{incorporadas} capturas incorporadas en {perf_counter() - inicio:.2f} s")
+        imprimir_indices(indices.indices[indices.indices['grupo'] == TODAS].tail(10))
+    elif args.accion == 'mostrar':
+        if args.producto:
+            print(consultar_rodantes(args.directorio, args.grupo if args.grupo != TODAS else None, args.producto).to_string(max_rows=60))
+        else:
+            imprimir_indices(read_parquet(os.path.join(args.directorio, 'indices.parquet')), args.grupo)
+    else:
+        comparar(args.historico)
@@ -0,0 +1,199 @@
+"""
+Codigo para guardar las corridas como diferencias frente a la anterior y reconstruir cualquier corrida completa.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Cada fila se identifica por su nombre y se compara
+      la huella de precio, precio por unidad y unidad con el índice de la corrida anterior; solo se
+      guardan las filas agregadas, eliminadas y cambiadas, más un manifiesto por almacén.
+    - [2026-10-18][Duvan]: El índice de comparación lleva la marca de su corrida y solo se usa si es la última
+      del manifiesto; una caída entre escribir uno y otro ya no deja una diferencia vacía.
+
+Uso:
+    python instantaneas.py guardar deltas/ examples/
+    python instantaneas.py reconstruir deltas/ exito 310820241903 --salida exito_310820241903.csv
+    python instantaneas.py resumen deltas/
+"""
+#%% MODULOS
+import os
+import json
+import argparse
+from datetime import datetime
+from pandas import DataFrame, concat, read_csv, read_parquet
+from pandas.util import hash_pandas_object
+
+from historico import datos_archivo, archivos_salida, esquema_unificado
+
+#%% CONFIGURACIÓN
+COLUMNAS_VALOR = ['precio', 'precio_x_unidad', 'unidad']
+PERIODO_COMPLETA = 24 # Cada cuántas corridas se guarda una completa; limita las diferencias a aplicar al reconstruir
+
+#%% FUNCIONES
+def claves(df):
+    """Nombre normalizado más el número de aparición, para que los nombres repetidos no se pisen."""
+    nombre = df['producto'].str.strip().str.lower()
+    return nombre + '#' + nombre.groupby(nombre).cumcount().astype(str)
+
+def huellas(df):
+    """Hash de 64 bits de las columnas de valor de cada fila."""
+    return hash_pandas_object(df[COLUMNAS_VALOR], index=False).to_numpy()
+
+#%% CLASES
+class Instantaneas:
+    """
+    Corridas de un almacén guardadas como diferencias: <directorio>/<tienda>/<marca>.parquet.
+
+    manifiesto.json lista las corridas en orden con su tipo ('completa' o 'delta') y conteos;
+    indice_<marca>.parquet guarda clave y huella de la última corrida para no reconstruirla al comparar.
+    El índice lleva la marca de su corrida: si no es el de la última del manifiesto (p. ej. una caída
+    entre escribir uno y otro) no se usa y se rehace reconstruyendo esa corrida.
+    """
+
+    def __init__(self, directorio, tienda):
+        self.tienda = tienda
+        self.carpeta = os.path.join(directorio, tienda)
+        self.ruta_manifiesto = os.path.join(self.carpeta, 'manifiesto.json')
+        self.corridas = []
+        if os.path.exists(self.ruta_manifiesto):
+            with open(self.ruta_manifiesto) as archivo:
+                self.corridas = json.load(archivo)['corridas']
+
+    def guardar(self, df, marca):
+        """
+        Agrega una corrida; las corridas se deben guardar en orden de captura.
+
+        :param df: Productos con el esquema de historico.py (producto, precio, precio_x_unidad, unidad)
+        :param marca: ddmmYYYYHHMM de la salida
+        :return: Resumen de la corrida en el manifiesto (None si ya estaba guardada)
+        """
+        fecha = datetime.strptime(marca, '%d%m%Y%H%M').isoformat()
+        if any(corrida['marca'] == marca for corrida in self.corridas):
+            return None
+        if self.corridas and fecha < self.corridas[-1]['fecha']:
+            raise ValueError(f"{self.tienda} {marca} es anterior a la última corrida guardada ({self.corridas[-1]['marca']})")
+        df = df[['producto'] + COLUMNAS_VALOR].assign(clave=claves(df))
+        indice = DataFrame({'clave': df['clave'], 'huella': huellas(df)})
+        desde_completa = next((i for i, corrida in enumerate(reversed(self.corridas)) if corrida['tipo'] == 'completa'), None)
+        if desde_completa is None or desde_completa + 1 >= PERIODO_COMPLETA:
+            tipo, cambios = 'completa', df.assign(operacion='+')
+            conteos = {'agregadas': len(df), 'cambiadas': 0, 'eliminadas': 0}
+        else:
+            tipo, cambios, conteos = 'delta', *self.diferencias(df, indice)
+        os.makedirs(self.carpeta, exist_ok=True)
+        ruta = os.path.join(self.carpeta, f'{marca}.parquet')
+        cambios.to_parquet(ruta, index=False)
+        # El índice nuevo no reemplaza al anterior: solo vale cuando el manifiesto registre su corrida
+        indice.to_parquet(self.ruta_indice(marca) + '.tmp', index=False)
+        os.replace(self.ruta_indice(marca) + '.tmp', self.ruta_indice(marca))
+        corrida = {'marca': marca, 'fecha': fecha, 'tipo': tipo, 'filas': len(df), **conteos, 'bytes': os.path.getsize(ruta)}
+        self.corridas.append(corrida)
+        # El manifiesto se escribe al final: una corrida sin entrada no existe y se vuelve a guardar
+        with open(self.ruta_manifiesto + '.tmp', 'w') as archivo:
+            json.dump({'tienda': self.tienda, 'corridas': self.corridas}, archivo, indent=1)
+        os.replace(self.ruta_manifiesto + '.tmp', self.ruta_manifiesto)
+        for archivo in os.listdir(self.carpeta):
+            if archivo.startswith('indice') and archivo != os.path.basename(self.ruta_indice(marca)):
+                os.remove(os.path.join(self.carpeta, archivo))
+        return corrida
+
+    def ruta_indice(self, marca):
+        return os.path.join(self.carpeta, f'indice_{marca}.parquet')
+
+    def indice_ultima(self):
+        """Clave y huella de la última corrida del manifiesto; si su índice no está, se reconstruye."""
+        ruta = self.ruta_indice(self.corridas[-1]['marca'])
+        if os.path.exists(ruta):
+            return read_parquet(ruta)
+        print(f"{self.tienda}: el índice no corresponde a la corrida {self.corridas[-1]['marca']}; se reconstruye.")
+        df = self.reconstruir()
+        return DataFrame({'clave': claves(df), 'huella': huellas(df)})
+
+    def diferencias(self, df, indice):
+        """Filas agregadas (+), cambiadas (~) y eliminadas (-) frente al índice de la corrida anterior."""
+        previo = self.indice_ultima()
+        comunes = indice.merge(previo, on='clave', suffixes=('', '_previa'))
+        cambiadas = comunes.loc[comunes['huella'] != comunes['huella_previa'], 'clave']
+        agregadas = ~df['clave'].isin(previo['clave'])
+        eliminadas = previo.loc[~previo['clave'].isin(df['clave']), 'clave']
+        cambios = concat([
+            df[agregadas].assign(operacion='+'),
+            df[df['clave'].isin(cambiadas)].assign(operacion='~'),
+            DataFrame({'clave': eliminadas, 'operacion': '-'}),
+        ], ignore_index=True)
+        return cambios, {'agregadas': int(agregadas.sum()), 'cambiadas': len(cambiadas), 'eliminadas': len(eliminadas)}
+
+    def reconstruir(self, marca=None):
+        """
+        Corrida completa aplicando las diferencias desde la última completa anterior.
+
+        :param marca: ddmmYYYYHHMM; None reconstruye la última
+        :return: DataFrame con producto, precio, precio_x_unidad y unidad
+        """
+        posiciones = [corrida['marca'] for corrida in self.corridas]
+        if not posiciones or (marca is not None and marca not in posiciones):
+            raise KeyError(f"{self.tienda} no tiene la corrida {marca}")
+        hasta = posiciones.index(marca) if marca is not None else len(posiciones) - 1
+        inicio = max(i for i in range(hasta + 1) if self.corridas[i]['tipo'] == 'completa')
+        estado = None
+        for corrida in self.corridas[inicio:hasta + 1]:
+            cambios = read_parquet(os.path.join(self.carpeta, f"{corrida['marca']}.parquet"))
+            nuevas = cambios[cambios['operacion'] != '-'].set_index('clave')
+            if estado is None:
+                estado = nuevas
+                continue
+            estado = concat([estado.drop(cambios.loc[cambios['operacion'] != '+', 'clave'], errors='ignore'), nuevas])
+        return estado[['producto'] + COLUMNAS_VALOR].reset_index(drop=True)
+
+def guardar_salidas(rutas, directorio):
+    """Guarda como instantáneas los CSV de salida (archivos o carpetas), en orden de captura."""
+    for ruta in archivos_salida(rutas):
+        tienda, fecha_captura = datos_archivo(ruta)
+        df = read_csv(ruta, dtype=str, keep_default_na=False)
+        if df.empty or 'precio' not in df:
+            continue
+        corrida = Instantaneas(directorio, tienda).guardar(esquema_unificado(df, fecha_captura), fecha_captura.strftime('%d%m%Y%H%M'))
+        if corrida:
+            print(f"{os.path.basename(ruta)}: {corrida['tipo']}, {corrida['filas']} filas "
+                  f"(+{corrida['agregadas']} ~{corrida['cambiadas']} -{corrida['eliminadas']}), {corrida['bytes'] / 1024:.1f} KB")
+
+def imprimir_resumen(directorio):
+    """Por almacén: corridas, bytes guardados y bytes que ocuparían las completas."""
+    print(f"{'tienda':<10}{'corridas':>9}{'deltas':>8}{'filas guardadas':>17}{'filas completas':>17}{'KB':>9}")
+    for tienda in sorted(os.listdir(directorio)):
+        corridas = Instantaneas(directorio, tienda).corridas
+        if not corridas:
+            continue
+        guardadas = sum(corrida['agregadas'] + corrida['cambiadas'] + corrida['eliminadas'] for corrida in corridas)
+        print(f"{tienda:<10}{len(corridas):>9}{sum(corrida['tipo'] == 'delta' for corrida in corridas):>8}"
+              f"{guardadas:>17}{sum(corrida['filas'] for corrida in corridas):>17}{sum(corrida['bytes'] for corrida in corridas) / 1024:>9.1f}")
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Corridas guardadas como diferencias frente a la anterior.')
+    subparsers = parser.add_subparsers(dest='accion', required=True)
+    parser_guardar = subparsers.add_parser('guardar', help='Guarda CSV de salida (archivos o carpetas)')
+    parser_guardar.add_argument('directorio', help='Raíz de las instantáneas')
+    parser_guardar.add_argument('rutas', nargs='+', help='CSV o carpetas con <almacen>_<ddmmYYYYHHMM>.csv')
+    parser_reconstruir = subparsers.add_parser('reconstruir', help='Reconstruye una corrida completa')
+    parser_reconstruir.add_argument('directorio', help='Raíz de las instantáneas')
+    parser_reconstruir.add_argument('tienda', help='Almacén')
+    parser_reconstruir.add_argument('marca', nargs='?', default=None, help='ddmmYYYYHHMM (por defecto la última)')
+    parser_reconstruir.add_argument('--salida', default=None, help='CSV donde guardar la corrida')
+    parser_resumen = subparsers.add_parser('resumen', help='Espacio usado por almacén')
+    parser_resumen.add_argument('directorio', help='Raíz de las instantáneas')
+    args = parser.parse_args()
+
+    if args.accion == 'guardar':
+        guardar_salidas(args.rutas, args.directorio)
+    elif args.accion == 'resumen':
+        imprimir_resumen(args.directorio)
+    else:
+        corrida = Instantaneas(args.directorio, args.tienda).reconstruir(args.marca)
+        if args.salida:
+            corrida.to_csv(args.salida, index=False)
+        print(corrida.to_string(max_rows=40))
@@ -0,0 +1,168 @@
+"""
+Codigo para limitar las peticiones por almacén entre hilos y procesos, con concurrencia adaptativa (AIMD).
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Cubeta de fichas por host en un archivo JSON
+      protegido con flock, compartida por todos los procesos de la máquina; la concurrencia sube de a
+      una mientras la latencia es sana y se reduce a la mitad ante errores o lentitud.
+    - [2026-10-18][Duvan]: Un host que no está en PRESUPUESTOS (p. ej. el de un almacén nuevo) usa
+      PRESUPUESTO_PREDETERMINADO; solo los hosts locales quedan sin límite.
+
+Uso:
+    python limitador.py            # estado de cada host
+"""
+#%% MODULOS
+import os
+import json
+import fcntl
+from time import sleep, time
+from threading import Lock
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
+
+#%% CONFIGURACIÓN
+DIRECTORIO = os.path.join(os.path.expanduser('~'), '.cache', 'fruver', 'limites')
+# Presupuesto por host: peticiones por segundo sostenidas, ráfaga máxima y concurrencia máxima.
+# Los hosts que no están aquí usan PRESUPUESTO_PREDETERMINADO.
+PRESUPUESTOS = {
+    'www.exito.com': {'tasa': 2.0, 'rafaga': 4, 'max_concurrencia': 4},
+    'www.carulla.com': {'tasa': 2.0, 'rafaga': 4, 'max_concurrencia': 4},
+    'www.eurosupermercados.com.co': {'tasa': 1.0, 'rafaga': 2, 'max_concurrencia': 2},
+    'www.tiendasjumbo.co': {'tasa': 2.0, 'rafaga': 4, 'max_concurrencia': 4},
+    'merkaorganicoonline.com': {'tasa': 1.0, 'rafaga': 2, 'max_concurrencia': 2},
+}
+PRESUPUESTO_PREDETERMINADO = {'tasa': 1.0, 'rafaga': 2, 'max_concurrencia': 2}
+HOSTS_LOCALES = {'127.0.0.1', 'localhost'} # Servidor de fixtures (servidor_local.py); no se limitan
+LATENCIA_SANA = 8.0 # Segundos de una petición (o de driver.get en la paginación paralela); más cuenta como congestión
+REDUCCION = 0.5 # Factor multiplicativo de la concurrencia ante un error o una respuesta lenta
+ESPERA_MINIMA = 0.05 # Segundos entre reintentos de obtener ficha o cupo
+
+#%% CLASES
+class Limitador:
+    """
+    Cubeta de fichas y cupos de concurrencia de un host, compartidos entre procesos vía archivo.
+
+    El estado (fichas, última recarga, límite de concurrencia y peticiones en curso por pid) vive en
+    <DIRECTORIO>/<host>.json y solo se lee o escribe con flock exclusivo sobre <host>.lock. Los pids
+    que ya no existen se descartan, así un proceso caído no retiene cupos.
+    """
+
+    def __init__(self, host, tasa, rafaga, max_concurrencia, directorio=DIRECTORIO):
+        self.host = host
+        self.tasa = tasa
+        self.rafaga = rafaga
+        self.max_concurrencia = max_concurrencia
+        os.makedirs(directorio, exist_ok=True)
+        self.ruta_estado = os.path.join(directorio, f'{host}.json')
+        self.ruta_lock = os.path.join(directorio, f'{host}.lock')
+        self.lock_hilos = Lock()
+
+    @contextmanager
+    def bloqueado(self):
+        """Estado del host con exclusión entre hilos (Lock) y entre procesos (flock); se guarda al salir."""
+        with self.lock_hilos, open(self.ruta_lock, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                estado = {'fichas': self.rafaga, 'recarga': time(), 'limite': 1.0, 'en_curso': {}}
+                if os.path.exists(self.ruta_estado):
+                    with open(self.ruta_estado) as archivo:
+                        estado.update(json.load(archivo))
+                yield estado
+                with open(self.ruta_estado + '.tmp', 'w') as archivo:
+                    json.dump(estado, archivo)
+                os.replace(self.ruta_estado + '.tmp', self.ruta_estado)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def intentar(self):
+        """Toma una ficha y un cupo si hay; si no, devuelve cuántos segundos conviene esperar."""
+        with self.bloqueado() as estado:
+            ahora = time()
+            estado['fichas'] = min(self.rafaga, estado['fichas'] + (ahora - estado['recarga']) * self.tasa)
+            estado['recarga'] = ahora
+            estado['en_curso'] = {pid: n for pid, n in estado['en_curso'].items() if n > 0 and proceso_vivo(int(pid))}
+            if sum(estado['en_curso'].values()) >= int(estado['limite']):
+                return ESPERA_MINIMA
+            if estado['fichas'] < 1:
+                return max(ESPERA_MINIMA, (1 - estado['fichas']) / self.tasa)
+            estado['fichas'] -= 1
+            pid = str(os.getpid())
+            estado['en_curso'][pid] = estado['en_curso'].get(pid, 0) + 1
+            return 0
+
+    def liberar(self, latencia, exito):
+        """Devuelve el cupo y ajusta el límite: +1/límite si fue sana, ×REDUCCION si falló o tardó."""
+        with self.bloqueado() as estado:
+            pid = str(os.getpid())
+            estado['en_curso'][pid] = max(0, estado['en_curso'].get(pid, 0) - 1)
+            if exito and latencia <= LATENCIA_SANA:
+                estado['limite'] = min(self.max_concurrencia, estado['limite'] + 1 / estado['limite'])
+            else:
+                estado['limite'] = max(1.0, estado['limite'] * REDUCCION)
+
+    @contextmanager
+    def permiso(self):
+        """
+        Espera ficha y cupo, ejecuta el bloque y reporta su latencia al control AIMD.
+
+        El bloque puede marcar un fallo sin excepción con resultado['exito'] = False (p. ej. página vacía).
+        """
+        while True:
+            espera = self.intentar()
+            if not espera:
+                break
+            sleep(espera)
+        inicio = time()
+        resultado = {'exito': True}
+        try:
+            yield resultado
+        except Exception:
+            resultado['exito'] = False
+            raise
+        finally:
+            self.liberar(time() - inicio, resultado['exito'])
+
+    def estado(self):
+        with self.bloqueado() as estado:
+            return dict(estado)
+
+LIMITADORES = {} # Un Limitador por host en cada proceso; el estado compartido está en el archivo
+
+#%% FUNCIONES
+def proceso_vivo(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def limitador_para(url):
+    """Limitador del host de `url` (uno por host y proceso); None si el host es local."""
+    host = urlsplit(url).hostname or url
+    if host in HOSTS_LOCALES:
+        return None
+    if host not in LIMITADORES:
+        LIMITADORES[host] = Limitador(host, **PRESUPUESTOS.get(host, PRESUPUESTO_PREDETERMINADO))
+    return LIMITADORES[host]
+
+def permiso(url):
+    """Contexto de Limitador.permiso para el host de `url`; un host local no se limita."""
+    limitador = limitador_para(url)
+    return limitador.permiso() if limitador else nullcontext({'exito': True})
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    print(f"{'host':<32}{'fichas':>8}{'limite':>8}{'en curso':>10}")
+    for archivo in sorted(os.listdir(DIRECTORIO)) if os.path.isdir(DIRECTORIO) else []:
+        if archivo.endswith('.json'):
+            host = archivo[:-len('.json')]
+            estado = Limitador(host, **PRESUPUESTOS.get(host, PRESUPUESTO_PREDETERMINADO)).estado()
+            print(f"{host:<32}{estado['fichas']:>8.1f}{estado['limite']:>8.2f}{sum(estado['en_curso'].values()):>10}")
@@ -0,0 +1,192 @@
+"""
+Codigo para medir comandos WebDriver, funciones auxiliares y esperas por fase de cada almacén.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Se envuelve WebDriver.execute y WebDriverWait.until,
+      las funciones auxiliares se marcan con @medir y cada corrida escribe sus métricas en JSON y en
+      formato de texto de Prometheus.
+"""
+#%% MODULOS
+import os
+import json
+from functools import wraps
+from threading import Lock
+from datetime import datetime
+from time import perf_counter
+
+#%% CONFIGURACIÓN
+CUBETAS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60) # Límites (s) de los histogramas de latencia
+
+#%% CLASES
+class Histograma:
+    """Conteo por cubeta acumulada, suma y cantidad, como un histograma de Prometheus."""
+
+    def __init__(self):
+        self.cubetas = [0] * len(CUBETAS)
+        self.suma = 0.0
+        self.cuenta = 0
+
+    def observar(self, segundos):
+        self.suma += segundos
+        self.cuenta += 1
+        for i, limite in enumerate(CUBETAS):
+            if segundos <= limite:
+                self.cubetas[i] += 1
+
+    def como_dict(self):
+        return {'cuenta': self.cuenta, 'suma': round(self.suma, 4), 'cubetas': dict(zip(map(str, CUBETAS), self.cubetas))}
+
+class Metricas:
+    """
+    Métricas de la corrida de un almacén, agrupadas por la fase en curso.
+
+    La fase es global al proceso (no por hilo) porque las fases de los scripts son secuenciales y
+    los hilos de la paginación paralela trabajan dentro de la fase que las lanzó.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.instrumentado = False
+        self.reiniciar()
+
+    def reiniciar(self, tienda=None):
+        self.tienda = tienda
+        self.fase = 'inicio'
+        self.inicio_fase = perf_counter()
+        self.fases = {}
+        self.comandos = {}
+        self.funciones = {}
+        self.esperas = {}
+
+    def iniciar(self, tienda):
+        """Empieza la corrida de `tienda` y envuelve Selenium la primera vez en el proceso."""
+        self.reiniciar(tienda)
+        if not self.instrumentado:
+            instrumentar_selenium(self)
+            self.instrumentado = True
+
+    def iniciar_fase(self, nombre):
+        """Cierra la fase en curso (sumando su duración) y abre `nombre`."""
+        with self.lock:
+            ahora = perf_counter()
+            self.fases[self.fase] = self.fases.get(self.fase, 0.0) + ahora - self.inicio_fase
+            self.fase, self.inicio_fase = nombre, ahora
+
+    def observar(self, tabla, nombre, segundos):
+        with self.lock:
+            tabla.setdefault((self.fase, nombre), Histograma()).observar(segundos)
+
+    def observar_comando(self, comando, segundos):
+        self.observar(self.comandos, comando, segundos)
+
+    def observar_funcion(self, funcion, segundos):
+        self.observar(self.funciones, funcion, segundos)
+
+    def observar_espera(self, etiqueta, segundos):
+        self.observar(self.esperas, etiqueta, segundos)
+
+    def total_comandos(self):
+        return sum(histograma.cuenta for histograma in self.comandos.values())
+
+    def comandos_por_tipo(self):
+        totales = {}
+        for (_, comando), histograma in self.comandos.items():
+            totales[comando] = totales.get(comando, 0) + histograma.cuenta
+        return dict(sorted(totales.items(), key=lambda item: -item[1]))
+
+    def como_dict(self):
+        self.iniciar_fase(self.fase)
+        tablas = {'comandos': self.comandos, 'funciones': self.funciones, 'esperas': self.esperas}
+        return {
+            'tienda': self.tienda,
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'fases': {fase: round(segundos, 3) for fase, segundos in self.fases.items()},
+            **{nombre: [{'fase': fase, 'nombre': clave, **histograma.como_dict()} for (fase, clave), histograma in tabla.items()]
+               for nombre, tabla in tablas.items()},
+        }
+
+    def como_prometheus(self):
+        """Texto de exposición de Prometheus (p. ej. para el textfile collector de node_exporter)."""
+        datos = self.como_dict()
+        lineas = ['# HELP fruver_fase_segundos Duración de cada fase de la corrida', '# TYPE fruver_fase_segundos gauge']
+        for fase, segundos in datos['fases'].items():
+            lineas.append(f'fruver_fase_segundos{{tienda="{self.tienda}",fase="{fase}"}} {segundos}')
+        for tabla, etiqueta, ayuda in (('comandos', 'comando', 'Latencia de los comandos WebDriver'),
+                                       ('funciones', 'funcion', 'Duración de las funciones auxiliares'),
+                                       ('esperas', 'espera', 'Tiempo esperado por etiqueta')):
+            metrica = f'fruver_{tabla}_segundos'
+            lineas += [f'# HELP {metrica} {ayuda}', f'# TYPE {metrica} histogram']
+            for (fase, nombre), histograma in getattr(self, tabla).items():
+                base = f'tienda="{self.tienda}",fase="{fase}",{etiqueta}="{nombre}"'
+                for limite, cuenta in zip(CUBETAS, histograma.cubetas):
+                    lineas.append(f'{metrica}_bucket{{{base},le="{limite}"}} {cuenta}')
+                lineas.append(f'{metrica}_bucket{{{base},le="+Inf"}} {histograma.cuenta}')
+                lineas.append(f'{metrica}_sum{{{base}}} {histograma.suma:.4f}')
+                lineas.append(f'{metrica}_count{{{base}}} {histograma.cuenta}')
+        return '\n'.join(lineas) + '\n'
+
+    def guardar(self, directorio, marca):
+        """
+        Escribe <tienda>_metricas_<marca>.json y .prom junto a la salida del almacén.
+
+        :return: Ruta del JSON
+        """
+        ruta = os.path.join(directorio, f'{self.tienda}_metricas_{marca}')
+        with open(ruta + '.json', 'w') as archivo:
+            json.dump(self.como_dict(), archivo, indent=1)
+        with open(ruta + '.prom', 'w') as archivo:
+            archivo.write(self.como_prometheus())
+        return ruta + '.json'
+
+    def imprimir_resumen(self):
+        datos = self.como_dict()
+        print(f"Métricas {self.tienda}: {self.total_comandos()} comandos WebDriver.")
+        for fase, segundos in datos['fases'].items():
+            comandos = sum(histograma.cuenta for (fase_comando, _), histograma in self.comandos.items() if fase_comando == fase)
+            print(f"  {fase}: {segundos:.1f} s, {comandos} comandos")
+
+METRICAS = Metricas()
+
+#%% FUNCIONES
+def instrumentar_selenium(metricas):
+    """Envuelve WebDriver.execute (cada comando, incluidos CDP y logs) y WebDriverWait.until/until_not."""
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.support.ui import WebDriverWait
+    execute_original = WebDriver.execute
+
+    def execute(self, driver_command, params=None):
+        inicio = perf_counter()
+        try:
+            return execute_original(self, driver_command, params)
+        finally:
+            metricas.observar_comando(driver_command, perf_counter() - inicio)
+
+    WebDriver.execute = execute
+    for nombre in ('until', 'until_not'):
+        original = getattr(WebDriverWait, nombre)
+
+        def esperar(self, *args, _original=original, _nombre=nombre, **kwargs):
+            inicio = perf_counter()
+            try:
+                return _original(self, *args, **kwargs)
+            finally:
+                metricas.observar_espera(f'WebDriverWait.{_nombre}', perf_counter() - inicio)
+
+        setattr(WebDriverWait, nombre, esperar)
+
+def medir(funcion):
+    """Decorador: registra la duración de cada llamada a `funcion` en la fase en curso."""
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        inicio = perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            METRICAS.observar_funcion(funcion.__name__, perf_counter() - inicio)
+    return envoltura
@@ -0,0 +1,705 @@
+"""
+Codigo del motor de scraping con Selenium que recorre cualquier almacén descrito en almacenes.py.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. obtener_texto, el banner, las opciones del driver,
+      las acciones previas y las tres paginaciones (siguiente, "Mostrar más" y desplegable) que estaban
+      copiadas en cada Script_<tienda>.py quedan en un solo lugar.
+    - [2026-10-18][Duvan]: Las esperas gastan de los plazos de corrida, página y campos (esperas.Plazo). Los
+      campos se buscan sin espera una vez la página está lista y el banner solo se espera la primera vez.
+    - [2026-10-18][Duvan]: La paginación paralela sigue por clic en 'siguiente' si no se pudo leer el total
+      de páginas o la última que muestran los botones todavía tiene 'siguiente'.
+    - [2026-10-18][Duvan]: La caché de páginas solo se usa con --cache; por defecto se descarga todo.
+    - [2026-10-18][Duvan]: Si la carga o la paginación fallan se descarta el Chrome prestado y se imprimen los resúmenes.
+    - [2026-10-18][Duvan]: Si se agota el plazo de la corrida no se finaliza: el CSV parcial y el punto de
+      control quedan para --resume y la salida que se reporta es el CSV parcial.
+    - [2026-10-18][Duvan]: En la paginación paralela solo driver.get pasa por el limitador (paginacion_paralela.navegar).
+    - [2026-10-18][Duvan]: En "Mostrar más" solo se termina si el botón desapareció; una caída de Chrome u otro
+      error se propaga para que el CSV parcial y el punto de control queden para --resume.
+    - [2026-10-18][Duvan]: En el desplegable paralelo la primera página se extrae del Chrome que ya la tiene
+      cargada y solo las demás van a los trabajadores.
+
+Las fases de métricas, la caché de páginas, el punto de control, la extracción js/lxml/elementos,
+la paginación paralela y los motores sin navegador funcionan igual para todos los almacenes.
+
+Uso:
+    python motor_navegador.py exito [--resume] [--cache] [--refresh]
+"""
+#%% MODULOS
+import sys
+from os import environ
+from time import sleep
+from datetime import datetime
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import (TimeoutException, ElementClickInterceptedException, StaleElementReferenceException,
+                                        ElementNotInteractableException, NoSuchElementException)
+from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support import expected_conditions as EC
+from almacenes import ALMACENES, especificacion
+from extraccion_js import extraer_productos_js
+from extraccion_lxml import extraer_productos_lxml, analizar_en_segundo_plano
+from pool_drivers import obtener_driver, devolver_driver, descartar_driver
+from bloqueo_recursos import TRAFICO, configurar_opciones, aplicar_bloqueo
+from esperas import REGISTRO, Plazo, firma_grilla, esperar_cambio_grilla, esperar_quietud_dom, esperar_hasta, pausa_cortesia
+from motor_vtex import extraer_catalogo_vtex
+from motor_shopify import extraer_coleccion_shopify
+from paginacion_paralela import total_paginas, aprender_patron_pagina, url_pagina, navegar, recorrer_paginas_en_paralelo
+from cosecha_incremental import CosechaIncremental
+from salida_incremental import EscritorIncremental
+from normalizacion import normalizar_precios, normalizar_motor
+from metricas import METRICAS, medir
+from cache_paginas import CACHE, abrir_desde_cache, guardar_html
+
+#%% CONFIGURACIÓN
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+DIRECTORIO_SALIDA = '/home/dunievesr/Dropbox/UNAL/Web_scraping/' # FRUVER_SALIDA lo cambia (benchmark.py)
+
+#%% FUNCIONES
+def opciones_chrome(headless=True):
+    opts = Options()
+    opts.add_argument(f"User-Agent={USER_AGENT}")
+    if headless:
+        opts.add_argument('--headless')
+    return configurar_opciones(opts)
+
+@medir
+def obtener_texto(elemento, xpath, plazo=None, valor_predeterminado="No disponible"):
+    """
+    Texto del primer subelemento de `elemento` que coincide con xpath.
+
+    Sin plazo la búsqueda es inmediata: la página ya pasó su espera y un campo que no está no va a
+    aparecer. Con plazo (la grilla no llegó a estar lista) se espera lo que quede del presupuesto de
+    campos, compartido por todas las tarjetas de la página.
+    """
+    try:
+        if plazo is None:
+            encontrados = elemento.find_elements(By.XPATH, xpath)
+            return encontrados[0].text.strip() if encontrados else valor_predeterminado
+        subelemento = esperar_hasta(elemento, EC.presence_of_element_located((By.XPATH, xpath)), float('inf'), 'campo', plazo)
+        return subelemento.text.strip() if subelemento else valor_predeterminado
+    except StaleElementReferenceException:
+        print(f"Elemento obsoleto para xpath: {xpath}")
+        return valor_predeterminado
+    except Exception as e:
+        print(f"Error al obtener texto para xpath {xpath}: {str(e)}")
+        return valor_predeterminado
+
+@medir
+def click_con_javascript(driver, elemento):
+    driver.execute_script("arguments[0].click();", elemento)
+
+@medir
+def esperar_carga_inicial(driver, plazo, max_intentos=3):
+    """
+    Espera a que document.readyState sea 'complete'; recarga la página si no lo logra.
+
+    Los intentos se reparten lo que queda del plazo en lugar de tener 60 s cada uno.
+
+    :param driver: El driver de Selenium
+    :param plazo: Plazo de la carga inicial
+    :param max_intentos: Número máximo de intentos de carga
+    :return: True si la página cargó, False si se agotaron los intentos o el plazo
+    """
+    for intento in range(max_intentos):
+        print(f"Intento de carga {intento + 1}/{max_intentos}")
+        espera = plazo.restante() / (max_intentos - intento)
+        if esperar_hasta(driver, lambda d: d.execute_script("return document.readyState") == "complete", espera, 'documento', plazo):
+            print("Página cargada completamente.")
+            return True
+        if plazo.vencido():
+            break
+        print(f"La página no terminó de cargar en el intento {intento + 1}. Reintentando...")
+        driver.refresh()
+    print("La página no se pudo cargar después de todos los intentos.")
+    return False
+
+@medir
+def scroll_page_slowly(driver, plazo=None):
+    last_height = driver.execute_script("return document.body.scrollHeight")
+    while True:
+        for i in range(10):
+            driver.execute_script(f"window.scrollTo(0, {last_height * (i+1) / 10});")
+            sleep(0.5)
+        esperar_quietud_dom(driver, timeout=10, etiqueta='scroll_lento', presupuesto_fijo=2, plazo=plazo)
+        new_height = driver.execute_script("return document.body.scrollHeight")
+        if new_height == last_height:
+            break
+        if plazo is not None and plazo.vencido():
+            print(f"Scroll detenido: se agotó el plazo de {plazo.origen}.")
+            break
+        last_height = new_height
+    for i in range(10, 0, -1):
+        driver.execute_script(f"window.scrollTo(0, {last_height * i / 10});")
+        sleep(0.3)
+    print("Scroll completo realizado.")
+
+@medir
+def scroll_to_bottom(driver, plazo=None):
+    print("Iniciando scroll hasta el final de la página...")
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    esperar_quietud_dom(driver, timeout=10, etiqueta='scroll_final', presupuesto_fijo=5, plazo=plazo)
+    # Scroll adicional para asegurar que estamos al final
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    esperar_quietud_dom(driver, timeout=5, etiqueta='scroll_final', presupuesto_fijo=2, plazo=plazo)
+    print("Scroll al final de la página completado.")
+
+def extraer_con_api(tienda, spec):
+    """DataFrame normalizado del motor sin navegador del almacén, con la columna de nombre de su CSV."""
+    if spec['motor'] == 'vtex':
+        df_productos = extraer_catalogo_vtex(tienda)
+    else:
+        df_productos = extraer_coleccion_shopify()
+    columna_nombre = spec['columna_nombre']
+    return normalizar_motor(df_productos.rename(columns={'producto': columna_nombre}), columna_nombre)
+
+#%% CLASES
+class MotorNavegador:
+    """
+    Recorre un almacén con Chrome según su especificación de almacenes.py.
+
+    Cada estrategia de paginación es un método paginar_<estrategia>; lo que cambia entre almacenes
+    (selectores, banner, tiempos, modo paralelo) sale de la especificación y no del código.
+    """
+
+    def __init__(self, tienda, spec, url):
+        self.tienda = tienda
+        self.spec = spec
+        self.url = url
+        self.xpath_productos = spec['xpath_productos']
+        self.campos = spec['campos']
+        self.paginacion = spec['paginacion']
+        self.plazos = spec['plazos']
+        self.plazo = None
+        self.opts = None
+        self.driver = None
+        self.escritor = None
+        self.inicial_en_cache = False
+        self.vencida = False
+
+    #%% Plazos
+    def plazo_pagina(self):
+        """Plazo de una página (o iteración de "Mostrar más"), dentro del de la corrida."""
+        return self.plazo.hijo(self.plazos['pagina'], 'pagina')
+
+    def plazo_campos(self, plazo_pagina, lista):
+        """Sin espera por campo si la página quedó lista; si no, un presupuesto común para toda la página."""
+        return None if lista else plazo_pagina.hijo(self.plazos['campos'], 'campos')
+
+    def corrida_vencida(self):
+        """True si se agotó el plazo de la corrida; queda anotado en self.vencida para no finalizar la salida."""
+        if not self.plazo.vencido():
+            return False
+        if not self.vencida:
+            print(f"Se agotó el plazo de la corrida ({self.plazos['corrida']} s); lo guardado se puede continuar con --resume.")
+            self.vencida = True
+        return True
+
+    #%% Acciones sobre la página
+    @medir
+    def cerrar_banner(self, driver, espera=0, plazo=None):
+        """Cierra el banner si está; solo se espera que aparezca con espera > 0 (la primera vez)."""
+        if not self.spec['banner']:
+            return
+        banner_close = esperar_hasta(driver, EC.element_to_be_clickable((By.XPATH, self.spec['banner'])), espera, 'banner', plazo)
+        if banner_close is None:
+            if espera:
+                print("No se encontró el banner o no se pudo cerrar.")
+            return
+        banner_close.click()
+        print("Banner cerrado exitosamente.")
+        esperar_quietud_dom(driver, timeout=2, etiqueta='banner_cerrado', presupuesto_fijo=2, plazo=plazo)
+
+    def hacer_clic(self, driver, elemento, modo='directo', plazo=None):
+        """Clic nativo; si algo lo intercepta se cierra el banner y se repite con JavaScript."""
+        if modo == 'js':
+            click_con_javascript(driver, elemento)
+            return
+        try:
+            elemento.click()
+        except ElementClickInterceptedException:
+            print("Click interceptado. Intentando cerrar el banner...")
+            self.cerrar_banner(driver, plazo=plazo)
+            click_con_javascript(driver, elemento)
+
+    @medir
+    def realizar_acciones_previas(self, driver, plazo):
+        """Clics de la especificación (p. ej. seleccionar_ciudad); si falta un elemento se omite el resto de esa acción."""
+        for nombre, xpaths in self.spec['acciones_previas'].items():
+            for xpath in xpaths:
+                elemento = esperar_hasta(driver, EC.element_to_be_clickable((By.XPATH, xpath)), 10, nombre, plazo)
+                if elemento is None:
+                    print(f"Acción '{nombre}': elemento no encontrado o no es necesaria.")
+                    break
+                elemento.click()
+            else:
+                print(f"Acción '{nombre}' realizada exitosamente.")
+
+    def posicionar(self, url=None):
+        """Vuelve a la URL del punto de control (si se indica), cierra el banner y hace las acciones previas."""
+        plazo = self.plazo_pagina()
+        if url:
+            self.driver.get(url)
+            esperar_cambio_grilla(self.driver, self.xpath_productos, timeout=30, etiqueta='reanudar', plazo=plazo)
+        self.cerrar_banner(self.driver, self.plazos['banner'], plazo)
+        self.realizar_acciones_previas(self.driver, plazo)
+
+    @medir
+    def cargar_inicial(self):
+        """Abre la URL del almacén; False si la página no cargó tras los reintentos."""
+        driver = self.driver
+        plazo = self.plazo_pagina()
+        if self.paginacion['estrategia'] == 'desplegable' and self.paginacion['modo'] == 'paralela':
+            # Desde la caché solo sirve para leer el desplegable; la navegación serial necesita la página real
+            self.inicial_en_cache = abrir_desde_cache(driver, self.url)
+            if self.inicial_en_cache:
+                return True
+        driver.get(self.url)
+        if self.spec['carga_inicial'] == 'documento':
+            print("Esperando a que la página cargue completamente...")
+            return esperar_carga_inicial(driver, plazo)
+        esperar_cambio_grilla(driver, self.xpath_productos, timeout=30, etiqueta='carga_inicial', presupuesto_fijo=9, plazo=plazo)
+        pausa_cortesia(self.spec['pausa_cortesia'])
+        return True
+
+    #%% Extracción
+    @medir
+    def extraer_informacion_producto(self, driver, producto, plazo_campos=None):
+        try:
+            return {campo: obtener_texto(producto, xpath, plazo_campos) if xpath else "No disponible" for campo, xpath in self.campos.items()}
+        except Exception as e:
+            print(f"Error al extraer información del producto: {str(e)}")
+            return None
+
+    def extraer(self, driver, en_segundo_plano=False, plazo_campos=None):
+        """
+        Productos de todas las tarjetas de la grilla actual según modo_extraccion.
+
+        :param en_segundo_plano: En modo lxml devuelve un Future y el análisis sigue en otro hilo
+        :param plazo_campos: Presupuesto de campos de la página en modo 'elementos'; None busca sin esperar
+        """
+        modo = self.spec['modo_extraccion']
+        if modo == 'lxml':
+            if en_segundo_plano:
+                return analizar_en_segundo_plano(driver, self.xpath_productos, self.campos)
+            return extraer_productos_lxml(driver, self.xpath_productos, self.campos)
+        if modo == 'js':
+            return extraer_productos_js(driver, self.xpath_productos, self.campos)
+        tarjetas = driver.find_elements(By.XPATH, self.xpath_productos)
+        return [info for info in (self.extraer_informacion_producto(driver, tarjeta, plazo_campos) for tarjeta in tarjetas) if info]
+
+    @medir
+    def extraer_pagina_actual(self, driver, plazo, en_segundo_plano=False):
+        """Espera las tarjetas (una sola espera por página) y extrae sus productos; None si no cargaron."""
+        if not esperar_hasta(driver, EC.presence_of_all_elements_located((By.XPATH, self.xpath_productos)), 30, 'tarjetas', plazo):
+            return None
+        return self.extraer(driver, en_segundo_plano)
+
+    @medir
+    def procesar_pagina(self, driver, url_pagina, numero_pagina):
+        """Abre una página por su URL directa (o desde la caché) y extrae sus productos (paginación paralela)."""
+        if self.plazo.vencido():
+            raise TimeoutException(f"Se agotó el plazo de la corrida antes de la página {numero_pagina}")
+        plazo = self.plazo_pagina()
+        desde_cache = abrir_desde_cache(driver, url_pagina, numero_pagina)
+        if not desde_cache:
+            navegar(driver, url_pagina)
+            esperar_cambio_grilla(driver, self.xpath_productos, timeout=30, etiqueta='pagina', presupuesto_fijo=self.paginacion['presupuesto_fijo'], plazo=plazo)
+            pausa_cortesia(self.spec['pausa_cortesia'])
+            if self.paginacion.get('scroll_lento'):
+                scroll_page_slowly(driver, plazo)
+        productos = self.extraer_pagina_actual(driver, plazo)
+        if productos is None:
+            raise TimeoutException(f"No cargaron los productos de la página {numero_pagina}")
+        if productos and not desde_cache:
+            guardar_html(driver, url_pagina, numero_pagina)
+        return productos
+
+    def recorrer_en_paralelo(self, numeros, urls, al_procesar, procesar=None):
+        recorrer_paginas_en_paralelo(urls, procesar or self.procesar_pagina, self.opts, self.paginacion['max_navegadores'], self.tienda,
+                                     self.spec['perfil_bloqueo'], driver_inicial=self.driver, reintentos=self.paginacion['reintentos'],
+                                     numeros=numeros, al_procesar=al_procesar)
+
+    #%% Paginación con botón de página siguiente
+    @medir
+    def ir_a_pagina_siguiente(self, driver, plazo):
+        """True si se avanzó de página (cambiaron la grilla y la URL), False si no hay botón."""
+        url_anterior = driver.current_url
+        tiempo_espera = self.paginacion['tiempo_espera']
+        next_button = esperar_hasta(driver, EC.element_to_be_clickable((By.XPATH, self.paginacion['xpath'])), tiempo_espera, 'boton_siguiente', plazo)
+        if next_button is None:
+            print("No se pudo encontrar o hacer clic en el botón 'Próxima Página'. Finalizando.")
+            return False
+        firma = firma_grilla(driver, self.xpath_productos)
+        self.hacer_clic(driver, next_button, self.paginacion['clic'], plazo)
+        esperar_cambio_grilla(driver, self.xpath_productos, firma, timeout=30, etiqueta='pagina', presupuesto_fijo=self.paginacion['presupuesto_fijo'], plazo=plazo)
+        pausa_cortesia(self.spec['pausa_cortesia'])
+        if not esperar_hasta(driver, lambda d: d.current_url != url_anterior, tiempo_espera, 'url_siguiente', plazo):
+            print("La URL no cambió tras el clic en 'Próxima Página'. Finalizando.")
+            return False
+        return True
+
+    def paginar_siguiente(self):
+        control = self.escritor.posicion
+        # Un punto de control con 'pagina' es del recorrido por clic, también si la paralela cayó en él
+        if self.paginacion['modo'] == 'paralela' and not (control and 'pagina' in control):
+            return self.paginar_siguiente_paralela(control)
+        self.paginar_siguiente_serial(control)
+
+    def paginar_siguiente_serial(self, control):
+        """Clic en 'siguiente' hasta que deja de estar; con control se continúa después de control['pagina']."""
+        driver, escritor = self.driver, self.escritor
+        self.posicionar(control['url'] if control else None)
+        pagina = control['pagina'] if control else 1
+        pendiente = None # Modo lxml: (futuro, página, url) que se analiza mientras carga la siguiente
+        while not self.corrida_vencida():
+            plazo = self.plazo_pagina()
+            if control is None:
+                print(f"Procesando página {pagina} --> ",end='')
+                new_products = self.extraer_pagina_actual(driver, plazo, en_segundo_plano=True)
+                if new_products is None:
+                    print("No se pudieron cargar los productos. Finalizando.")
+                    break
+                if self.spec['modo_extraccion'] == 'lxml':
+                    pendiente = (new_products, pagina, driver.current_url)
+                    print("Enviada al analizador.")
+                else:
+                    escritor.agregar(new_products, {'pagina': pagina, 'url': driver.current_url})
+                    print(f"Procesada. Se encontraron {len(new_products)} productos.")
+                TRAFICO.actualizar(driver)
+            control = None
+
+            avanzo = self.ir_a_pagina_siguiente(driver, plazo)
+            if pendiente:
+                # La página anterior se guarda después de pedir la siguiente, con su propio punto de control
+                futuro, numero, url_guardada = pendiente
+                pendiente = None
+                productos_pagina = futuro.result()
+                escritor.agregar(productos_pagina, {'pagina': numero, 'url': url_guardada})
+                print(f"Página {numero}: {len(productos_pagina)} productos.")
+            if not avanzo:
+                break
+            pagina += 1
+        print(f"Se han procesado un total de {pagina} páginas y se encontraron {escritor.filas} productos.")
+
+    def hay_pagina_siguiente(self, driver):
+        """True si el botón 'siguiente' (habilitado según el xpath) está en la página, sin esperarlo."""
+        return bool(driver.find_elements(By.XPATH, self.paginacion['xpath']))
+
+    def paginar_siguiente_paralela(self, control):
+        """
+        Páginas 1 y 2 por clic y 3..N por URL en varios Chrome.
+
+        N sale de los botones numerados; si no se pudo leer, o la página N todavía tiene 'siguiente'
+        (la paginación muestra solo una ventana de números), se sigue por clic como paginar_siguiente.
+        """
+        driver, escritor = self.driver, self.escritor
+        self.posicionar()
+        control = control or {'paginas': []}
+        if 'url_primera' not in control:
+            # Las páginas 1 y 2 se recorren con clic para conocer el total y el patrón de URL
+            print("Procesando página 1 --> ",end='')
+            control.update(total=total_paginas(driver, self.paginacion['xpath_botones']), url_primera=driver.current_url, paginas=[1])
+            escritor.agregar(self.extraer_pagina_actual(driver, self.plazo_pagina()) or [], control)
+            print(f"Procesada. Total de páginas: {control['total']}.")
+        if control['total'] < 2 and 'url_segunda' not in control:
+            if self.hay_pagina_siguiente(driver):
+                print("No se pudo leer el total de páginas; se sigue con clic en 'siguiente'.")
+                return self.paginar_siguiente_serial({'pagina': 1, 'url': control['url_primera']})
+            print(f"Se han procesado un total de 1 páginas y se encontraron {escritor.filas} productos.")
+            return
+        plazo = self.plazo_pagina()
+        if 'url_segunda' not in control and control['total'] > 1 and self.ir_a_pagina_siguiente(driver, plazo):
+            control['url_segunda'] = driver.current_url
+            control['paginas'].append(2)
+            escritor.agregar(self.extraer_pagina_actual(driver, plazo) or [], control)
+        if 'url_segunda' in control:
+            patron = aprender_patron_pagina(control['url_primera'], control['url_segunda'], 2)
+            pendientes = [numero for numero in range(1, control['total'] + 1) if numero not in control['paginas']]
+
+            def procesar_pagina(driver_pagina, url, numero):
+                productos = self.procesar_pagina(driver_pagina, url, numero)
+                if numero == control['total'] and self.hay_pagina_siguiente(driver_pagina):
+                    control['siguiente_en_ultima'] = True
+                return productos
+
+            def guardar_pagina(numero, productos):
+                control['paginas'].append(numero)
+                escritor.agregar(productos, control)
+
+            self.recorrer_en_paralelo(pendientes, [patron(numero) for numero in pendientes], guardar_pagina, procesar_pagina)
+            if control.get('siguiente_en_ultima') and not self.corrida_vencida():
+                print(f"La página {control['total']} todavía tiene 'siguiente'; se sigue con clic desde ella.")
+                return self.paginar_siguiente_serial({'pagina': control['total'], 'url': patron(control['total'])})
+        self.corrida_vencida()
+        print(f"Se han procesado un total de {len(control['paginas'])} páginas y se encontraron {escritor.filas} productos.")
+
+    #%% Paginación con "Mostrar más"
+    @medir
+    def buscar_mostrar_mas(self, driver, plazo):
+        """Botón 'Mostrar más' llevado a la vista; None si ya no aparece."""
+        mostrar_mas = esperar_hasta(driver, EC.presence_of_element_located((By.XPATH, self.paginacion['xpath'])), 10, 'mostrar_mas_boton', plazo)
+        if mostrar_mas is not None:
+            ActionChains(driver).move_to_element(mostrar_mas).perform()
+        return mostrar_mas
+
+    def paginar_mostrar_mas(self):
+        driver, escritor = self.driver, self.escritor
+        self.posicionar()
+        clics_guardados = (escritor.posicion or {}).get('clics', 0)
+        iteraciones = 0
+        cosecha = CosechaIncremental(self.xpath_productos, self.campos)
+        if clics_guardados:
+            # Los productos ya guardados no se vuelven a agregar aunque se relean de la grilla
+            cosecha.vistos.update(tuple(fila.values()) for fila in escritor.leer_parcial())
+            print(f"Se repiten {clics_guardados} clics en 'Mostrar más' sin extraer.")
+
+        while not self.corrida_vencida():
+            plazo = self.plazo_pagina()
+            # El banner de ubicación puede volver a salir, pero ya no se espera a que aparezca
+            self.cerrar_banner(driver, plazo=plazo)
+            try:
+                mostrar_mas = self.buscar_mostrar_mas(driver, plazo)
+                if mostrar_mas:
+                    firma = firma_grilla(driver, self.xpath_productos)
+                    self.hacer_clic(driver, mostrar_mas, plazo=plazo)
+            except (StaleElementReferenceException, ElementNotInteractableException, NoSuchElementException) as e:
+                # El botón se fue entre buscarlo y hacer clic: no hay más productos que cargar. Cualquier otro
+                # error (p. ej. Chrome caído) se propaga y recorrer deja el CSV parcial para --resume
+                print(f"El botón 'Mostrar más' dejó de estar ({type(e).__name__}).")
+                mostrar_mas = None
+            if not mostrar_mas:
+                print("No se encontró el botón 'Mostrar más'. Finalizando.")
+                break
+            firma_nueva = esperar_cambio_grilla(driver, self.xpath_productos, firma, timeout=30, etiqueta='mostrar_mas', presupuesto_fijo=self.paginacion['presupuesto_fijo'], plazo=plazo)
+            pausa_cortesia(self.spec['pausa_cortesia'])
+
+            iteraciones += 1
+            if iteraciones <= clics_guardados:
+                if iteraciones == clics_guardados:
+                    # Las tarjetas que ya están en la grilla se leyeron antes de la interrupción
+                    cosecha.desplazamiento = firma_grilla(driver, self.xpath_productos)[0]
+                continue
+
+            plazo_campos = self.plazo_campos(plazo, firma_nueva != firma)
+            if self.paginacion['cosecha'] == 'incremental':
+                new_products = cosecha.tarjetas_nuevas(driver, self.spec['modo_extraccion'],
+                                                       lambda d, tarjeta: self.extraer_informacion_producto(d, tarjeta, plazo_campos))
+            else:
+                new_products = self.extraer(driver, plazo_campos=plazo_campos)
+            lote = []
+            productos_nuevos = cosecha.agregar(new_products, lote)
+            escritor.agregar(lote, {'clics': iteraciones})
+
+            print(f"Iteración {iteraciones}: {productos_nuevos} nuevos productos. Total: {escritor.filas}")
+            TRAFICO.actualizar(driver)
+
+            if productos_nuevos == 0:
+                print("No se encontraron nuevos productos. Finalizando.")
+                break
+        print(f"Total de productos encontrados: {escritor.filas}")
+
+    #%% Paginación con desplegable
+    @medir
+    def obtener_paginas_disponibles(self, driver, plazo):
+        scroll_to_bottom(driver, plazo)
+        select_element = esperar_hasta(driver, EC.presence_of_element_located((By.XPATH, self.paginacion['xpath'])), 10, 'desplegable', plazo)
+        if select_element is None:
+            print("No se encontró el desplegable de páginas.")
+            return []
+        paginas = [option.get_attribute('value') for option in Select(select_element).options if option.get_attribute('value').isdigit()]
+        print(f"Se encontraron {len(paginas)} páginas disponibles.")
+        return paginas
+
+    @medir
+    def navegar_a_pagina(self, driver, numero_pagina, plazo):
+        try:
+            scroll_to_bottom(driver, plazo)
+            select_element = esperar_hasta(driver, EC.presence_of_element_located((By.XPATH, self.paginacion['xpath'])), 10, 'desplegable', plazo)
+            if select_element is None:
+                print(f"No se encontró el desplegable para ir a la página {numero_pagina}.")
+                return
+            firma = firma_grilla(driver, self.xpath_productos)
+            Select(select_element).select_by_value(str(numero_pagina))
+            esperar_cambio_grilla(driver, self.xpath_productos, firma, timeout=15, etiqueta='pagina', presupuesto_fijo=self.paginacion['presupuesto_fijo'], plazo=plazo)
+            pausa_cortesia(self.spec['pausa_cortesia'])
+        except Exception as e:
+            print(f"Error al navegar a la página {numero_pagina}: {str(e)}")
+        finally:
+            driver.execute_script("window.scrollTo(0, 0);")
+
+    def paginar_desplegable(self):
+        driver, escritor = self.driver, self.escritor
+        paralela = self.paginacion['modo'] == 'paralela'
+        self.posicionar()
+        hechas = (escritor.posicion or {}).get('paginas', [])
+
+        paginas_disponibles = self.obtener_paginas_disponibles(driver, self.plazo_pagina())
+        print(f"Páginas disponibles: {paginas_disponibles}")
+        if paralela and paginas_disponibles and not self.inicial_en_cache:
+            guardar_html(driver, self.url)
+
+        maximo = self.paginacion['max_paginas']
+        paginas = paginas_disponibles[:maximo] if maximo else paginas_disponibles
+        pendientes = [pagina for pagina in paginas if pagina not in hechas]
+        if hechas:
+            print(f"Se omiten {len(paginas) - len(pendientes)} páginas ya guardadas.")
+
+        def guardar_pagina(pagina, productos_pagina):
+            hechas.append(str(pagina))
+            escritor.agregar(productos_pagina, {'paginas': hechas})
+
+        if paralela:
+            if pendientes and pendientes[0] == paginas[0] and not self.inicial_en_cache:
+                # La primera página ya quedó cargada con driver.get (cargar_inicial); abrirla otra vez por URL
+                # costaría otra carga y otro scroll lento. Desde la caché puede estar incompleta: va a los trabajadores
+                plazo = self.plazo_pagina()
+                print(f"Procesando página {paginas[0]} --> ", end='')
+                if self.paginacion['scroll_lento']:
+                    scroll_page_slowly(driver, plazo)
+                productos_pagina = self.extraer(driver)
+                TRAFICO.actualizar(driver)
+                if productos_pagina:
+                    # Con la misma clave que usaría un trabajador, así una corrida con --cache la encuentra
+                    guardar_html(driver, url_pagina(self.url, paginas[0]), paginas[0])
+                    guardar_pagina(paginas[0], productos_pagina)
+                    pendientes = pendientes[1:]
+                    print(f"Procesada. Se encontraron {len(productos_pagina)} productos.")
+                else:
+                    print("Sin productos; se reintenta por URL.")
+            self.recorrer_en_paralelo(pendientes, [url_pagina(self.url, pagina) for pagina in pendientes], guardar_pagina)
+            self.corrida_vencida()
+        else:
+            pendiente = None # Modo lxml: (página, futuro) que se analiza mientras se selecciona la siguiente
+            for pagina in pendientes:
+                if self.corrida_vencida():
+                    break
+                plazo = self.plazo_pagina()
+                print(f"Procesando página {pagina} --> ", end='')
+                if pagina != paginas[0]:
+                    # La primera página ya quedó cargada con driver.get; seleccionarla no cambia la grilla
+                    self.navegar_a_pagina(driver, pagina, plazo)
+                if pendiente:
+                    guardar_pagina(pendiente[0], pendiente[1].result())
+                    pendiente = None
+                if self.paginacion['scroll_lento']:
+                    scroll_page_slowly(driver, plazo)
+                productos_pagina = self.extraer(driver, en_segundo_plano=True)
+                if self.spec['modo_extraccion'] == 'lxml':
+                    pendiente = (pagina, productos_pagina)
+                    print("Enviada al analizador.")
+                else:
+                    guardar_pagina(pagina, productos_pagina)
+                    print(f"Procesada. Se encontraron {len(productos_pagina)} productos.")
+                TRAFICO.actualizar(driver)
+            if pendiente:
+                guardar_pagina(pendiente[0], pendiente[1].result())
+        print(f"Se han procesado un total de {len(hechas)} páginas y se encontraron {escritor.filas} productos.")
+
+    #%% Corrida completa
+    @medir
+    def posprocesar(self, df_productos):
+        """Convierte precio y precio por unidad a números con normalizacion.py; se aplica por bloques al CSV parcial."""
+        return normalizar_precios(df_productos, self.spec['columna_nombre'])
+
+    def recorrer(self, directorio, archivo_salida, reanudar=False):
+        """
+        Abre Chrome, recorre el listado con la estrategia de la especificación y escribe la salida.
+
+        :param directorio: Carpeta de la salida, del CSV parcial y del punto de control
+        :param archivo_salida: CSV final
+        :param reanudar: Continúa desde el punto de control
+        :return: Número de filas escritas (o guardadas en el CSV parcial si se agotó el plazo de la corrida)
+        """
+        self.plazo = Plazo(self.plazos['corrida'], etiqueta='corrida')
+        METRICAS.iniciar_fase('arranque')
+        self.opts = opciones_chrome(self.spec['headless'])
+        self.driver = obtener_driver(self.opts)
+        # Con un error el Chrome prestado se descarta; si no, en el trabajador de programador.py quedaría
+        # abierto fuera del pool en cada turno fallido
+        completo = False
+        try:
+            aplicar_bloqueo(self.driver, self.tienda, self.spec['perfil_bloqueo'])
+
+            METRICAS.iniciar_fase('carga_inicial')
+            if not self.cargar_inicial():
+                print("No se pudo cargar la página después de varios intentos. Finalizando el script.")
+                sys.exit()
+
+            METRICAS.iniciar_fase('paginacion')
+            self.escritor = EscritorIncremental(self.tienda, directorio, reanudar)
+            getattr(self, f"paginar_{self.paginacion['estrategia']}")()
+            # Una espera cortada por el plazo termina la paginación como si no hubiera más páginas
+            self.corrida_vencida()
+            completo = True
+        finally:
+            REGISTRO.imprimir_resumen()
+            print(f"Plazo de la corrida: {self.plazos['corrida'] - self.plazo.restante():.0f} de {self.plazos['corrida']} s usados.")
+            if completo:
+                TRAFICO.imprimir_resumen(self.driver)
+                devolver_driver(self.driver)
+            else:
+                TRAFICO.imprimir_resumen()
+                descartar_driver(self.driver)
+                if self.escritor is not None:
+                    # No se finaliza: el CSV parcial y el punto de control quedan para --resume
+                    print(f"La paginación se interrumpió con {self.escritor.filas} productos guardados; se continúa con --resume.")
+
+        if self.vencida:
+            # Sin finalizar: el CSV parcial y el punto de control quedan para --resume
+            print(f"Se guardaron {self.escritor.filas} productos en {self.escritor.ruta_parcial}; se continúa con --resume.")
+            return self.escritor.filas
+        METRICAS.iniciar_fase('posprocesamiento')
+        return self.escritor.finalizar(archivo_salida, self.posprocesar, index=self.spec['index'])
+
+#%% CORRIDA
+def ejecutar(tienda, reanudar=False, refrescar=False, usar_cache=False, **ajustes):
+    """
+    Corre un almacén de almacenes.py de principio a fin, con navegador o con su motor sin navegador.
+
+    :param tienda: Almacén registrado en ALMACENES
+    :param reanudar: Continúa desde el último punto de control (--resume)
+    :param refrescar: Ignora la caché de páginas; las descargas se vuelven a guardar (--refresh)
+    :param usar_cache: Sirve de la caché de páginas lo vigente (--cache); sin ella ni refrescar no se usa
+    :param ajustes: Claves de la especificación que cambian solo en esta corrida (p. ej. motor='vtex')
+    :return: Tupla (filas guardadas, ruta del CSV de salida o del parcial si se agotó el plazo de la corrida)
+    """
+    spec = especificacion(tienda, **ajustes)
+    hoy = datetime.now().strftime('%d%m%Y%H%M')
+    path_save = environ.get('FRUVER_SALIDA', DIRECTORIO_SALIDA)
+    archivo_salida = path_save+f'{tienda}_'+hoy+'.csv'
+    url = environ.get(f'FRUVER_URL_{tienda.upper()}', spec['url']) # Servidor de fixtures de benchmark.py
+
+    METRICAS.iniciar(tienda)
+    # La caché es para repetir una corrida (p. ej. tras corregir un selector); una corrida normal o
+    # programada descarga todo para no guardar precios viejos con fecha nueva
+    CACHE.iniciar(tienda if usar_cache or refrescar else None, refrescar)
+    if spec['motor'] != 'selenium':
+        METRICAS.iniciar_fase('motor')
+        df_productos = extraer_con_api(tienda, spec)
+        df_productos.to_csv(archivo_salida, index=spec['index'])
+        filas_guardadas = len(df_productos)
+    else:
+        motor = MotorNavegador(tienda, spec, url)
+        filas_guardadas = motor.recorrer(path_save, archivo_salida, reanudar)
+        if motor.vencida:
+            archivo_salida = motor.escritor.ruta_parcial
+
+    print(f'Terminó la ejecución para el {tienda}: {filas_guardadas} filas en {archivo_salida}')
+    METRICAS.imprimir_resumen()
+    CACHE.imprimir_resumen()
+    METRICAS.guardar(path_save, hoy)
+    return filas_guardadas, archivo_salida
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in ALMACENES:
+        sys.exit(f"Uso: python motor_navegador.py <{'|'.join(ALMACENES)}> [--resume] [--cache] [--refresh]")
+    ejecutar(sys.argv[1], reanudar='--resume' in sys.argv, refrescar='--refresh' in sys.argv, usar_cache='--cache' in sys.argv)
@@ -0,0 +1,77 @@
+"""
+Codigo para extraer el fruver de merkaorganico (Shopify) desde el JSON de la colección, sin navegador.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Se lee /products.json de la colección en páginas
+      de 250 productos sobre una sola conexión keep-alive.
+    - [2026-10-18][Duvan]: Las variantes van directo a una TablaProductos (registros.py) en lugar de diccionarios.
+
+Uso:
+    python motor_shopify.py [url_base] [directorio_grabacion]
+"""
+#%% MODULOS
+import sys
+
+from cliente_http import ClienteHTTP
+from registros import TablaProductos
+
+#%% CONFIGURACIÓN
+URL_MERKA = 'https://merkaorganicoonline.com'
+COLECCION_MERKA = 'frutas-y-verduras-1'
+TAMANO_PAGINA = 250  # Máximo que acepta Shopify en products.json
+
+#%% FUNCIONES
+def agregar_producto(tabla, producto, valor_predeterminado="No disponible"):
+    """
+    Agrega a `tabla` una fila por variante de un producto de Shopify, con el esquema de merka.
+
+    Los productos sin variantes reales traen una sola variante 'Default Title'; en ese caso se
+    usa solo el título del producto, igual que en la tarjeta de la colección.
+    """
+    for variante in producto.get('variants', []):
+        nombre = producto.get('title', valor_predeterminado)
+        if variante.get('title') and variante['title'] != 'Default Title':
+            nombre = f"{nombre} - {variante['title']}"
+        precio = variante.get('price')
+        tabla.agregar(nombre, int(float(precio)) if precio else None)
+
+def extraer_coleccion_shopify(url_base=URL_MERKA, coleccion=COLECCION_MERKA, tamano_pagina=TAMANO_PAGINA, directorio_grabacion=None):
+    """
+    Descarga todos los productos de una colección de Shopify.
+
+    :param url_base: Dominio de la tienda (o el de servidor_local.py para pruebas sin conexión)
+    :param coleccion: Identificador de la colección en la URL
+    :param tamano_pagina: Productos por petición (máximo 250)
+    :param directorio_grabacion: Carpeta donde grabar las respuestas para reproducirlas luego
+    :return: DataFrame con columnas producto, precio (Int64), precio_x_unidad y unidad (vacías en Shopify)
+    """
+    cliente = ClienteHTTP(url_base, max_conexiones=1, directorio_grabacion=directorio_grabacion)
+    ruta = f'/collections/{coleccion}/products.json'
+    tabla = TablaProductos()
+    pagina = 1
+    try:
+        while True:
+            productos = cliente.obtener_json(ruta, {'limit': tamano_pagina, 'page': pagina}).get('products', [])
+            for producto in productos:
+                agregar_producto(tabla, producto)
+            if len(productos) < tamano_pagina:
+                break
+            pagina += 1
+    finally:
+        cliente.cerrar()
+
+    print(f"[Shopify] merka: {len(tabla)} productos en {cliente.peticiones} peticiones.")
+    return tabla.a_dataframe()
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    url_base = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] != '-' else URL_MERKA
+    directorio_grabacion = sys.argv[2] if len(sys.argv) > 2 else None
+    df = extraer_coleccion_shopify(url_base, directorio_grabacion=directorio_grabacion)
+    print(df.head(20).to_string())
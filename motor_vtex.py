@@ -0,0 +1,119 @@
+"""
+Codigo para extraer el fruver de los almacenes VTEX (exito, carulla, euro y jumbo) sin navegador.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Se consulta la API pública de búsqueda de catálogo
+      de VTEX por páginas de 50 productos sobre un pool de conexiones.
+    - [2026-10-18][Duvan]: Los productos van directo a una TablaProductos (registros.py) en lugar de diccionarios.
+
+Uso:
+    python motor_vtex.py exito [url_base] [directorio_grabacion]
+"""
+#%% MODULOS
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from cliente_http import ClienteHTTP
+from registros import TablaProductos
+
+#%% CONFIGURACIÓN
+# Dominio y ruta de categoría de cada almacén; la ruta es la misma que se abre en el navegador
+TIENDAS_VTEX = {
+    'exito': {'url_base': 'https://www.exito.com', 'categoria': 'mercado/frutas-y-verduras'},
+    'carulla': {'url_base': 'https://www.carulla.com', 'categoria': 'frutas-y-verduras'},
+    'euro': {'url_base': 'https://www.eurosupermercados.com.co', 'categoria': 'mercado/fruver'},
+    'jumbo': {'url_base': 'https://www.tiendasjumbo.co', 'categoria': 'supermercado/frutas-y-verduras'},
+}
+RUTA_BUSQUEDA = '/api/catalog_system/pub/products/search/'
+TAMANO_PAGINA = 50  # Máximo que acepta VTEX entre _from y _to
+MAXIMO_RESULTADOS = 2500  # VTEX no pagina más allá de este desplazamiento
+UNIDADES_MEDIDA = ('g', 'gr', 'kg', 'ml', 'l', 'lt')
+
+#%% FUNCIONES
+def total_resultados(cabeceras):
+    """Lee el total de la cabecera 'resources: 0-49/312' que VTEX agrega a la búsqueda."""
+    coincidencia = re.search(r'/(\d+)$', cabeceras.get('resources', '') or '')
+    return int(coincidencia.group(1)) if coincidencia else None
+
+def agregar_producto(tabla, producto, valor_predeterminado="No disponible"):
+    """
+    Agrega a `tabla` la fila producto/precio/precio_x_unidad/unidad de un producto del JSON de VTEX.
+
+    Se toma el primer sku con un vendedor disponible. El precio por unidad es el precio dividido
+    por el multiplicador de la unidad de medida (por gramo, mililitro o unidad). Sin vendedor
+    disponible el precio queda NA.
+    """
+    for item in producto.get('items', []):
+        for vendedor in item.get('sellers', []):
+            oferta = vendedor.get('commertialOffer', {})
+            precio = oferta.get('Price') or 0
+            if not precio or not oferta.get('IsAvailable', True):
+                continue
+            unidad = (item.get('measurementUnit') or 'un').strip()
+            multiplicador = item.get('unitMultiplier') or 1
+            if unidad.lower() in UNIDADES_MEDIDA and multiplicador:
+                precio_x_unidad = round(precio / multiplicador, 2)
+            else:
+                precio_x_unidad = precio
+            tabla.agregar(producto.get('productName', valor_predeterminado), round(precio), precio_x_unidad, unidad)
+            return
+    tabla.agregar(producto.get('productName', valor_predeterminado))
+
+def extraer_catalogo_vtex(tienda, url_base=None, tamano_pagina=TAMANO_PAGINA, max_conexiones=4, directorio_grabacion=None):
+    """
+    Descarga toda la categoría de fruver de un almacén VTEX.
+
+    La primera página informa el total de resultados; las demás se piden en paralelo sobre el
+    mismo pool de conexiones. Si el servidor no informa el total se pagina hasta una página vacía.
+
+    :param tienda: 'exito', 'carulla', 'euro' o 'jumbo'
+    :param url_base: Dominio alternativo (p. ej. el de servidor_local.py para pruebas sin conexión)
+    :param tamano_pagina: Productos por petición (máximo 50)
+    :param max_conexiones: Conexiones y peticiones simultáneas
+    :param directorio_grabacion: Carpeta donde grabar las respuestas para reproducirlas luego
+    :return: DataFrame con columnas producto, precio (Int64), precio_x_unidad y unidad (categorías)
+    """
+    configuracion = TIENDAS_VTEX[tienda]
+    cliente = ClienteHTTP(url_base or configuracion['url_base'], max_conexiones=max_conexiones, directorio_grabacion=directorio_grabacion)
+    ruta = RUTA_BUSQUEDA + configuracion['categoria']
+
+    def pagina(desde):
+        return cliente.obtener(ruta, {'_from': desde, '_to': desde + tamano_pagina - 1})
+
+    try:
+        productos, cabeceras = pagina(0)
+        total = total_resultados(cabeceras)
+        if total is not None:
+            desplazamientos = range(tamano_pagina, min(total, MAXIMO_RESULTADOS), tamano_pagina)
+            with ThreadPoolExecutor(max_workers=max_conexiones) as ejecutor:
+                for productos_pagina, _ in ejecutor.map(pagina, desplazamientos):
+                    productos.extend(productos_pagina)
+        else:
+            desde = tamano_pagina
+            productos_pagina = productos
+            while len(productos_pagina) == tamano_pagina and desde < MAXIMO_RESULTADOS:
+                productos_pagina, _ = pagina(desde)
+                productos.extend(productos_pagina)
+                desde += tamano_pagina
+    finally:
+        cliente.cerrar()
+
+    print(f"[VTEX] {tienda}: {len(productos)} productos en {cliente.peticiones} peticiones.")
+    tabla = TablaProductos()
+    for producto in productos:
+        agregar_producto(tabla, producto)
+    return tabla.a_dataframe()
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    url_base = sys.argv[2] if len(sys.argv) > 2 and sys.argv[2] != '-' else None
+    directorio_grabacion = sys.argv[3] if len(sys.argv) > 3 else None
+    df = extraer_catalogo_vtex(sys.argv[1], url_base=url_base, directorio_grabacion=directorio_grabacion)
+    print(df.head(20).to_string())
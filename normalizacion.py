@@ -0,0 +1,203 @@
+"""
+Codigo para convertir los precios y precios por unidad de los cinco almacenes a columnas numéricas.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Un solo juego de expresiones regulares compiladas
+      para todos los almacenes: precio entero en COP, precio por unidad en float y unidad canónica
+      (g, ml o und). Reemplaza los replace/split encadenados del posprocesamiento de cada script.
+    - [2026-10-18][Duvan]: El precio por unidad calculado con el nombre solo reemplaza etiquetas redondeadas,
+      según la precisión con que se muestran.
+    - [2026-10-18][Duvan]: Las expresiones corren con pyarrow.compute.extract_regex (una pasada vectorizada por
+      columna, con los decimales de la etiqueta en el mismo patrón) y el nombre solo se analiza en las filas
+      sin etiqueta o con etiqueta redondeada.
+
+Uso:
+    python normalizacion.py [filas]   # compara contra el posprocesamiento anterior con datos sintéticos
+"""
+#%% MODULOS
+import re
+import sys
+from time import perf_counter
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas import DataFrame, Series, to_numeric
+
+#%% CONFIGURACIÓN
+# Unidad canónica y factor para llevar una cantidad de esa unidad a la canónica (libra = 500 g)
+UNIDADES = {
+    'g': ('g', 1), 'gr': ('g', 1), 'grs': ('g', 1), 'gramo': ('g', 1), 'gramos': ('g', 1),
+    'kg': ('g', 1000), 'kgs': ('g', 1000), 'kilo': ('g', 1000), 'kilos': ('g', 1000), 'lb': ('g', 500),
+    'ml': ('ml', 1), 'cc': ('ml', 1), 'l': ('ml', 1000), 'lt': ('ml', 1000), 'lts': ('ml', 1000),
+    'litro': ('ml', 1000), 'litros': ('ml', 1000),
+    'un': ('und', 1), 'und': ('und', 1), 'unds': ('und', 1), 'unidad': ('und', 1), 'unidades': ('und', 1),
+}
+UNIDAD_CANONICA = {clave: valor[0] for clave, valor in UNIDADES.items()}
+FACTOR_UNIDAD = {clave: valor[1] for clave, valor in UNIDADES.items()}
+
+# Las expresiones las corre RE2 (pyarrow) y deben valer también para re: sin banderas (van en el patrón)
+# y con \w, \d y \b solo ASCII, lo que basta porque todas las unidades de UNIDADES lo son.
+# Precios con punto de miles y coma decimal: '$ 3.112', '$ 3.800,00', ' 840'
+PATRON_PRECIO = re.compile(r'(?P<entero>\d{1,3}(?:\.\d{3})+|\d+)(?:,(?P<decimales>\d+))?')
+# Etiqueta de precio por unidad: 'Gr a $ 3' (Éxito), '(gr a $ 4,6)' (Jumbo); decimales sirve para la resolución
+PATRON_PUM = re.compile(r'(?P<unidad>[^\W\d_]+)\.?\s+a\s+\$\s*(?P<valor>(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,(?P<decimales>\d+))?)')
+# Cantidad en el nombre: 'Limón Tahití Malla TAEQ 1000 gr', 'Tomate chonto x 500gr', 'Banano 1 Und'
+PATRON_CANTIDAD = re.compile(r'(?i)(?P<cantidad>\d+(?:[.,]\d+)?)\s*(?P<unidad>kgs?|kilos?|grs?|gramos?|g|ml|cc|lts?|litros?|l|lb|unds?|unidad(?:es)?|un)\b')
+# Una etiqueta cuya última cifra vale menos que esta fracción de su valor se toma como exacta y su fila
+# no se busca en el nombre ('und a $ 30.000,0'); 'Gr a $ 3' o '(gr a $ 111,9)' pueden venir redondeadas
+PRECISION_EXACTA = 1e-4
+
+#%% FUNCIONES
+def extraer(serie, patron):
+    """
+    Como serie.str.extract(patron), pero en una sola pasada de pyarrow (RE2) en lugar de un re.search por fila.
+
+    :return: Diccionario grupo -> pyarrow.Array de texto; nulo si la fila no coincide y '' si coincide
+        sin el grupo opcional
+    """
+    coincidencias = pc.extract_regex(pa.array(serie.astype(str), from_pandas=True), patron.pattern)
+    return {campo.name: pc.struct_field(coincidencias, [i]) for i, campo in enumerate(coincidencias.type)}
+
+def texto(grupo, index):
+    """Grupo de extraer como Series de texto (None donde no hubo coincidencia)."""
+    return Series(grupo.to_numpy(zero_copy_only=False), index=index, dtype='object')
+
+def numero_colombiano(grupo, index, miles=True):
+    """
+    '3.112' -> 3112.0 y '4,6' -> 4.6 (punto de miles, coma decimal) sobre un grupo de extraer, que ya
+    solo trae dígitos y separadores; con miles=False el punto también es decimal ('1.5 kg').
+    """
+    if miles:
+        grupo = pc.replace_substring(grupo, '.', '')
+    grupo = pc.replace_substring(grupo, ',', '.')
+    return Series(pc.cast(grupo, pa.float64()).to_numpy(zero_copy_only=False), index=index)
+
+def unidad_canonica(serie):
+    """Unidad canónica y factor de conversión de cada unidad escrita; NaN si no se reconoce."""
+    clave = serie.astype(str).str.strip().str.lower().str.rstrip('.')
+    return clave.map(UNIDAD_CANONICA), clave.map(FACTOR_UNIDAD).astype('float64')
+
+def precio_cop(serie):
+    """Precio entero en COP a partir del texto de la tarjeta ('$ 3.112' -> 3112)."""
+    return numero_colombiano(extraer(serie, PATRON_PRECIO)['entero'], serie.index).astype('Int64')
+
+def precio_etiqueta(serie):
+    """
+    Precio por unidad canónica y unidad a partir de la etiqueta del almacén ('Kg a $ 5.000' -> 5.0, 'g').
+
+    También devuelve la resolución de la etiqueta en la unidad canónica, una unidad de la última cifra
+    mostrada: 'Gr a $ 3' -> 1.0, '(gr a $ 4,6)' -> 0.1, 'Kg a $ 5.000' -> 0.001.
+    """
+    partes = extraer(serie, PATRON_PUM)
+    unidad, factor = unidad_canonica(texto(partes['unidad'], serie.index))
+    decimales = Series(pc.utf8_length(partes['decimales']).to_numpy(zero_copy_only=False), index=serie.index).fillna(0)
+    return numero_colombiano(partes['valor'], serie.index) / factor, unidad, 10.0 ** -decimales / factor
+
+def cantidad_nombre(serie):
+    """Cantidad en unidad canónica y unidad a partir del nombre ('x 500gr' -> 500.0, 'g')."""
+    partes = extraer(serie, PATRON_CANTIDAD)
+    unidad, factor = unidad_canonica(texto(partes['unidad'], serie.index))
+    return numero_colombiano(partes['cantidad'], serie.index, miles=False) * factor, unidad
+
+def combinar(df, columna_nombre, precio, precio_x_unidad, unidad, resolucion):
+    """
+    Completa el precio por unidad con la cantidad del nombre y arma las columnas de salida.
+
+    Si la etiqueta no trae precio por unidad se usa precio / cantidad del nombre. Si lo trae pero
+    redondeado (Éxito muestra 'Gr a $ 3' para 3.112 $/g), coincide en unidad y el calculado difiere
+    en menos que la resolución de la etiqueta, se usa el calculado, que conserva los decimales; una
+    etiqueta con más precisión (Jumbo, 'gr a $ 18,96') se deja como está. El nombre solo se analiza en
+    las filas sin etiqueta o cuya etiqueta puede venir redondeada (PRECISION_EXACTA).
+
+    :param resolucion: Una unidad de la última cifra de la etiqueta, en la unidad canónica; 0 si es exacta
+    """
+    redondeable = precio_x_unidad.isna() | (resolucion > precio_x_unidad.abs() * PRECISION_EXACTA)
+    cantidad, unidad_nombre = cantidad_nombre(df.loc[redondeable, columna_nombre])
+    cantidad, unidad_nombre = cantidad.reindex(df.index), unidad_nombre.reindex(df.index)
+    calculado = Series(precio.to_numpy(dtype='float64', na_value=np.nan), index=df.index) / cantidad.where(cantidad > 0)
+    redondeada = unidad.eq(unidad_nombre) & (precio_x_unidad - calculado).abs().lt(resolucion)
+    usar_calculado = calculado.notna() & (precio_x_unidad.isna() | redondeada)
+    df['precio'] = precio
+    df['precio_x_unidad'] = precio_x_unidad.mask(usar_calculado, calculado).round(4).astype('Float64')
+    df['unidad'] = unidad.mask(usar_calculado, unidad_nombre).astype('string')
+    return df
+
+def normalizar_precios(df, columna_nombre='producto', columna_pum='precio_unidad'):
+    """
+    Convierte el texto crudo de las tarjetas (cualquiera de los cinco almacenes) a columnas numéricas.
+
+    :param df: DataFrame con el nombre, 'precio' y la etiqueta de precio por unidad como texto
+    :param columna_nombre: 'producto' o 'nombre' (Jumbo)
+    :param columna_pum: Columna de la etiqueta; puede no existir o traer 'No disponible'
+    :return: df con precio (Int64), precio_x_unidad (Float64 por g, ml o und) y unidad, sin columna_pum
+    """
+    precio = precio_cop(df['precio'])
+    if columna_pum in df:
+        precio_x_unidad, unidad, resolucion = precio_etiqueta(df[columna_pum])
+        df = df.drop(columns=[columna_pum])
+    else:
+        precio_x_unidad, unidad = Series(np.nan, index=df.index), Series(np.nan, index=df.index, dtype='object')
+        resolucion = 0
+    return combinar(df, columna_nombre, precio, precio_x_unidad, unidad, resolucion)
+
+def normalizar_motor(df, columna_nombre='producto'):
+    """
+    Misma salida que normalizar_precios para los DataFrames de motor_vtex y motor_shopify, que ya
+    traen números (precio_x_unidad por la unidad de medida de VTEX, sin unidad en Shopify).
+    """
+    precio = to_numeric(df['precio'], errors='coerce').round().astype('Int64')
+    precio_x_unidad = to_numeric(df['precio_x_unidad'], errors='coerce') if 'precio_x_unidad' in df else Series(np.nan, index=df.index)
+    if 'unidad' in df:
+        unidad, factor = unidad_canonica(df['unidad'])
+        # Solo un valor entero en su unidad puede venir redondeado; uno con decimales se respeta
+        resolucion = precio_x_unidad.eq(precio_x_unidad.round()).astype('float64') / factor
+        precio_x_unidad = precio_x_unidad / factor
+    else:
+        unidad = Series(np.nan, index=df.index, dtype='object')
+        resolucion = 0
+    return combinar(df, columna_nombre, precio, precio_x_unidad, unidad, resolucion)
+
+def normalizar_legado(df):
+    """Posprocesamiento anterior de Script_exito.py, solo como referencia para la comparación."""
+    df['precio'] = df['precio'].str.replace(r'\$|\.', '', regex=True)
+    df['precio_x_unidad'] = df['precio_unidad'].str.split(' a ').str[-1].str.replace(r'\$|\.', '', regex=True)
+    df['unidad'] = df['precio_unidad'].str.split(' a ').str[0]
+    return df.drop(columns=['precio_unidad'])
+
+def datos_sinteticos(filas=1_000_000, semilla=0):
+    """Tarjetas crudas con los formatos de Éxito, Jumbo y los almacenes sin etiqueta, mezclados."""
+    aleatorio = np.random.default_rng(semilla)
+    cantidades = aleatorio.choice([1, 250, 500, 1000, 3000], filas)
+    unidades = np.where(cantidades == 1, 'Und', 'gr')
+    precios = aleatorio.integers(500, 60000, filas)
+    formato = aleatorio.integers(0, 3, filas)
+    nombres = [f"Producto {i % 5000} x {c} {u}" for i, c, u in zip(range(filas), cantidades, unidades)]
+    textos_precio = [f"$ {p:,}".replace(',', '.') for p in precios]
+    etiquetas = [
+        f"{u} a $ {p // c:,}".replace(',', '.') if f == 0 else
+        f"({u.lower()} a $ {p / c:.1f})".replace('.', ',') if f == 1 else 'No disponible'
+        for p, c, u, f in zip(precios, cantidades, unidades, formato)
+    ]
+    return DataFrame({'producto': nombres, 'precio': textos_precio, 'precio_unidad': etiquetas})
+
+def comparar(filas=1_000_000):
+    """Mide normalizar_precios frente al posprocesamiento anterior sobre `filas` tarjetas sintéticas."""
+    datos = datos_sinteticos(filas)
+    print(f"{filas} filas sintéticas ({datos.memory_usage(deep=True).sum() / 1024 / 1024:.0f} MB de texto).")
+    for nombre, funcion in (('anterior', normalizar_legado), ('normalizacion', normalizar_precios)):
+        inicio = perf_counter()
+        salida = funcion(datos.copy())
+        duracion = perf_counter() - inicio
+        memoria = salida.memory_usage(deep=True).sum() / 1024 / 1024
+        print(f"{nombre:<14}{duracion:>8.2f} s{filas / duracion:>12,.0f} filas/s{memoria:>8.0f} MB  "
+              f"precio: {salida['precio'].dtype}, precio_x_unidad: {salida['precio_x_unidad'].dtype}")
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    comparar(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
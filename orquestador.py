@@ -0,0 +1,172 @@
+"""
+Codigo para ejecutar en paralelo los scripts de los cinco almacenes.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Cada almacén corre en su propio proceso, los fallos
+      quedan aislados y al final se imprime un resumen de filas, duración y errores.
+    - [2026-10-18][Duvan]: Se agrega --resume para continuar cada almacén desde su punto de control.
+    - [2026-10-18][Duvan]: Se agrega --historico para importar las salidas al histórico Parquet al terminar.
+    - [2026-10-18][Duvan]: Se agrega --deltas para guardar cada salida como diferencia frente a la corrida anterior.
+    - [2026-10-18][Duvan]: El registro de esperas se reinicia en cada corrida (un proceso puede correr varias).
+    - [2026-10-18][Duvan]: Se agrega --refresh para ignorar la caché de páginas en todos los almacenes.
+    - [2026-10-18][Duvan]: Los almacenes salen de almacenes.py; uno sin Script_<tienda>.py corre directo en motor_navegador.py.
+    - [2026-10-18][Duvan]: Se agrega --indices para actualizar los índices de precios con las capturas nuevas del histórico.
+    - [2026-10-18][Duvan]: Se agrega --cache; sin él los almacenes no usan la caché de páginas.
+
+Uso:
+    python orquestador.py                       # los cinco almacenes
+    python orquestador.py exito jumbo --logs logs/
+    python orquestador.py carulla --resume         # continúa desde el último punto de control
+    python orquestador.py --historico historico/   # agrega las salidas al histórico Parquet
+    python orquestador.py --historico historico/ --indices indices/   # y actualiza los índices de precios
+    python orquestador.py --deltas deltas/         # guarda solo lo que cambió frente a la corrida anterior
+    python orquestador.py jumbo --cache            # sirve de la caché de páginas lo vigente
+    python orquestador.py jumbo --refresh          # descarga todo y lo vuelve a guardar en la caché
+"""
+#%% MODULOS
+import os
+import sys
+import json
+import runpy
+import argparse
+import traceback
+from time import perf_counter
+from datetime import datetime
+from contextlib import redirect_stdout
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from almacenes import ALMACENES
+
+#%% CONFIGURACIÓN
+TIENDAS = list(ALMACENES)
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+#%% FUNCIONES
+def ruta_script(tienda):
+    return os.path.join(DIRECTORIO, f'Script_{tienda}.py')
+
+def ejecutar_script(tienda, reanudar=False, refrescar=False, usar_cache=False):
+    """
+    Ejecuta Script_<tienda>.py (o motor_navegador.ejecutar si no hay script) en el intérprete actual.
+
+    :param tienda: Nombre del almacén
+    :param reanudar: Pasa --resume al script para continuar desde su punto de control
+    :param refrescar: Pasa --refresh al script para ignorar la caché de páginas
+    :param usar_cache: Pasa --cache al script para servir de la caché de páginas lo vigente
+    :return: Diccionario con tienda, filas, archivo, duracion (s) y error (None si terminó bien)
+    """
+    if DIRECTORIO not in sys.path:
+        sys.path.insert(0, DIRECTORIO)
+    from esperas import REGISTRO
+    # El mismo proceso puede correr varios almacenes o varias corridas (pool de procesos, programador.py)
+    REGISTRO.reiniciar()
+    inicio = perf_counter()
+    filas, archivo, error = 0, None, None
+    argv_original = sys.argv
+    sys.argv = ([ruta_script(tienda)] + (['--resume'] if reanudar else []) + (['--refresh'] if refrescar else [])
+                + (['--cache'] if usar_cache else []))
+    try:
+        if os.path.exists(ruta_script(tienda)):
+            variables = runpy.run_path(ruta_script(tienda), run_name='__main__')
+            filas = variables.get('filas_guardadas', 0)
+            archivo = variables.get('archivo_salida')
+        else:
+            from motor_navegador import ejecutar
+            filas, archivo = ejecutar(tienda, reanudar, refrescar, usar_cache)
+    except SystemExit as e:
+        error = f"El script terminó con exit({e.code})"
+    except Exception:
+        error = traceback.format_exc(limit=3)
+    finally:
+        sys.argv = argv_original
+    return {'tienda': tienda, 'filas': filas, 'archivo': archivo, 'duracion': round(perf_counter() - inicio, 1), 'error': error}
+
+def ejecutar_en_proceso(tienda, directorio_logs=None, reanudar=False, refrescar=False, usar_cache=False):
+    """Punto de entrada de cada proceso; opcionalmente redirige la salida del script a un log propio."""
+    if not directorio_logs:
+        return ejecutar_script(tienda, reanudar, refrescar, usar_cache)
+    os.makedirs(directorio_logs, exist_ok=True)
+    hoy = datetime.now().strftime('%d%m%Y%H%M')
+    with open(os.path.join(directorio_logs, f'{tienda}_{hoy}.log'), 'w') as log, redirect_stdout(log):
+        return ejecutar_script(tienda, reanudar, refrescar, usar_cache)
+
+def ejecutar_tiendas(tiendas=TIENDAS, procesos=None, directorio_logs=None, reanudar=False, refrescar=False, usar_cache=False):
+    """
+    Corre los almacenes indicados en un pool de procesos y espera a que terminen todos.
+
+    :param tiendas: Lista de almacenes a ejecutar
+    :param procesos: Número máximo de procesos simultáneos (por defecto uno por almacén)
+    :param directorio_logs: Carpeta para la salida de cada almacén; None la deja en consola
+    :param reanudar: Cada almacén continúa desde su punto de control (--resume)
+    :param refrescar: Cada almacén ignora la caché de páginas (--refresh)
+    :param usar_cache: Cada almacén sirve de la caché de páginas lo vigente (--cache)
+    :return: Lista de resúmenes en el orden de tiendas
+    """
+    resumenes = {}
+    # spawn evita heredar hilos y sockets del proceso padre en cada Chrome hijo
+    with ProcessPoolExecutor(max_workers=procesos or len(tiendas), mp_context=get_context('spawn')) as ejecutor:
+        futuros = {ejecutor.submit(ejecutar_en_proceso, tienda, directorio_logs, reanudar, refrescar, usar_cache): tienda for tienda in tiendas}
+        for futuro in as_completed(futuros):
+            tienda = futuros[futuro]
+            try:
+                resumenes[tienda] = futuro.result()
+            except Exception as e:
+                # El proceso murió (p. ej. Chrome tumbó al intérprete); el resto sigue
+                resumenes[tienda] = {'tienda': tienda, 'filas': 0, 'archivo': None, 'duracion': None, 'error': repr(e)}
+            estado = 'OK' if resumenes[tienda]['error'] is None else 'ERROR'
+            print(f"[{estado}] {tienda}: {resumenes[tienda]['filas']} filas en {resumenes[tienda]['duracion']} s")
+    return [resumenes[tienda] for tienda in tiendas]
+
+def imprimir_resumen(resumenes, duracion_total):
+    print(f"\n{'tienda':<10}{'filas':>8}{'duracion (s)':>15}  error")
+    for resumen in resumenes:
+        error = (resumen['error'] or '').strip().splitlines()
+        print(f"{resumen['tienda']:<10}{resumen['filas']:>8}{str(resumen['duracion']):>15}  {error[-1] if error else ''}")
+    suma = sum(resumen['duracion'] or 0 for resumen in resumenes)
+    print(f"Tiempo total: {duracion_total:.1f} s (secuencial hubiera sido ~{suma:.1f} s)")
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ejecuta en paralelo los scripts de los almacenes.')
+    parser.add_argument('tiendas', nargs='*', default=TIENDAS, help=f"Almacenes a ejecutar ({', '.join(TIENDAS)})")
+    parser.add_argument('--procesos', type=int, default=None, help='Procesos simultáneos (por defecto uno por almacén)')
+    parser.add_argument('--logs', default=None, help='Carpeta para guardar la salida de cada almacén')
+    parser.add_argument('--resumen', default=None, help='Archivo JSON donde guardar el resumen')
+    parser.add_argument('--resume', action='store_true', help='Continúa cada almacén desde su último punto de control')
+    parser.add_argument('--cache', action='store_true', help='Sirve de la caché de páginas lo vigente (por defecto no se usa)')
+    parser.add_argument('--refresh', action='store_true', help='Ignora la caché de páginas y vuelve a descargar todo')
+    parser.add_argument('--historico', default=None, help='Raíz del histórico Parquet donde importar las salidas')
+    parser.add_argument('--deltas', default=None, help='Raíz de las instantáneas donde guardar las salidas como diferencias')
+    parser.add_argument('--indices', default=None, help='Carpeta de los índices de precios a actualizar (requiere --historico)')
+    args = parser.parse_args()
+    if args.indices and not args.historico:
+        parser.error("--indices requiere --historico")
+    desconocidas = set(args.tiendas) - set(TIENDAS)
+    if desconocidas:
+        parser.error(f"Almacenes desconocidos: {', '.join(sorted(desconocidas))}")
+
+    inicio = perf_counter()
+    resumenes = ejecutar_tiendas(args.tiendas, args.procesos, args.logs, args.resume, args.refresh, args.cache)
+    duracion_total = perf_counter() - inicio
+    imprimir_resumen(resumenes, duracion_total)
+    salidas = [resumen['archivo'] for resumen in resumenes if resumen['error'] is None and resumen['archivo']]
+    if args.historico:
+        from historico import importar
+        importar(salidas, args.historico)
+    if args.indices:
+        from indices_precios import IndicesPrecios
+        print(f"Índices de precios: {IndicesPrecios(args.indices).actualizar(args.historico)} capturas nuevas")
+    if args.deltas:
+        from instantaneas import guardar_salidas
+        guardar_salidas(salidas, args.deltas)
+    if args.resumen:
+        with open(args.resumen, 'w') as archivo:
+            json.dump({'duracion_total': round(duracion_total, 1), 'tiendas': resumenes}, archivo, indent=2)
+    sys.exit(1 if any(resumen['error'] for resumen in resumenes) else 0)
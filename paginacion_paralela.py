@@ -0,0 +1,180 @@
+"""
+Codigo para recorrer en paralelo las páginas de un listado que tienen URL directa.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Cada página se abre por su URL en uno de varios
+      Chrome del pool, con un límite de concurrencia, y los resultados se unen en orden de página.
+    - [2026-10-18][Duvan]: Se aprende el patrón de URL de paginación, se lee el total de páginas y se
+      reintenta cada página fallida en lugar de abandonar el recorrido.
+    - [2026-10-18][Duvan]: Se pueden entregar los productos de cada página a una función al terminarla
+      (escritura incremental) y recorrer números de página no consecutivos al reanudar.
+    - [2026-10-18][Duvan]: Cada página pide permiso al limitador del host: los Chrome abiertos siguen
+      siendo max_navegadores, pero cuántos trabajan a la vez lo decide el control AIMD de limitador.py.
+    - [2026-10-18][Duvan]: Las páginas vigentes en la caché (cache_paginas.py) no gastan fichas del limitador.
+    - [2026-10-18][Duvan]: al_procesar recibe las páginas en orden de página aunque terminen en otro orden.
+    - [2026-10-18][Duvan]: El limitador cubre solo la navegación (navegar): la espera de la grilla y el scroll
+      lento de Jumbo ya no cuentan como latencia del almacén ni le quitan concurrencia.
+"""
+#%% MODULOS
+from queue import Queue, Empty
+from threading import Thread, Lock
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from pool_drivers import obtener_driver, devolver_driver
+from bloqueo_recursos import TRAFICO, aplicar_bloqueo
+from limitador import permiso
+
+#%% SCRIPT
+# Mayor número visible en los botones de paginación (1 2 3 ... 12 >)
+JS_TOTAL_PAGINAS = """
+var botones = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var maximo = 0;
+for (var i = 0; i < botones.snapshotLength; i++) {
+    var numero = parseInt((botones.snapshotItem(i).textContent || '').trim(), 10);
+    if (!isNaN(numero) && numero > maximo) { maximo = numero; }
+}
+return maximo;
+"""
+
+#%% FUNCIONES
+def total_paginas(driver, xpath_botones):
+    """Total de páginas según los botones numerados de la paginación; 0 si no se encuentran."""
+    return driver.execute_script(JS_TOTAL_PAGINAS, xpath_botones) or 0
+
+def aprender_patron_pagina(url_primera, url_siguiente, numero_siguiente=2):
+    """
+    Deduce cómo se arma la URL de cualquier página a partir de la primera y la siguiente.
+
+    Se busca el parámetro de la query cuyo valor es numero_siguiente; si no existe, el segmento de
+    la ruta con ese número. Si no se reconoce el patrón se usa ?page=N, el de VTEX.
+
+    :param url_primera: URL de la página 1
+    :param url_siguiente: URL a la que llevó el botón "siguiente"
+    :param numero_siguiente: Número de la página de url_siguiente
+    :return: Función numero -> URL
+    """
+    partes = urlsplit(url_siguiente)
+    previos = dict(parse_qsl(urlsplit(url_primera).query))
+    for clave, valor in parse_qsl(partes.query):
+        if valor == str(numero_siguiente) and previos.get(clave) != valor:
+            print(f"Patrón de paginación: parámetro '{clave}'.")
+            return lambda numero: url_pagina(url_siguiente, numero, clave)
+    segmentos = partes.path.split('/')
+    if str(numero_siguiente) in segmentos:
+        indice = len(segmentos) - 1 - segmentos[::-1].index(str(numero_siguiente))
+        print(f"Patrón de paginación: segmento {indice} de la ruta.")
+        def por_ruta(numero):
+            nuevos = segmentos[:indice] + [str(numero)] + segmentos[indice + 1:]
+            return urlunsplit(partes._replace(path='/'.join(nuevos)))
+        return por_ruta
+    print("No se reconoció el patrón de paginación; se usa ?page=N.")
+    return lambda numero: url_pagina(url_primera, numero)
+
+def url_pagina(url, numero, parametro='page'):
+    """
+    URL de la página `numero` de un listado, reemplazando o agregando el parámetro de paginación.
+
+    >>> url_pagina('https://www.tiendasjumbo.co/supermercado/frutas-y-verduras', 3)
+    'https://www.tiendasjumbo.co/supermercado/frutas-y-verduras?page=3'
+    """
+    partes = urlsplit(url)
+    consulta = [(clave, valor) for clave, valor in parse_qsl(partes.query, keep_blank_values=True) if clave != parametro]
+    consulta.append((parametro, str(numero)))
+    return urlunsplit(partes._replace(query=urlencode(consulta)))
+
+def navegar(driver, url):
+    """
+    driver.get(url) con permiso del limitador del host.
+
+    Solo la navegación es una petición al almacén; lo que procesar_pagina hace después (esperar la
+    grilla, el scroll, extraer) no pasa por el control AIMD.
+    """
+    with permiso(url):
+        driver.get(url)
+
+def recorrer_paginas_en_paralelo(urls, procesar_pagina, opts, max_navegadores=3, tienda=None, perfil_bloqueo='completo', driver_inicial=None, reintentos=2, primer_numero=1, numeros=None, al_procesar=None):
+    """
+    Procesa una lista de URLs de páginas con hasta `max_navegadores` Chrome simultáneos.
+
+    :param urls: URLs de las páginas, en el orden en que deben quedar los resultados
+    :param procesar_pagina: Función (driver, url, numero) -> lista de productos de esa página; abre la URL con navegar
+    :param opts: Options de Chrome con las que se piden drivers al pool
+    :param max_navegadores: Límite de Chrome trabajando a la vez
+    :param tienda: Almacén, para la lista de permitidos del bloqueo de recursos
+    :param perfil_bloqueo: Perfil de bloqueo que se aplica a cada driver
+    :param driver_inicial: Driver ya abierto que se usa como primer trabajador (no se devuelve al pool)
+    :param reintentos: Veces que se vuelve a encolar una página que falló o quedó vacía
+    :param primer_numero: Número de página de urls[0], para los mensajes y procesar_pagina
+    :param numeros: Número de página de cada URL cuando no son consecutivos (p. ej. al reanudar)
+    :param al_procesar: Función (numero, productos) llamada con cada página terminada bien, de a una a la
+        vez y en el orden de urls: una página que termina antes que las anteriores espera en memoria
+        hasta que estas terminen o se descarten; las demás no se acumulan
+    :return: Lista con los productos de cada página, en el orden de urls (vacías si se usó al_procesar)
+    """
+    numeros = list(numeros) if numeros is not None else list(range(primer_numero, primer_numero + len(urls)))
+    pendientes = Queue()
+    for numero, url in zip(numeros, urls):
+        pendientes.put((numero, url, 0))
+    resultados = {}
+    lock_resultados = Lock()
+    listas = {} # Páginas terminadas que esperan a las anteriores para entregarse a al_procesar (None: descartada)
+    siguiente = 0 # Posición en numeros de la próxima página a entregar
+
+    def entregar(numero, productos):
+        nonlocal siguiente
+        with lock_resultados:
+            listas[numero] = productos
+            while siguiente < len(numeros) and numeros[siguiente] in listas:
+                productos_listos = listas.pop(numeros[siguiente])
+                if productos_listos is not None:
+                    al_procesar(numeros[siguiente], productos_listos)
+                siguiente += 1
+
+    def trabajador(driver_propio):
+        driver = driver_propio
+        if driver is None:
+            driver = obtener_driver(opts)
+            aplicar_bloqueo(driver, tienda, perfil_bloqueo, reiniciar_trafico=False)
+        try:
+            while True:
+                try:
+                    numero, url, intento = pendientes.get_nowait()
+                except Empty:
+                    break
+                try:
+                    productos = procesar_pagina(driver, url, numero)
+                    error = None if productos else 'sin productos'
+                except Exception as e:
+                    productos, error = [], str(e)
+                TRAFICO.actualizar(driver)
+                if error is None:
+                    print(f"Página {numero} procesada: {len(productos)} productos.")
+                    if al_procesar is not None:
+                        entregar(numero, productos)
+                        productos = []
+                    resultados[numero] = productos
+                elif intento < reintentos:
+                    print(f"Página {numero} falló ({error}); reintento {intento + 1}/{reintentos}.")
+                    pendientes.put((numero, url, intento + 1))
+                else:
+                    print(f"Página {numero} descartada tras {reintentos} reintentos ({error}).")
+                    if al_procesar is not None:
+                        entregar(numero, None)
+                    resultados[numero] = [] if al_procesar is not None else productos
+        finally:
+            if driver_propio is None:
+                devolver_driver(driver)
+
+    n_navegadores = max(1, min(max_navegadores, len(urls)))
+    hilos = [Thread(target=trabajador, args=(driver_inicial if i == 0 else None,)) for i in range(n_navegadores)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return [resultados.get(numero, []) for numero in numeros]
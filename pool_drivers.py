@@ -0,0 +1,167 @@
+"""
+Codigo para reutilizar instancias de Chrome entre ejecuciones de los almacenes.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. La ruta de chromedriver se resuelve una vez y se
+      guarda en disco; los drivers se prestan, se limpian al devolverse y se reciclan tras N usos.
+    - [2026-10-18][Duvan]: Se agrega descartar_driver para cerrar un driver prestado que quedó en mal estado.
+"""
+#%% MODULOS
+import os
+import json
+import atexit
+from threading import Lock
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+#%% CONFIGURACIÓN
+RUTA_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'fruver', 'chromedriver.json')
+MAX_USOS = 20  # Préstamos antes de cerrar y reemplazar un Chrome
+MAX_INACTIVOS = 3  # Chrome libres que se conservan por configuración de opciones
+
+#%% FUNCIONES
+def ruta_chromedriver(forzar=False):
+    """
+    Devuelve la ruta de chromedriver, consultando a ChromeDriverManager solo si no está en la caché.
+
+    :param forzar: Ignora la caché y vuelve a resolver (p. ej. tras actualizar Chrome)
+    :return: Ruta absoluta del ejecutable
+    """
+    if not forzar and os.path.exists(RUTA_CACHE):
+        with open(RUTA_CACHE) as archivo:
+            ruta = json.load(archivo).get('ruta')
+        if ruta and os.path.isfile(ruta):
+            return ruta
+    ruta = ChromeDriverManager().install()
+    os.makedirs(os.path.dirname(RUTA_CACHE), exist_ok=True)
+    with open(RUTA_CACHE, 'w') as archivo:
+        json.dump({'ruta': ruta}, archivo)
+    return ruta
+
+def clave_opciones(opts):
+    """Dos drivers son intercambiables si se crearon con los mismos argumentos y capacidades."""
+    return json.dumps({'argumentos': sorted(opts.arguments), 'capacidades': opts.to_capabilities()}, sort_keys=True, default=str)
+
+def limpiar_estado(driver):
+    """Borra cookies, caché y almacenamiento, cierra pestañas extra y deja el driver en about:blank."""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    partes = urlsplit(driver.current_url)
+    if partes.scheme in ('http', 'https'):
+        driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': f'{partes.scheme}://{partes.netloc}', 'storageTypes': 'all'})
+    driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+    driver.get('about:blank')
+
+#%% CLASES
+class PoolDrivers:
+    """Pool de Chrome calientes agrupados por opciones; seguro para usar desde varios hilos."""
+
+    def __init__(self, max_usos=MAX_USOS, max_inactivos=MAX_INACTIVOS):
+        self.max_usos = max_usos
+        self.max_inactivos = max_inactivos
+        self.libres = {}
+        self.usos = {}
+        self.claves = {}
+        self.lock = Lock()
+
+    def crear(self, opts):
+        driver = webdriver.Chrome(service=Service(ruta_chromedriver()), options=opts)
+        self.usos[id(driver)] = 0
+        return driver
+
+    def obtener(self, opts):
+        """
+        Presta un driver con las opciones indicadas; reutiliza uno libre si existe.
+
+        :param opts: Options de Chrome del script
+        :return: Instancia de webdriver.Chrome
+        """
+        clave = clave_opciones(opts)
+        with self.lock:
+            libres = self.libres.get(clave, [])
+            driver = libres.pop() if libres else None
+        if driver is None:
+            driver = self.crear(opts)
+            print("Pool de drivers: se inició un Chrome nuevo.")
+        else:
+            print("Pool de drivers: se reutilizó un Chrome caliente.")
+        with self.lock:
+            self.claves[id(driver)] = clave
+            self.usos[id(driver)] += 1
+        return driver
+
+    def devolver(self, driver):
+        """Limpia el driver y lo deja disponible, o lo cierra si ya cumplió max_usos."""
+        with self.lock:
+            clave = self.claves.pop(id(driver), None)
+            usos = self.usos.get(id(driver), self.max_usos)
+            lleno = len(self.libres.get(clave, [])) >= self.max_inactivos
+        if clave is None or usos >= self.max_usos or lleno:
+            self.descartar(driver)
+            return
+        try:
+            limpiar_estado(driver)
+        except Exception as e:
+            print(f"Pool de drivers: no se pudo limpiar el Chrome ({str(e)}); se descarta.")
+            self.descartar(driver)
+            return
+        with self.lock:
+            self.libres.setdefault(clave, []).append(driver)
+
+    def descartar(self, driver):
+        with self.lock:
+            self.usos.pop(id(driver), None)
+            self.claves.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def prestar(self, opts):
+        driver = self.obtener(opts)
+        try:
+            yield driver
+        finally:
+            self.devolver(driver)
+
+    def calentar(self, opts, cantidad=1):
+        """Inicia Chrome por adelantado para que el primer préstamo no pague el arranque en frío."""
+        drivers = [self.crear(opts) for _ in range(cantidad)]
+        with self.lock:
+            self.libres.setdefault(clave_opciones(opts), []).extend(drivers)
+
+    def cerrar(self):
+        with self.lock:
+            drivers = [driver for libres in self.libres.values() for driver in libres]
+            self.libres.clear()
+        for driver in drivers:
+            self.descartar(driver)
+
+#%% POOL DEL PROCESO
+# Un solo pool por proceso: los scripts ejecutados con runpy (orquestador) lo comparten entre corridas
+POOL = PoolDrivers()
+atexit.register(POOL.cerrar)
+
+def obtener_driver(opts):
+    return POOL.obtener(opts)
+
+def devolver_driver(driver):
+    POOL.devolver(driver)
+
+def descartar_driver(driver):
+    """Cierra un driver prestado sin devolverlo (p. ej. tras un error que pudo dejarlo en mal estado)."""
+    POOL.descartar(driver)
@@ -0,0 +1,178 @@
+"""
+Codigo para correr los almacenes periódicamente sin cron, sin solapar corridas y con Chrome calientes.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Cada almacén tiene su intervalo con variación
+      aleatoria y un proceso propio que se conserva entre corridas (pool de Chrome y conexiones
+      calientes); si una corrida se alarga, los turnos perdidos se juntan en uno solo.
+    - [2026-10-18][Duvan]: Los turnos no usan la caché de páginas: cada corrida descarga los precios del momento.
+    - [2026-10-18][Duvan]: Un almacén que no está en INTERVALOS usa INTERVALO_PREDETERMINADO.
+
+Uso:
+    python programador.py                                  # los cinco almacenes con INTERVALOS
+    python programador.py exito jumbo --logs logs/ --estado programador.json
+"""
+#%% MODULOS
+import os
+import sys
+import json
+import fcntl
+import signal
+import argparse
+from time import sleep, time
+from random import uniform
+from datetime import datetime
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from orquestador import TIENDAS, ejecutar_en_proceso
+
+#%% CONFIGURACIÓN
+INTERVALOS = {'exito': 3600, 'carulla': 3600, 'jumbo': 3600, 'euro': 3600, 'merka': 3600} # Segundos entre corridas
+INTERVALO_PREDETERMINADO = 3600 # Para los almacenes de almacenes.py que no están en INTERVALOS
+VARIACION = 0.1 # Fracción del intervalo que se corre cada turno al azar (±), para no pegarle siempre a la misma hora
+REVISION = 5 # Segundos entre revisiones del programador
+
+#%% FUNCIONES
+def fecha(marca):
+    return datetime.fromtimestamp(marca).isoformat(timespec='seconds') if marca else None
+
+def siguiente_turno(base, intervalo, ahora):
+    """
+    Primer turno de la cadencia que empieza en `base` que queda después de `ahora`.
+
+    La variación se aplica sobre la cadencia fija, no sobre el turno anterior, para que no se acumule.
+
+    :return: Tupla (turno sin variación, turno con variación, turnos que se saltaron por quedar en el pasado)
+    """
+    saltados = max(0, int((ahora - base) // intervalo))
+    proximo = base + (saltados + 1) * intervalo
+    return proximo, proximo + uniform(-VARIACION, VARIACION) * intervalo, saltados
+
+def ignorar_interrupcion():
+    """Inicializador de los trabajadores: Ctrl+C lo atiende el programador, que deja terminar la corrida."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+#%% CLASES
+class Programador:
+    """
+    Un proceso trabajador por almacén (max_workers=1): nunca hay dos corridas del mismo almacén y el
+    proceso conserva entre corridas el POOL de Chrome, los limitadores y los módulos ya importados.
+    """
+
+    def __init__(self, tiendas, ruta_estado, directorio_logs=None, intervalos=INTERVALOS):
+        self.tiendas = tiendas
+        self.ruta_estado = ruta_estado
+        self.directorio_logs = directorio_logs
+        self.intervalos = intervalos
+        self.estado = {}
+        if os.path.exists(ruta_estado):
+            with open(ruta_estado) as archivo:
+                self.estado = json.load(archivo)
+        self.procesos = {}
+        self.en_curso = {}
+        self.detener = False
+
+    def guardar_estado(self):
+        with open(self.ruta_estado + '.tmp', 'w') as archivo:
+            json.dump(self.estado, archivo, indent=1)
+        os.replace(self.ruta_estado + '.tmp', self.ruta_estado)
+
+    def proceso(self, tienda):
+        if tienda not in self.procesos:
+            # spawn: el trabajador no hereda hilos ni sockets del programador
+            self.procesos[tienda] = ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn'), initializer=ignorar_interrupcion)
+        return self.procesos[tienda]
+
+    def lanzar(self, tienda, ahora):
+        datos = self.estado.setdefault(tienda, {})
+        print(f"[{fecha(ahora)}] Inicia {tienda}")
+        # Sin usar_cache: una página guardada en un turno anterior entraría al histórico con la fecha de este
+        self.en_curso[tienda] = (self.proceso(tienda).submit(ejecutar_en_proceso, tienda, self.directorio_logs), ahora)
+        datos['en_curso_desde'] = fecha(ahora)
+        self.guardar_estado()
+
+    def recoger(self, tienda, ahora):
+        """Registra la corrida terminada y programa el siguiente turno, juntando los perdidos."""
+        futuro, inicio = self.en_curso.pop(tienda)
+        try:
+            resumen = futuro.result()
+        except BrokenProcessPool as e:
+            # El trabajador murió (p. ej. Chrome tumbó al intérprete); el siguiente turno arranca uno nuevo
+            self.procesos.pop(tienda).shutdown(wait=False)
+            resumen = {'filas': 0, 'error': repr(e)}
+        datos = self.estado[tienda]
+        datos.pop('en_curso_desde', None)
+        base, turno, saltados = siguiente_turno(datos.get('base', inicio), self.intervalos.get(tienda, INTERVALO_PREDETERMINADO), ahora)
+        error = (resumen['error'] or '').strip().splitlines()
+        datos.update({
+            'ultima': fecha(inicio),
+            'duracion': round(ahora - inicio, 1),
+            'resultado': 'ok' if resumen['error'] is None else 'error',
+            'filas': resumen['filas'],
+            'error': error[-1] if error else None,
+            'base': base,
+            'turno': turno,
+            'proxima': fecha(turno),
+            'turnos_omitidos': datos.get('turnos_omitidos', 0) + saltados,
+        })
+        print(f"[{fecha(ahora)}] Termina {tienda}: {datos['resultado']}, {datos['filas']} filas en {datos['duracion']} s; "
+              f"próxima {datos['proxima']}" + (f" ({saltados} turnos omitidos)" if saltados else ''))
+        self.guardar_estado()
+
+    def ejecutar(self):
+        """Bucle principal; termina con SIGTERM o Ctrl+C después de que acaben las corridas en curso."""
+        ahora = time()
+        for tienda in self.tiendas:
+            datos = self.estado.setdefault(tienda, {})
+            # Una corrida que quedó 'en curso' en el estado murió con el programador anterior: se repite ya
+            if 'en_curso_desde' in datos or datos.get('turno', 0) < ahora:
+                datos.pop('en_curso_desde', None)
+                datos['base'] = datos['turno'] = ahora
+        while not self.detener or self.en_curso:
+            ahora = time()
+            for tienda in self.tiendas:
+                if tienda in self.en_curso:
+                    if self.en_curso[tienda][0].done():
+                        self.recoger(tienda, ahora)
+                elif not self.detener and ahora >= self.estado[tienda]['turno']:
+                    self.lanzar(tienda, ahora)
+            sleep(REVISION)
+        for proceso in self.procesos.values():
+            proceso.shutdown()
+
+    def parar(self, *args):
+        if not self.detener:
+            print(f"Deteniendo: se esperan las corridas en curso ({', '.join(self.en_curso) or 'ninguna'}).")
+        self.detener = True
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Corre los almacenes periódicamente sin solapar corridas.')
+    parser.add_argument('tiendas', nargs='*', default=TIENDAS, help=f"Almacenes a programar ({', '.join(TIENDAS)})")
+    parser.add_argument('--estado', default='programador.json', help='Archivo JSON con última corrida, duración y resultado por almacén')
+    parser.add_argument('--logs', default=None, help='Carpeta para la salida de cada corrida')
+    parser.add_argument('--intervalo', type=int, default=None, help='Minutos entre corridas para todos los almacenes (por defecto INTERVALOS)')
+    args = parser.parse_args()
+    desconocidas = set(args.tiendas) - set(TIENDAS)
+    if desconocidas:
+        parser.error(f"Almacenes desconocidos: {', '.join(sorted(desconocidas))}")
+
+    # Un solo programador por archivo de estado
+    candado = open(args.estado + '.lock', 'w')
+    try:
+        fcntl.flock(candado, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        sys.exit(f"Ya hay un programador usando {args.estado}.")
+    intervalos = {tienda: args.intervalo * 60 for tienda in TIENDAS} if args.intervalo else INTERVALOS
+    programador = Programador(args.tiendas, args.estado, args.logs, intervalos)
+    signal.signal(signal.SIGTERM, programador.parar)
+    signal.signal(signal.SIGINT, programador.parar)
+    programador.ejecutar()
@@ -0,0 +1,149 @@
+"""
+Codigo para acumular productos en columnas compactas y armar el DataFrame sin pasar por diccionarios.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Nombres internados, precio en array('q'), precio por
+      unidad en array('d') y almacén y unidad como códigos de categoría; el DataFrame se arma copiando
+      cada buffer una vez.
+    - [2026-10-18][Duvan]: Los códigos de categoría pasan a array('h'); con array('b') la categoría 128 desbordaba.
+    - [2026-10-18][Duvan]: La comparación suma a tracemalloc la memoria de Arrow, donde pandas guarda las
+      columnas de texto cuando tiene pyarrow.
+
+Lo usan los motores VTEX y Shopify, que reciben los productos de a uno desde JSON. Las cargas del
+histórico no pasan por aquí: historico.py ya lee columnas de Parquet con pyarrow. Tampoco el motor con
+navegador: cada página se escribe al CSV parcial en cuanto se lee (salida_incremental.py) y se
+normaliza por bloques desde ese CSV, así que sus filas nunca se acumulan en memoria.
+
+Uso:
+    python registros.py [filas]   # tiempo y memoria frente a la lista de diccionarios
+"""
+#%% MODULOS
+import sys
+import tracemalloc
+from array import array
+from time import perf_counter
+import numpy as np
+import pyarrow as pa
+from pandas import Categorical, DataFrame, Series
+from pandas.arrays import IntegerArray
+
+#%% CONFIGURACIÓN
+FALTANTE = -1 # Precio y código de categoría que quedan como NA en el DataFrame
+
+#%% CLASES
+class Categorias:
+    """Valores repetidos (almacén, unidad) guardados una vez; cada fila lleva solo su código de dos bytes."""
+    __slots__ = ('valores', 'indice', 'codigos')
+
+    def __init__(self):
+        self.valores = []
+        self.indice = {}
+        self.codigos = array('h')
+
+    def agregar(self, valor):
+        if valor is None:
+            self.codigos.append(FALTANTE)
+            return
+        codigo = self.indice.get(valor)
+        if codigo is None:
+            codigo = self.indice[valor] = len(self.valores)
+            self.valores.append(valor)
+        self.codigos.append(codigo)
+
+    def a_categorical(self):
+        return Categorical.from_codes(np.frombuffer(self.codigos, dtype=np.int16).copy(), self.valores)
+
+class TablaProductos:
+    """
+    Productos por columnas: un objeto por nombre distinto y un número de 8 bytes por precio.
+
+    Con millones de filas del histórico los nombres se repiten corrida tras corrida; internarlos
+    deja un solo str por nombre en lugar de uno por fila.
+    """
+    __slots__ = ('tienda', 'productos', 'precios', 'precios_x_unidad', 'tiendas', 'unidades')
+
+    def __init__(self, tienda=None):
+        """:param tienda: Almacén de todas las filas; agregar(..., tienda=) lo cambia por fila"""
+        self.tienda = tienda
+        self.productos = []
+        self.precios = array('q')
+        self.precios_x_unidad = array('d')
+        self.tiendas = Categorias()
+        self.unidades = Categorias()
+
+    def __len__(self):
+        return len(self.productos)
+
+    def agregar(self, producto, precio=None, precio_x_unidad=None, unidad=None, tienda=None):
+        """
+        :param producto: Nombre del producto
+        :param precio: Precio entero en COP; None queda NA
+        :param precio_x_unidad: Precio por unidad de medida; None queda NaN
+        :param unidad: Unidad de medida tal como la trae la fuente
+        :param tienda: Almacén de la fila, si no es el de la tabla
+        """
+        self.productos.append(sys.intern(producto))
+        self.precios.append(FALTANTE if precio is None else int(precio))
+        self.precios_x_unidad.append(np.nan if precio_x_unidad is None else precio_x_unidad)
+        self.tiendas.agregar(tienda or self.tienda)
+        self.unidades.agregar(unidad)
+
+    def a_dataframe(self):
+        """Columnas producto, precio (Int64), precio_x_unidad (float64), unidad y tienda (categorías) si hay."""
+        precios = np.frombuffer(self.precios, dtype=np.int64).copy()
+        columnas = {
+            'producto': Series(self.productos, dtype=object),
+            'precio': IntegerArray(precios, precios == FALTANTE),
+            'precio_x_unidad': np.frombuffer(self.precios_x_unidad, dtype=np.float64).copy(),
+            'unidad': self.unidades.a_categorical(),
+        }
+        if self.tiendas.valores:
+            columnas['tienda'] = self.tiendas.a_categorical()
+        return DataFrame(columnas)
+
+#%% FUNCIONES
+def filas_historicas(filas, semilla=0):
+    """Filas (tienda, producto, precio, precio_x_unidad, unidad) como las de varias corridas del histórico."""
+    aleatorio = np.random.default_rng(semilla)
+    tiendas = ('exito', 'carulla', 'jumbo', 'euro', 'merka')
+    precios = aleatorio.integers(500, 60000, filas).tolist()
+    for i, precio in enumerate(precios):
+        # Cada fila trae su propio str, como al leerla de un CSV o de un JSON
+        yield tiendas[i % 5], f"Producto {i % 3000} x {250 * (i % 4 + 1)} gr", precio, precio / (250 * (i % 4 + 1)), 'g'
+
+def comparar(filas=3_000_000):
+    """Tiempo, pico de memoria y memoria del DataFrame final al armarlo con diccionarios o con TablaProductos."""
+    print(f"{filas:,} filas del histórico.")
+    for nombre in ('diccionarios', 'registros'):
+        # Con pyarrow las columnas de texto de pandas viven en el pool de Arrow, que tracemalloc no ve
+        arrow_inicial = pa.total_allocated_bytes()
+        tracemalloc.start()
+        inicio = perf_counter()
+        if nombre == 'diccionarios':
+            lista = [{'tienda': tienda, 'producto': producto, 'precio': precio, 'precio_x_unidad': precio_x_unidad, 'unidad': unidad}
+                     for tienda, producto, precio, precio_x_unidad, unidad in filas_historicas(filas)]
+            df = DataFrame(lista)
+            del lista
+        else:
+            tabla = TablaProductos()
+            for tienda, producto, precio, precio_x_unidad, unidad in filas_historicas(filas):
+                tabla.agregar(producto, precio, precio_x_unidad, unidad, tienda)
+            df = tabla.a_dataframe()
+            del tabla
+        duracion = perf_counter() - inicio
+        # memory_usage(deep=True) cuenta cada str por fila aunque esté internado; tracemalloc cuenta lo que de verdad queda
+        actual, pico = (memoria / 1024 ** 2 for memoria in tracemalloc.get_traced_memory())
+        tracemalloc.stop()
+        actual += (pa.total_allocated_bytes() - arrow_inicial) / 1024 ** 2
+        print(f"{nombre:<14}{duracion:>8.2f} s{filas / duracion:>12,.0f} filas/s  pico {pico:>7.0f} MB  DataFrame {actual:>6.0f} MB")
+        del df
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    comparar(int(sys.argv[1]) if len(sys.argv) > 1 else 3_000_000)
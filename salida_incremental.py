@@ -0,0 +1,111 @@
+"""
+Codigo para guardar los productos por lotes a medida que se leen, con punto de control para reanudar.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Cada página o iteración se agrega a un CSV parcial
+      y se anota la posición de la paginación; al final el posprocesamiento se aplica por bloques.
+"""
+#%% MODULOS
+import os
+import csv
+import json
+from threading import Lock
+from pandas import read_csv, DataFrame
+
+#%% CLASES
+class EscritorIncremental:
+    """
+    CSV parcial de filas crudas más un punto de control JSON con la posición de la paginación.
+
+    El punto de control guarda cuántos bytes del CSV parcial estaban completos; al reanudar se
+    descarta lo escrito después, así una caída a mitad de un lote no deja filas repetidas.
+    """
+
+    def __init__(self, tienda, directorio, reanudar=False):
+        """
+        :param tienda: Almacén, para nombrar los archivos
+        :param directorio: Carpeta del CSV parcial y del punto de control (la misma de la salida)
+        :param reanudar: Continúa desde el punto de control si existe; si no, empieza de cero
+        """
+        self.ruta_parcial = os.path.join(directorio, f'{tienda}_parcial.csv')
+        self.ruta_control = os.path.join(directorio, f'{tienda}_punto_control.json')
+        self.lock = Lock()
+        self.campos = None
+        self.filas = 0
+        self.posicion = None
+        if reanudar and os.path.exists(self.ruta_control):
+            with open(self.ruta_control) as archivo:
+                control = json.load(archivo)
+            self.campos, self.filas, self.posicion = control['campos'], control['filas'], control['posicion']
+            with open(self.ruta_parcial, 'r+b') as archivo:
+                archivo.truncate(control['bytes'])
+            print(f"Reanudando {tienda}: {self.filas} filas ya guardadas, posición {self.posicion}.")
+        else:
+            for ruta in (self.ruta_parcial, self.ruta_control):
+                if os.path.exists(ruta):
+                    os.remove(ruta)
+        self.archivo = open(self.ruta_parcial, 'a', newline='', encoding='utf-8')
+        self.escritor = csv.DictWriter(self.archivo, fieldnames=self.campos) if self.campos else None
+
+    def agregar(self, productos, posicion):
+        """
+        Escribe un lote de filas y luego el punto de control que lo da por terminado.
+
+        :param productos: Lista de diccionarios de la página o iteración
+        :param posicion: Posición de la paginación tras este lote (cualquier valor serializable en JSON)
+        """
+        with self.lock:
+            if self.escritor is None and productos:
+                self.campos = list(productos[0].keys())
+                self.escritor = csv.DictWriter(self.archivo, fieldnames=self.campos)
+                self.escritor.writeheader()
+            if productos:
+                self.escritor.writerows(productos)
+            self.archivo.flush()
+            os.fsync(self.archivo.fileno())
+            self.filas += len(productos)
+            self.posicion = posicion
+            control = {'campos': self.campos, 'filas': self.filas, 'posicion': posicion, 'bytes': self.archivo.tell()}
+            # Se escribe aparte y se reemplaza para que el punto de control nunca quede a medias
+            with open(self.ruta_control + '.tmp', 'w') as archivo:
+                json.dump(control, archivo)
+            os.replace(self.ruta_control + '.tmp', self.ruta_control)
+
+    def leer_parcial(self):
+        """Recorre las filas ya guardadas sin cargarlas todas (p. ej. para recuperar los vistos)."""
+        self.archivo.flush()
+        with open(self.ruta_parcial, newline='', encoding='utf-8') as archivo:
+            yield from csv.DictReader(archivo)
+
+    def finalizar(self, ruta_salida, posprocesar=None, index=True, tamano_bloque=50000):
+        """
+        Aplica el posprocesamiento por bloques al CSV parcial, escribe la salida y borra los temporales.
+
+        :param ruta_salida: CSV final
+        :param posprocesar: Función DataFrame -> DataFrame del script
+        :param index: Escribe el índice continuo 0..n-1 como to_csv(index=True)
+        :param tamano_bloque: Filas por bloque; limita la memoria del posprocesamiento
+        :return: Número de filas escritas
+        """
+        self.archivo.close()
+        if not self.filas:
+            print("No se guardaron productos; la salida queda vacía.")
+            DataFrame().to_csv(ruta_salida, index=index)
+        else:
+            inicio = 0
+            for bloque in read_csv(self.ruta_parcial, dtype=str, keep_default_na=False, chunksize=tamano_bloque):
+                if posprocesar is not None:
+                    bloque = posprocesar(bloque)
+                bloque.index = range(inicio, inicio + len(bloque))
+                bloque.to_csv(ruta_salida, index=index, mode='w' if inicio == 0 else 'a', header=inicio == 0)
+                inicio += len(bloque)
+        for ruta in (self.ruta_parcial, self.ruta_control):
+            if os.path.exists(ruta):
+                os.remove(ruta)
+        return self.filas
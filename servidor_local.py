@@ -0,0 +1,102 @@
+"""
+Codigo para servir respuestas grabadas de los almacenes desde un servidor HTTP local.
+
+__author__: "Duvan Nieves"
+__copyright__: "UNAL"
+__version__: "0.0.1"
+__maintaner__:"Duvan Nieves"
+__email__:"dnieves@unal.edu.co"
+__status__:"Developer"
+__changues__:
+    - [2026-10-18][Duvan]: Primera version del codigo. Se reproducen los fixtures que graba cliente_http.py
+      para probar los motores sin consultar los almacenes.
+    - [2026-10-18][Duvan]: Se sirven páginas HTML grabadas por ruta y query (paginación ?page=N).
+
+Uso:
+    python servidor_local.py [directorio_fixtures] [puerto]
+"""
+#%% MODULOS
+import os
+import sys
+import json
+from threading import Thread
+from urllib.parse import urlsplit, parse_qsl
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from cliente_http import nombre_fixture
+
+#%% CLASES
+class ManejadorFixtures(BaseHTTPRequestHandler):
+    """Responde cada GET con el fixture cuyo nombre coincide con la ruta y los parámetros pedidos."""
+
+    directorio = '.'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        partes = urlsplit(self.path)
+        parametros = dict(parse_qsl(partes.query, keep_blank_values=True))
+        nombre = os.path.join(self.directorio, nombre_fixture(partes.path, parametros))
+        if not os.path.exists(nombre):
+            # Página HTML grabada para esa misma ruta y query (p. ej. ?page=N de un listado)
+            nombre = os.path.splitext(nombre)[0] + '.html'
+        if not os.path.exists(nombre):
+            # Si no hay fixture se sirve el archivo estático de la ruta (páginas HTML grabadas)
+            nombre = os.path.join(self.directorio, partes.path.lstrip('/'))
+            if os.path.isdir(nombre):
+                nombre = os.path.join(nombre, 'index.html')
+        if not os.path.isfile(nombre):
+            self.responder(404, b'[]', {'Content-Type': 'application/json'})
+            return
+        estado, cabeceras = 200, {}
+        if os.path.exists(nombre + '.cabeceras'):
+            with open(nombre + '.cabeceras') as archivo:
+                meta = json.load(archivo)
+            estado, cabeceras = meta['estado'], meta['cabeceras']
+        cabeceras.setdefault('Content-Type', 'text/html; charset=utf-8' if nombre.endswith('.html') else 'application/json')
+        with open(nombre, 'rb') as archivo:
+            self.responder(estado, archivo.read(), cabeceras)
+
+    def responder(self, estado, cuerpo, cabeceras):
+        self.send_response(estado)
+        for clave, valor in cabeceras.items():
+            self.send_header(clave, valor)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+class ServidorFixtures:
+    """
+    Servidor HTTP en un hilo aparte; se usa como context manager.
+
+    >>> with ServidorFixtures('fixtures/exito') as servidor:
+    ...     extraer_catalogo_vtex('exito', url_base=servidor.url)
+    """
+
+    def __init__(self, directorio, puerto=0):
+        manejador = type('Manejador', (ManejadorFixtures,), {'directorio': directorio})
+        self.servidor = ThreadingHTTPServer(('127.0.0.1', puerto), manejador)
+        self.hilo = Thread(target=self.servidor.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, puerto = self.servidor.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def __enter__(self):
+        self.hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+#%% EJECUCIÓN
+if __name__ == '__main__':
+    directorio = sys.argv[1] if len(sys.argv) > 1 else '.'
+    puerto = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    servidor = ServidorFixtures(directorio, puerto)
+    print(f"Sirviendo {directorio} en {servidor.url}")
+    servidor.servidor.serve_forever()